@@ -1,11 +1,15 @@
-from flask import Flask, request, jsonify, make_response, request, render_template, session, flash, send_from_directory
+from flask import Flask, request, make_response, request, render_template, session, flash, send_from_directory
 import requests
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import text, Index
+from sqlalchemy import text, Index, inspect
+from sqlalchemy.schema import CreateColumn
+import click
 import json
+import re
+import time
 from os import urandom
 import bcrypt
-from funcs import *
+from funcs import *  # including jsonify, backed by orjson when installed
 import os
 from dotenv import load_dotenv, set_key
 import jwt
@@ -15,9 +19,13 @@ import html
 from datetime import datetime, timedelta
 from werkzeug.utils import secure_filename
 import uuid
+from collections import namedtuple
+from contextlib import contextmanager
 
 app = Flask(__name__)
+app.json_encoder = FastJSONEncoder
 CORS(app)
+compressor = ResponseCompressor(app)
 
 # Only load .env file if not in production (when FLASK_ENV is not 'production')
 if os.getenv('FLASK_ENV') != 'production':
@@ -38,6 +46,25 @@ app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 # Create upload directory if it doesn't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Game cache policy - past the soft TTL cached games are served immediately and refreshed
+# in the background; only past the hard TTL (or on a miss) does a request wait for IGDB
+GAME_CACHE_SOFT_TTL = timedelta(hours=int(os.getenv('GAME_CACHE_SOFT_TTL_HOURS', 24 * 7)))
+GAME_CACHE_HARD_TTL = timedelta(hours=int(os.getenv('GAME_CACHE_HARD_TTL_HOURS', 24 * 30)))
+
+# Game search/typeahead results - shared through Redis when CACHE_REDIS_URL is set
+search_cache = ResultCache('igdb-search', ttl=int(os.getenv('SEARCH_CACHE_TTL', 6 * 3600)))
+
+# Most-reviewed-games leaderboard, recomputed from the hourly buckets at most this often
+leaderboard_cache = ResultCache('leaderboard', ttl=int(os.getenv('LEADERBOARD_CACHE_TTL', 60)))
+# Buckets that have left the leaderboard window are deleted this often (seconds), off the request path
+REVIEW_BUCKET_PRUNE_INTERVAL = int(os.getenv('REVIEW_BUCKET_PRUNE_INTERVAL', 3600))
+
+# /api/suggestions answers from the local game name index when it has at least this many strong
+# matches (see GameNameIndex.search) for a query of at least SUGGESTIONS_LOCAL_MIN_QUERY characters;
+# shorter queries match too many uncached games to be answered locally
+SUGGESTIONS_LOCAL_MIN = int(os.getenv('SUGGESTIONS_LOCAL_MIN', 5))
+SUGGESTIONS_LOCAL_MIN_QUERY = int(os.getenv('SUGGESTIONS_LOCAL_MIN_QUERY', 3))
+
 db = SQLAlchemy(app)
 
 # Games cache table - to store game information locally
@@ -50,7 +77,7 @@ class Games(db.Model):
     release_date = db.Column(db.String(100), nullable=True)
     platforms = db.Column(db.Text, nullable=True)  # JSON string of platforms
     artwork_urls = db.Column(db.Text, nullable=True)  # JSON string of artwork URLs
-    last_updated = db.Column(db.DateTime, default=datetime.utcnow)
+    last_updated = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -60,6 +87,12 @@ class Games(db.Model):
         return f'<Game {self.id}: {self.name}>'
     
     def to_dict(self):
+        """Decoded once per change of the row and shared through game_dict_cache"""
+        if self.id is None:
+            return self._build_dict()
+        return game_dict_cache.get_or_build(self.id, self.last_updated, self._build_dict)
+
+    def _build_dict(self):
         platforms_list = []
         artwork_list = []
         
@@ -89,10 +122,17 @@ class Games(db.Model):
     
     @staticmethod
     def should_refresh(game_record):
-        """Check if game data should be refreshed (older than 7 days)"""
+        """Check if game data should be refreshed (older than the soft TTL)"""
         if not game_record or not game_record.last_updated:
             return True
-        return datetime.utcnow() - game_record.last_updated > timedelta(days=7)
+        return datetime.utcnow() - game_record.last_updated > GAME_CACHE_SOFT_TTL
+    
+    @staticmethod
+    def is_expired(game_record):
+        """Check if game data is too old to be served without refreshing it first (older than the hard TTL)"""
+        if not game_record or not game_record.last_updated:
+            return True
+        return datetime.utcnow() - game_record.last_updated > GAME_CACHE_HARD_TTL
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -100,6 +140,8 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     password = db.Column(db.String(255), unique=False, nullable=False)
     profile_photo = db.Column(db.String(255), nullable=True)  # Store filename of uploaded photo
+    follower_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Maintained by follow_user
+    username_lower = db.Column(db.String(80), nullable=True, index=True)  # Prefix search key, see index_username
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def __repr__(self):
@@ -117,6 +159,14 @@ class Follow(db.Model):
     def __repr__(self):
         return f'<Follow {self.follower_id} -> {self.following_id}>'
 
+# Bigrams and trigrams of lower-cased usernames - substring user search without a table scan
+class UserSearchTrigrams(db.Model):
+    trigram = db.Column(db.String(3), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True, index=True)
+    
+    def __repr__(self):
+        return f'<UserSearchTrigram {self.trigram} -> {self.user_id}>'
+
 # Reviews table - optimized with game caching
 class Reviews(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -126,6 +176,11 @@ class Reviews(db.Model):
     gif_url = db.Column(db.String(500), unique=False, nullable=True)
     date_created = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
+    # Denormalized engagement counters - kept in sync by the like/comment/repost routes
+    likes_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    comment_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    reposts_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
     # Relationships
     user = db.relationship('User', backref='user_reviews')
     
@@ -139,72 +194,7 @@ class Reviews(db.Model):
         return f'<Review {self.id}>'
 
     def to_dict(self, current_user_id=None, include_game_info=True):
-        # Get the actual username from the User model
-        user = User.query.get(self.username)
-        display_username = user.username if user else f"User {self.username}"
-        profile_photo = None
-        if user and user.profile_photo:
-            profile_photo = f'/api/profile/photo/{user.profile_photo}'
-        
-        # Get comment count for this review
-        comment_count = Comments.query.filter_by(review_id=self.id).count()
-        
-        # Get likes count for this review
-        likes_count = Likes.query.filter_by(review_id=self.id).count()
-        
-        # Get reposts count for this review
-        reposts_count = Reposts.query.filter_by(review_id=self.id).count()
-        
-        # Check if current user has liked this review
-        user_has_liked = False
-        if current_user_id:
-            user_has_liked = Likes.query.filter_by(
-                review_id=self.id, 
-                user_id=current_user_id
-            ).first() is not None
-        
-        # Check if current user has reposted this review
-        user_has_reposted = False
-        if current_user_id:
-            user_has_reposted = Reposts.query.filter_by(
-                review_id=self.id,
-                user_id=current_user_id
-            ).first() is not None
-        
-        result = {
-            "id": self.id, 
-            "id_game": self.id_game, 
-            "user_id": self.username,
-            "username": display_username,
-            "profile_photo": profile_photo,
-            "review_text": self.review_text if self.review_text else "",
-            "gif_url": self.gif_url,
-            "has_text": bool(self.review_text and self.review_text.strip()),
-            "has_gif": bool(self.gif_url),
-            "date_created": self.date_created.strftime('%Y-%m-%d %H:%M:%S'),
-            "comment_count": comment_count,
-            "likes_count": likes_count,
-            "reposts_count": reposts_count,
-            "user_has_liked": user_has_liked,
-            "user_has_reposted": user_has_reposted
-        }
-        
-        # Include cached game information if requested
-        if include_game_info:
-            # Try to get from relationship first
-            game_info = None
-            if hasattr(self, 'game_info') and self.game_info:
-                game_info = self.game_info.to_dict()
-            else:
-                # Fallback: Get from Games table directly
-                game_record = Games.query.get(self.id_game)
-                if game_record:
-                    game_info = game_record.to_dict()
-            
-            if game_info:
-                result["game_info"] = game_info
-        
-        return result
+        return serialize_reviews([self], current_user_id=current_user_id, include_game_info=include_game_info)[0]
 
 # Likes table - for review likes
 class Likes(db.Model):
@@ -232,31 +222,16 @@ class Comments(db.Model):
     # Self-referential relationship for nested comments
     parent = db.relationship('Comments', remote_side=[comment_id], backref='replies')
     
+    # Backs the thread query: roots and replies of a review in date order
+    __table_args__ = (
+        Index('idx_comment_thread', 'review_id', 'parent_id', 'date_created'),
+    )
+    
     def __repr__(self):
         return f'<Comment {self.comment_id}>'
 
     def to_dict(self):
-        # Get the actual username from the User model
-        user = User.query.filter_by(id=self.username).first()
-        display_username = user.username if user else f"User {self.username}"
-        profile_photo = None
-        if user and user.profile_photo:
-            profile_photo = f'/api/profile/photo/{user.profile_photo}'
-        
-        return {
-            "comment_id": self.comment_id,
-            "parent_id": self.parent_id,
-            "review_id": self.review_id,
-            "user_id": self.username,  # Keep the original ID for reference
-            "username": display_username,  # Add the actual username
-            "profile_photo": profile_photo,
-            "comment": self.comment if self.comment else "",  # Handle null comments
-            "gif_url": self.gif_url,
-            "has_text": bool(self.comment and self.comment.strip()),
-            "has_gif": bool(self.gif_url),
-            "date_created": self.date_created.strftime('%Y-%m-%d %H:%M:%S'),
-            "reply_count": len(self.replies) if hasattr(self, 'replies') else 0
-        }
+        return serialize_comments([self])[0]
 
 # Reposts table - for Twitter-like reposts of reviews
 class Reposts(db.Model):
@@ -264,7 +239,7 @@ class Reposts(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     review_id = db.Column(db.Integer, db.ForeignKey('reviews.id'), nullable=False, index=True)
     repost_text = db.Column(db.String(255), unique=False, nullable=True)  # Optional text to add to repost
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
     # Relationships
     user = db.relationship('User', backref='reposts')
@@ -277,39 +252,7 @@ class Reposts(db.Model):
         return f'<Repost {self.user_id} -> Review {self.review_id}>'
 
     def to_dict(self, current_user_id=None):
-        # Get the user info for the reposter
-        user = User.query.filter_by(id=self.user_id).first()
-        reposter_username = user.username if user else f"User {self.user_id}"
-        reposter_profile_photo = None
-        if user and user.profile_photo:
-            reposter_profile_photo = f'/api/profile/photo/{user.profile_photo}'
-        
-        # Get the original review data
-        original_review = self.review.to_dict(current_user_id) if self.review else None
-        
-        # Get repost count for this review
-        repost_count = Reposts.query.filter_by(review_id=self.review_id).count()
-        
-        # Check if current user has reposted this review
-        user_has_reposted = False
-        if current_user_id:
-            user_has_reposted = Reposts.query.filter_by(
-                review_id=self.review_id,
-                user_id=current_user_id
-            ).first() is not None
-        
-        return {
-            "id": self.id,
-            "type": "repost",  # Identifier to distinguish from regular reviews
-            "user_id": self.user_id,
-            "username": reposter_username,
-            "profile_photo": reposter_profile_photo,
-            "repost_text": self.repost_text,
-            "created_at": self.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            "original_review": original_review,
-            "repost_count": repost_count,
-            "user_has_reposted": user_has_reposted
-        }
+        return serialize_reposts([self], current_user_id=current_user_id)[0]
 
 # Saved Games table - for users to save games to their profile
 class SavedGames(db.Model):
@@ -334,10 +277,929 @@ class SavedGames(db.Model):
             "id": self.id,
             "user_id": self.user_id,
             "game_id": self.game_id,
-            "created_at": self.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+            "created_at": self.created_at.isoformat(' ', 'seconds'),
             "game_info": game_info
         }
 
+# Reviews per game per hour - backs the rolling weekly leaderboard
+class GameReviewBuckets(db.Model):
+    game_id = db.Column(db.Integer, primary_key=True)
+    bucket_start = db.Column(db.DateTime, primary_key=True, index=True)  # Start of the hour (UTC)
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<GameReviewBuckets {self.game_id} @ {self.bucket_start}: {self.review_count}>'
+
+# Timeline entries - "reviews from people I follow", materialized when an item is created
+class TimelineEntries(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)  # Timeline owner (the follower)
+    author_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)  # Who wrote the review/repost
+    kind = db.Column(db.String(10), nullable=False)  # 'review' or 'repost'
+    item_id = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)  # Date of the review/repost itself
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'kind', 'item_id', name='unique_timeline_entry'),
+        Index('idx_timeline_user_date', 'user_id', 'created_at', 'kind', 'item_id'),
+        Index('idx_timeline_user_author', 'user_id', 'author_id'),
+        Index('idx_timeline_item', 'kind', 'item_id'),
+    )
+    
+    def __repr__(self):
+        return f'<TimelineEntry {self.user_id}: {self.kind} {self.item_id}>'
+
+# Game refresh queue - games waiting for the background cache refresher
+class GameRefreshQueue(db.Model):
+    game_id = db.Column(db.Integer, primary_key=True)
+    priority = db.Column(db.Integer, nullable=False, default=0)  # Higher is refreshed first
+    enqueued_at = db.Column(db.DateTime, default=datetime.utcnow)
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Failed refreshes so far
+    available_at = db.Column(db.DateTime, nullable=True)  # Retry backoff - not taken again before this
+    claimed_by = db.Column(db.String(64), nullable=True)  # Worker currently refreshing the game
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    
+    __table_args__ = (
+        Index('idx_refresh_queue_order', 'priority', 'enqueued_at'),
+    )
+    
+    def __repr__(self):
+        return f'<GameRefreshQueue {self.game_id}>'
+
+def _profile_photo_url(user):
+    if user and user.profile_photo:
+        return f'/api/profile/photo/{user.profile_photo}'
+    return None
+
+# What feeds, comments and reposts show of their authors
+UserDisplay = namedtuple('UserDisplay', 'id username profile_photo')
+
+def _users_by_id(user_ids):
+    """
+    Display records for a set of user ids, from lookup_cache with a single IN
+    query for the ones it doesn't have
+    """
+    ids = set()
+    for user_id in user_ids:
+        try:
+            ids.add(int(user_id))
+        except (TypeError, ValueError):
+            continue
+    if not ids:
+        return {}
+    
+    def load(missing):
+        rows = db.session.query(User.id, User.username, User.profile_photo).filter(User.id.in_(missing)).all()
+        return {row.id: [row.username, row.profile_photo] for row in rows}
+    
+    records = lookup_cache.get_or_load('user', ids, load)
+    return {user_id: UserDisplay(user_id, *record) for user_id, record in records.items()}
+
+def user_id_for_username(username):
+    """
+    Id of the user with this username, or None. A cached id is only trusted while
+    that user's display record still carries the name, so renames can't resolve
+    to the wrong account.
+    """
+    user_id = lookup_cache.get('username', username)
+    if user_id is not None:
+        record = _users_by_id([user_id]).get(user_id)
+        if record and record.username.lower() == username.lower():
+            return user_id
+    
+    row = db.session.query(User.id).filter_by(username=username).first()
+    if row is None:
+        return None
+    lookup_cache.set('username', username, row.id)
+    return row.id
+
+def invalidate_user_cache(user_id, *usernames):
+    """Drop a user's cached display record and username mappings after a profile change"""
+    lookup_cache.delete('user', user_id)
+    if usernames:
+        lookup_cache.delete('username', *usernames)
+
+def _game_dicts(game_ids):
+    """Games.to_dict() output by id, from lookup_cache with a single IN query for the misses"""
+    return lookup_cache.get_or_load('game', game_ids, lambda missing: {
+        game.id: game.to_dict() for game in Games.query.filter(Games.id.in_(missing)).all()
+    })
+
+def username_trigrams(username):
+    """The username's trigrams and, for 2-character queries, its bigrams"""
+    username = username.lower()
+    return {username[i:i + size] for size in (2, 3) for i in range(len(username) - size + 1)}
+
+def _query_grams(query):
+    """The index entries every username containing query must have"""
+    size = 3 if len(query) >= 3 else 2
+    return {query[i:i + size] for i in range(len(query) - size + 1)}
+
+def index_username(user):
+    """Refresh a user's search key and trigrams; the caller commits"""
+    if user.id is None:
+        db.session.flush()
+    user.username_lower = user.username.lower()
+    UserSearchTrigrams.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+    db.session.bulk_insert_mappings(UserSearchTrigrams, [
+        {'trigram': trigram, 'user_id': user.id} for trigram in username_trigrams(user.username)
+    ])
+
+def rebuild_user_search_index():
+    """Recompute username_lower and the bigram/trigram table for every user"""
+    UserSearchTrigrams.query.delete(synchronize_session=False)
+    users = User.query.all()
+    for user in users:
+        user.username_lower = user.username.lower()
+    db.session.bulk_insert_mappings(UserSearchTrigrams, [
+        {'trigram': trigram, 'user_id': user.id}
+        for user in users for trigram in username_trigrams(user.username)
+    ])
+    db.session.commit()
+    return len(users)
+
+def search_usernames(query, limit=10):
+    """
+    Users whose username starts with the query, then users whose username contains
+    it, each group ranked by follower count (an exact match always comes first).
+    Prefix matches are a LIKE 'query%' range scan on the username_lower index;
+    substring matches intersect the query's bigrams (2 characters) or trigrams in
+    UserSearchTrigrams; shorter queries only match prefixes. Matching and ranking
+    happen in SQL, before the limit.
+    """
+    query = query.lower()
+    
+    results = User.query.filter(User.username_lower.startswith(query, autoescape=True)).order_by(
+        db.case([(User.username_lower == query, 0)], else_=1),
+        User.follower_count.desc(),
+        db.func.length(User.username)
+    ).limit(limit).all()
+    if len(results) >= limit or len(query) < 2:
+        return results
+    
+    grams = _query_grams(query)
+    candidate_ids = db.session.query(UserSearchTrigrams.user_id).filter(
+        UserSearchTrigrams.trigram.in_(grams)
+    ).group_by(UserSearchTrigrams.user_id).having(
+        db.func.count(UserSearchTrigrams.trigram) == len(grams)
+    )
+    # The grams can all appear without being adjacent; the LIKE only checks the candidates
+    contains = User.query.filter(
+        User.id.in_(candidate_ids),
+        User.username_lower.contains(query, autoescape=True)
+    )
+    if results:
+        contains = contains.filter(~User.id.in_([user.id for user in results]))
+    
+    results.extend(contains.order_by(
+        User.follower_count.desc(),
+        db.func.length(User.username)
+    ).limit(limit - len(results)).all())
+    return results
+
+def _user_engagement(review_ids, current_user_id=None):
+    """
+    The current user's liked/reposted flags for a batch of reviews,
+    using one IN query each
+    """
+    review_ids = list(set(review_ids))
+    engagement = {'liked': set(), 'reposted': set()}
+    if not review_ids or not current_user_id:
+        return engagement
+    
+    engagement['liked'] = {row[0] for row in db.session.query(Likes.review_id).filter(
+        Likes.user_id == current_user_id, Likes.review_id.in_(review_ids)
+    ).all()}
+    engagement['reposted'] = {row[0] for row in db.session.query(Reposts.review_id).filter(
+        Reposts.user_id == current_user_id, Reposts.review_id.in_(review_ids)
+    ).all()}
+    
+    return engagement
+
+def bump_review_counter(review_id, column, delta):
+    """
+    Adjust one of the denormalized Reviews counters with a single UPDATE in the
+    current transaction, so it commits or rolls back with the row change
+    """
+    if delta >= 0:
+        value = column + delta
+    else:
+        value = db.case([(column > -delta, column + delta)], else_=0)
+    Reviews.query.filter_by(id=review_id).update({column: value}, synchronize_session=False)
+
+def _review_bucket(created_at):
+    return created_at.replace(minute=0, second=0, microsecond=0)
+
+def bump_review_bucket(game_id, created_at, delta):
+    """
+    Adjust the hourly review count of a game in the current transaction.
+    MySQL, PostgreSQL and SQLite upsert in one statement, so concurrent first
+    reviews of a game in the same hour can't collide on the primary key; other
+    databases update and insert the bucket when it does not exist yet.
+    """
+    bucket = _review_bucket(created_at)
+    dialect = db.engine.dialect.name
+    if delta > 0 and dialect == 'sqlite':
+        # SQLAlchemy 1.3 has no SQLite upsert construct; the typed bind keeps the stored DateTime format
+        db.session.execute(text(
+            'INSERT INTO game_review_buckets (game_id, bucket_start, review_count) '
+            'VALUES (:game_id, :bucket_start, :delta) '
+            'ON CONFLICT (game_id, bucket_start) DO UPDATE SET review_count = review_count + :delta'
+        ).bindparams(db.bindparam('bucket_start', type_=db.DateTime)), {
+            'game_id': game_id, 'bucket_start': bucket, 'delta': delta
+        })
+        return
+    if delta > 0 and dialect in ('mysql', 'postgresql'):
+        if dialect == 'mysql':
+            from sqlalchemy.dialects.mysql import insert
+            stmt = insert(GameReviewBuckets.__table__).values(game_id=game_id, bucket_start=bucket, review_count=delta)
+            stmt = stmt.on_duplicate_key_update(review_count=GameReviewBuckets.__table__.c.review_count + delta)
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+            stmt = insert(GameReviewBuckets.__table__).values(game_id=game_id, bucket_start=bucket, review_count=delta)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['game_id', 'bucket_start'],
+                set_={'review_count': GameReviewBuckets.__table__.c.review_count + delta}
+            )
+        db.session.execute(stmt)
+        return
+    
+    column = GameReviewBuckets.review_count
+    value = column + delta if delta >= 0 else db.case([(column > -delta, column + delta)], else_=0)
+    updated = GameReviewBuckets.query.filter_by(game_id=game_id, bucket_start=bucket).update(
+        {column: value}, synchronize_session=False
+    )
+    if not updated and delta > 0:
+        db.session.add(GameReviewBuckets(game_id=game_id, bucket_start=bucket, review_count=delta))
+
+def rebuild_review_buckets(days=7):
+    """Recompute the hourly review buckets of the last days from the reviews table"""
+    since = _review_bucket(datetime.utcnow() - timedelta(days=days))
+    counts = {}
+    for game_id, created_at in db.session.query(Reviews.id_game, Reviews.date_created).filter(
+        Reviews.date_created >= since
+    ):
+        key = (game_id, _review_bucket(created_at))
+        counts[key] = counts.get(key, 0) + 1
+    
+    GameReviewBuckets.query.delete(synchronize_session=False)
+    db.session.bulk_insert_mappings(GameReviewBuckets, [
+        {'game_id': game_id, 'bucket_start': bucket, 'review_count': count}
+        for (game_id, bucket), count in counts.items()
+    ])
+    db.session.commit()
+    leaderboard_cache.backend.delete(_leaderboard_key(days, 10))
+    return len(counts)
+
+def prune_review_buckets(days=7):
+    """Delete the hourly buckets that have left the leaderboard window; returns how many"""
+    since = _review_bucket(datetime.utcnow() - timedelta(days=days))
+    deleted = GameReviewBuckets.query.filter(GameReviewBuckets.bucket_start < since).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+def _leaderboard_key(days, limit):
+    return leaderboard_cache.key('most-reviewed', f'{days} days', variant=str(limit))
+
+def most_reviewed_games(days=7, limit=10):
+    """
+    [(game_id, review_count)] for the games with the most reviews in the rolling
+    window, summed from the hourly buckets and cached for LEADERBOARD_CACHE_TTL.
+    Read-only: buckets that have left the window are ignored here and deleted by
+    prune_review_buckets.
+    """
+    key = _leaderboard_key(days, limit)
+    
+    def compute():
+        since = _review_bucket(datetime.utcnow() - timedelta(days=days))
+        total = db.func.sum(GameReviewBuckets.review_count)
+        rows = db.session.query(GameReviewBuckets.game_id, total.label('review_count')).filter(
+            GameReviewBuckets.bucket_start >= since
+        ).group_by(GameReviewBuckets.game_id).having(total > 0).order_by(
+            db.desc('review_count'), GameReviewBuckets.game_id
+        ).limit(limit).all()
+        return [[game_id, int(review_count)] for game_id, review_count in rows]
+    
+    result, _ = leaderboard_cache.get_or_fetch(key, compute)
+    return [tuple(row) for row in result]
+
+def latest_reviews_by_game(game_ids):
+    """The newest review of each game, fetched with one ROW_NUMBER() window query"""
+    if not game_ids:
+        return {}
+    ranked = db.session.query(
+        Reviews.id.label('review_id'),
+        db.func.row_number().over(
+            partition_by=Reviews.id_game,
+            order_by=(Reviews.date_created.desc(), Reviews.id.desc())
+        ).label('position')
+    ).filter(Reviews.id_game.in_(game_ids)).subquery()
+    
+    reviews = Reviews.query.join(ranked, ranked.c.review_id == Reviews.id).filter(ranked.c.position == 1).all()
+    return {review.id_game: review for review in reviews}
+
+def reconcile_review_counters():
+    """Rebuild the Reviews engagement counters from the likes, comments and reposts tables"""
+    likes = db.select([db.func.count(Likes.id)]).where(Likes.review_id == Reviews.id).as_scalar()
+    comments = db.select([db.func.count(Comments.comment_id)]).where(Comments.review_id == Reviews.id).as_scalar()
+    reposts = db.select([db.func.count(Reposts.id)]).where(Reposts.review_id == Reviews.id).as_scalar()
+    
+    updated = Reviews.query.update({
+        Reviews.likes_count: likes,
+        Reviews.comment_count: comments,
+        Reviews.reposts_count: reposts
+    }, synchronize_session=False)
+    db.session.commit()
+    return updated
+
+def reconcile_follower_counts():
+    """Rebuild User.follower_count from the follow table"""
+    followers = db.select([db.func.count(Follow.id)]).where(Follow.following_id == User.id).as_scalar()
+    updated = User.query.update({User.follower_count: followers}, synchronize_session=False)
+    db.session.commit()
+    return updated
+
+def serialize_reviews(reviews, current_user_id=None, include_game_info=True):
+    """
+    Serialize a list of reviews in the Reviews.to_dict format.
+    Users, liked/reposted flags and game info are loaded for the whole list
+    with a fixed number of IN queries; counts come from the counter columns.
+    """
+    if not reviews:
+        return []
+    
+    users = _users_by_id(review.username for review in reviews)
+    engagement = _user_engagement([review.id for review in reviews], current_user_id)
+    
+    games = {}
+    if include_game_info:
+        games = _game_dicts({review.id_game for review in reviews})
+    
+    results = []
+    for review in reviews:
+        user = users.get(review.username)
+        result = {
+            "id": review.id, 
+            "id_game": review.id_game, 
+            "user_id": review.username,
+            "username": user.username if user else f"User {review.username}",
+            "profile_photo": _profile_photo_url(user),
+            "review_text": review.review_text if review.review_text else "",
+            "gif_url": review.gif_url,
+            "has_text": bool(review.review_text and review.review_text.strip()),
+            "has_gif": bool(review.gif_url),
+            "date_created": review.date_created.isoformat(' ', 'seconds'),
+            "comment_count": review.comment_count or 0,
+            "likes_count": review.likes_count or 0,
+            "reposts_count": review.reposts_count or 0,
+            "user_has_liked": review.id in engagement['liked'],
+            "user_has_reposted": review.id in engagement['reposted']
+        }
+        
+        if include_game_info and review.id_game in games:
+            result["game_info"] = games[review.id_game]
+        
+        results.append(result)
+    
+    return results
+
+def reply_counts_by_comment(review_id, comment_ids):
+    """Number of direct replies per comment, with one grouped query"""
+    if not comment_ids:
+        return {}
+    rows = db.session.query(
+        Comments.parent_id, db.func.count(Comments.comment_id)
+    ).filter(
+        Comments.review_id == review_id,
+        Comments.parent_id.in_(comment_ids)
+    ).group_by(Comments.parent_id).all()
+    return dict(rows)
+
+def serialize_comments(comments, reply_counts=None):
+    """
+    Serialize a list of comments in the Comments.to_dict format, loading all
+    authors with one IN query. reply_counts maps comment_id to its number of
+    replies; it is computed with a grouped query when not given.
+    """
+    if not comments:
+        return []
+    
+    users = _users_by_id(comment.username for comment in comments)
+    if reply_counts is None:
+        reply_counts = {}
+        for review_id in {comment.review_id for comment in comments}:
+            reply_counts.update(reply_counts_by_comment(
+                review_id, [comment.comment_id for comment in comments if comment.review_id == review_id]
+            ))
+    
+    results = []
+    for comment in comments:
+        try:
+            user = users.get(int(comment.username))
+        except (TypeError, ValueError):
+            user = None
+        
+        results.append({
+            "comment_id": comment.comment_id,
+            "parent_id": comment.parent_id,
+            "review_id": comment.review_id,
+            "user_id": comment.username,  # Keep the original ID for reference
+            "username": user.username if user else f"User {comment.username}",  # Add the actual username
+            "profile_photo": _profile_photo_url(user),
+            "comment": comment.comment if comment.comment else "",  # Handle null comments
+            "gif_url": comment.gif_url,
+            "has_text": bool(comment.comment and comment.comment.strip()),
+            "has_gif": bool(comment.gif_url),
+            "date_created": comment.date_created.isoformat(' ', 'seconds'),
+            "reply_count": reply_counts.get(comment.comment_id, 0)
+        })
+    
+    return results
+
+def serialize_reposts(reposts, current_user_id=None):
+    """
+    Serialize a list of reposts in the Reposts.to_dict format, hydrating the
+    reposters and the original reviews in bulk
+    """
+    if not reposts:
+        return []
+    
+    users = _users_by_id(repost.user_id for repost in reposts)
+    
+    review_ids = {repost.review_id for repost in reposts}
+    original_reviews = Reviews.query.filter(Reviews.id.in_(review_ids)).all()
+    review_dicts = {
+        review_dict['id']: review_dict
+        for review_dict in serialize_reviews(original_reviews, current_user_id=current_user_id)
+    }
+    
+    results = []
+    for repost in reposts:
+        user = users.get(repost.user_id)
+        original_review = review_dicts.get(repost.review_id)
+        results.append({
+            "id": repost.id,
+            "type": "repost",  # Identifier to distinguish from regular reviews
+            "user_id": repost.user_id,
+            "username": user.username if user else f"User {repost.user_id}",
+            "profile_photo": _profile_photo_url(user),
+            "repost_text": repost.repost_text,
+            "created_at": repost.created_at.isoformat(' ', 'seconds'),
+            "original_review": original_review,
+            # Repost count and flag are those of the original review
+            "repost_count": original_review['reposts_count'] if original_review else 0,
+            "user_has_reposted": original_review['user_has_reposted'] if original_review else False
+        })
+    
+    return results
+
+def keyset_page(query, ts_column, id_column, cursor, size):
+    """
+    Fetch one newest-first page of a (timestamp, id) keyset pagination.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    Raises ValueError for a malformed cursor.
+    """
+    if cursor:
+        values = decode_cursor(cursor)
+        try:
+            last_ts, last_id = datetime.fromisoformat(values[0]), int(values[1])
+        except (IndexError, TypeError, ValueError):
+            raise ValueError('Invalid cursor')
+        query = query.filter(db.or_(
+            ts_column < last_ts,
+            db.and_(ts_column == last_ts, id_column < last_id)
+        ))
+    
+    rows = query.order_by(ts_column.desc(), id_column.desc()).limit(size + 1).all()
+    
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, ts_column.key), getattr(last, id_column.key))
+    
+    return rows, next_cursor
+
+def _parse_feed_cursor(cursor):
+    """Decode a (ts, kind, item_id) feed cursor; raises ValueError when malformed"""
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(values[0]), str(values[1]), int(values[2])
+    except (IndexError, TypeError, ValueError):
+        raise ValueError('Invalid cursor')
+
+def _feed_branch(kind, id_column, ts_column, limit, cursor_values=None, *criteria):
+    """One side of a feed UNION: the newest (kind, item_id, ts) rows of a table"""
+    branch = db.select([
+        db.literal_column(f"'{kind}'").label('kind'),
+        id_column.label('item_id'),
+        ts_column.label('ts')
+    ])
+    if criteria:
+        branch = branch.where(db.and_(*criteria))
+    
+    if cursor_values:
+        last_ts, last_kind, last_id = cursor_values
+        # Rows after the cursor in (ts desc, kind desc, item_id desc) order
+        if kind < last_kind:
+            branch = branch.where(ts_column <= last_ts)
+        elif kind == last_kind:
+            branch = branch.where(db.or_(
+                ts_column < last_ts,
+                db.and_(ts_column == last_ts, id_column < last_id)
+            ))
+        else:
+            branch = branch.where(ts_column < last_ts)
+    
+    newest = branch.order_by(ts_column.desc(), id_column.desc()).limit(limit).alias(f'{kind}_rows')
+    return db.select([newest.c.kind, newest.c.item_id, newest.c.ts])
+
+def _merge_feed_branches(branches, size, offset=0, cursor=None):
+    """
+    Merge (kind, item_id, ts) branches with UNION ALL and return one page
+    ordered by (ts desc, kind desc, item_id desc) as (rows, next_cursor).
+    next_cursor is only set in cursor mode (cursor is not None).
+    """
+    if len(branches) == 1:
+        feed = branches[0].alias('feed')
+    else:
+        feed = db.union_all(*branches).alias('feed')
+    
+    rows = db.session.query(feed.c.kind, feed.c.item_id, feed.c.ts).order_by(
+        feed.c.ts.desc(), feed.c.kind.desc(), feed.c.item_id.desc()
+    ).offset(offset).limit(size + 1).all()
+    
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        if cursor is not None:
+            last = rows[-1]
+            next_cursor = encode_cursor(last.ts, last.kind, last.item_id)
+    
+    return rows, next_cursor
+
+def home_feed_page(size, offset=0, cursor=None):
+    """
+    Page through reviews and reposts merged by date in the database.
+    Each table contributes only its newest candidate rows (via its date index)
+    to a UNION ALL over a common (kind, item_id, ts) projection.
+    Returns (rows, next_cursor) where rows are (kind, item_id, ts) tuples;
+    next_cursor is only set in cursor mode. Raises ValueError for a malformed cursor.
+    """
+    cursor_values = _parse_feed_cursor(cursor)
+    limit = offset + size + 1
+    return _merge_feed_branches([
+        _feed_branch('review', Reviews.id, Reviews.date_created, limit, cursor_values),
+        _feed_branch('repost', Reposts.id, Reposts.created_at, limit, cursor_values)
+    ], size, offset=offset, cursor=cursor)
+
+def hydrate_feed_rows(feed_rows, current_user_id=None):
+    """
+    Serialize (kind, item_id, ts) feed rows into review/repost dicts tagged with
+    feed_type, keeping the row order. Rows whose item no longer exists are skipped.
+    """
+    review_ids = [row.item_id for row in feed_rows if row.kind == 'review']
+    repost_ids = [row.item_id for row in feed_rows if row.kind == 'repost']
+    reviews = Reviews.query.filter(Reviews.id.in_(review_ids)).all() if review_ids else []
+    reposts = Reposts.query.options(
+        db.joinedload(Reposts.review)
+    ).filter(Reposts.id.in_(repost_ids)).all() if repost_ids else []
+    
+    # Get unique game IDs for batch caching
+    game_ids_from_reviews = [r.id_game for r in reviews]
+    game_ids_from_reposts = [r.review.id_game for r in reposts if r.review]
+    unique_game_ids = list(set(game_ids_from_reviews + game_ids_from_reposts))
+    if unique_game_ids:
+        get_or_cache_games(db, Games, unique_game_ids)
+    
+    feed_items = {}
+    for review_dict in serialize_reviews(reviews, current_user_id=current_user_id, include_game_info=True):
+        review_dict['feed_type'] = 'review'
+        feed_items[('review', review_dict['id'])] = review_dict
+    for repost_dict in serialize_reposts(reposts, current_user_id=current_user_id):
+        repost_dict['feed_type'] = 'repost'
+        feed_items[('repost', repost_dict['id'])] = repost_dict
+    
+    return [
+        feed_items[(row.kind, row.item_id)]
+        for row in feed_rows if (row.kind, row.item_id) in feed_items
+    ]
+
+def find_stale_games(limit):
+    """
+    Cached games past the soft TTL as (game_id, recent_activity) pairs, ordered by
+    review and save activity over the last week, then by age
+    """
+    stale_before = datetime.utcnow() - GAME_CACHE_SOFT_TTL
+    active_since = datetime.utcnow() - timedelta(days=7)
+    
+    recent_reviews = db.select([db.func.count(Reviews.id)]).where(db.and_(
+        Reviews.id_game == Games.id, Reviews.date_created >= active_since
+    )).as_scalar()
+    recent_saves = db.select([db.func.count(SavedGames.id)]).where(db.and_(
+        SavedGames.game_id == Games.id, SavedGames.created_at >= active_since
+    )).as_scalar()
+    activity = (recent_reviews + recent_saves).label('activity')
+    
+    return db.session.query(Games.id, activity).filter(
+        Games.last_updated < stale_before
+    ).order_by(db.desc('activity'), Games.last_updated.asc()).limit(limit).all()
+
+game_refresher = GameCacheRefresher(db, Games, GameRefreshQueue, find_stale_games)
+
+# Follower timelines (fan-out on write)
+TIMELINE_FANOUT_LIMIT = int(os.getenv('TIMELINE_FANOUT_LIMIT', 5000))  # Authors with more followers are pulled at read time
+TIMELINE_BACKFILL_LIMIT = int(os.getenv('TIMELINE_BACKFILL_LIMIT', 100))  # Items copied into a timeline on follow
+TIMELINE_FANOUT_CHUNK = 1000
+
+def insert_timeline_entries(entries):
+    """
+    Insert timeline rows, skipping any that already exist. Fan-out and backfill
+    run concurrently for the same author, so rows can appear between their
+    existence check and the insert; conflicts on unique_timeline_entry are
+    ignored by the database instead of failing the whole batch.
+    """
+    if not entries:
+        return
+    
+    dialect = db.engine.dialect.name
+    table = TimelineEntries.__table__
+    if dialect == 'mysql':
+        stmt = table.insert().prefix_with('IGNORE')
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).on_conflict_do_nothing(index_elements=['user_id', 'kind', 'item_id'])
+    elif dialect == 'sqlite':
+        stmt = table.insert().prefix_with('OR IGNORE')
+    else:
+        stmt = None
+    
+    if stmt is None:
+        db.session.bulk_insert_mappings(TimelineEntries, entries)
+    else:
+        db.session.execute(stmt, entries)
+
+def fan_out_to_followers(author_id, kind, item_id, created_at):
+    """
+    Push a new review/repost into the timelines of the author's followers.
+    Authors over TIMELINE_FANOUT_LIMIT followers are skipped - their items are
+    pulled into timelines at read time instead.
+    """
+    author = User.query.get(author_id)
+    if not author or author.follower_count >= TIMELINE_FANOUT_LIMIT:
+        return 0
+    
+    already_pushed = {row[0] for row in db.session.query(TimelineEntries.user_id).filter_by(
+        kind=kind, item_id=item_id
+    ).all()}
+    follower_ids = [
+        row[0] for row in db.session.query(Follow.follower_id).filter_by(following_id=author_id).all()
+        if row[0] not in already_pushed
+    ]
+    
+    for start in range(0, len(follower_ids), TIMELINE_FANOUT_CHUNK):
+        insert_timeline_entries([{
+            'user_id': follower_id,
+            'author_id': author_id,
+            'kind': kind,
+            'item_id': item_id,
+            'created_at': created_at
+        } for follower_id in follower_ids[start:start + TIMELINE_FANOUT_CHUNK]])
+        db.session.commit()
+    
+    return len(follower_ids)
+
+def backfill_timeline(user_id, author_id, limit=TIMELINE_BACKFILL_LIMIT):
+    """Copy an author's most recent reviews and reposts into one follower's timeline"""
+    author = User.query.get(author_id)
+    if not author or author.follower_count >= TIMELINE_FANOUT_LIMIT:
+        return 0
+    
+    rows, _ = _merge_feed_branches([
+        _feed_branch('review', Reviews.id, Reviews.date_created, limit, None, Reviews.username == author_id),
+        _feed_branch('repost', Reposts.id, Reposts.created_at, limit, None, Reposts.user_id == author_id)
+    ], limit)
+    
+    existing = {(row.kind, row.item_id) for row in TimelineEntries.query.filter_by(
+        user_id=user_id, author_id=author_id
+    ).all()}
+    insert_timeline_entries([{
+        'user_id': user_id,
+        'author_id': author_id,
+        'kind': row.kind,
+        'item_id': row.item_id,
+        'created_at': row.ts
+    } for row in rows if (row.kind, row.item_id) not in existing])
+    db.session.commit()
+    return len(rows)
+
+def remove_from_timelines(kind, item_ids):
+    """Remove deleted reviews/reposts from every timeline (in the current transaction)"""
+    if item_ids:
+        TimelineEntries.query.filter(
+            TimelineEntries.kind == kind,
+            TimelineEntries.item_id.in_(item_ids)
+        ).delete(synchronize_session=False)
+
+def timeline_page(user_id, size, cursor=None):
+    """
+    One keyset page of a user's timeline: the materialized entries merged with
+    items pulled at read time from followed authors too big to fan out to.
+    Raises ValueError for a malformed cursor.
+    """
+    cursor_values = _parse_feed_cursor(cursor)
+    limit = size + 1
+    
+    celebrity_ids = [row[0] for row in db.session.query(User.id).join(
+        Follow, Follow.following_id == User.id
+    ).filter(
+        Follow.follower_id == user_id,
+        User.follower_count >= TIMELINE_FANOUT_LIMIT
+    ).all()]
+    
+    entries = db.select([
+        TimelineEntries.kind.label('kind'),
+        TimelineEntries.item_id.label('item_id'),
+        TimelineEntries.created_at.label('ts')
+    ]).where(TimelineEntries.user_id == user_id)
+    if celebrity_ids:
+        # Entries written before an author crossed the fan-out limit are served by the pull branches
+        entries = entries.where(TimelineEntries.author_id.notin_(celebrity_ids))
+    if cursor_values:
+        last_ts, last_kind, last_id = cursor_values
+        entries = entries.where(db.or_(
+            TimelineEntries.created_at < last_ts,
+            db.and_(TimelineEntries.created_at == last_ts, db.or_(
+                TimelineEntries.kind < last_kind,
+                db.and_(TimelineEntries.kind == last_kind, TimelineEntries.item_id < last_id)
+            ))
+        ))
+    entries = entries.order_by(
+        TimelineEntries.created_at.desc(), TimelineEntries.kind.desc(), TimelineEntries.item_id.desc()
+    ).limit(limit).alias('entry_rows')
+    branches = [db.select([entries.c.kind, entries.c.item_id, entries.c.ts])]
+    
+    if celebrity_ids:
+        branches.append(_feed_branch('review', Reviews.id, Reviews.date_created, limit, cursor_values,
+                                     Reviews.username.in_(celebrity_ids)))
+        branches.append(_feed_branch('repost', Reposts.id, Reposts.created_at, limit, cursor_values,
+                                     Reposts.user_id.in_(celebrity_ids)))
+    
+    return _merge_feed_branches(branches, size, cursor=cursor if cursor is not None else '')
+
+# Full-text search over review and comment text: kind -> (table, key column, text column)
+FULLTEXT_TARGETS = {
+    'reviews': ('reviews', 'id', 'review_text'),
+    'comments': ('comments', 'comment_id', 'comment')
+}
+
+def setup_fulltext_search():
+    """
+    Create the full-text indexes if they are missing. MySQL gets a FULLTEXT index
+    (InnoDB maintains it on every insert, update and delete); SQLite gets an
+    external-content FTS5 table kept in sync by triggers.
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'mysql':
+        inspector = inspect(db.engine)
+        for table, _, column in FULLTEXT_TARGETS.values():
+            index_name = f'ft_{table}_{column}'
+            if index_name not in {index['name'] for index in inspector.get_indexes(table)}:
+                db.session.execute(text(f'ALTER TABLE {table} ADD FULLTEXT INDEX {index_name} ({column})'))
+    elif dialect == 'sqlite':
+        for table, key, column in FULLTEXT_TARGETS.values():
+            fts = f'{table}_fts'
+            if db.session.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                                  {'name': fts}).first():
+                continue
+            db.session.execute(text(
+                f"CREATE VIRTUAL TABLE {fts} USING fts5({column}, content='{table}', content_rowid='{key}')"
+            ))
+            db.session.execute(text(
+                f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {column}) VALUES (new.{key}, new.{column}); END"
+            ))
+            db.session.execute(text(
+                f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.{key}, old.{column}); END"
+            ))
+            db.session.execute(text(
+                f"CREATE TRIGGER {fts}_update AFTER UPDATE OF {column} ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.{key}, old.{column}); "
+                f"INSERT INTO {fts}(rowid, {column}) VALUES (new.{key}, new.{column}); END"
+            ))
+            # Index the rows that existed before the FTS table
+            db.session.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+    db.session.commit()
+
+def fulltext_search(kind, query, game_id=None, user_id=None, limit=20, offset=0):
+    """
+    Ids of reviews or comments matching every word of the query (the last word as
+    a prefix), best match first, as (id, score) pairs.
+    """
+    table, key, column = FULLTEXT_TARGETS[kind]
+    dialect = db.engine.dialect.name
+    terms = re.findall(r'\w+', query.lower())[:10]
+    if dialect == 'mysql':
+        # Words below InnoDB's minimum token size are not indexed and would match nothing
+        terms = [term for term in terms if len(term) >= 3]
+    if not terms:
+        return []
+    
+    params = {'limit': limit, 'offset': offset}
+    filters = []
+    joins = ''
+    if game_id is not None:
+        if kind == 'comments':
+            joins = ' JOIN reviews r ON r.id = t.review_id'
+            filters.append('r.id_game = :game_id')
+        else:
+            filters.append('t.id_game = :game_id')
+        params['game_id'] = game_id
+    if user_id is not None:
+        # Comments store the author's id as a string
+        filters.append('t.username = :user_id')
+        params['user_id'] = str(user_id) if kind == 'comments' else user_id
+    
+    if dialect == 'sqlite':
+        params['match'] = ' '.join(f'"{term}"' for term in terms) + '*'
+        sql = (f'SELECT t.{key}, -{table}_fts.rank AS score FROM {table}_fts '
+               f'JOIN {table} t ON t.{key} = {table}_fts.rowid{joins} '
+               f'WHERE {table}_fts MATCH :match')
+        order = f'{table}_fts.rank, t.{key} DESC'
+    elif dialect == 'mysql':
+        params['match'] = ' '.join(f'+{term}' for term in terms) + '*'
+        match = f'MATCH(t.{column}) AGAINST(:match IN BOOLEAN MODE)'
+        sql = f'SELECT t.{key}, {match} AS score FROM {table} t{joins} WHERE {match}'
+        order = f'score DESC, t.{key} DESC'
+    else:
+        # No full-text index on this database - fall back to a scan
+        for i, term in enumerate(terms):
+            filters.append(f'LOWER(t.{column}) LIKE :term{i}')
+            params[f'term{i}'] = f'%{term}%'
+        sql = f'SELECT t.{key}, 0 AS score FROM {table} t{joins} WHERE 1 = 1'
+        order = f't.{key} DESC'
+    
+    for condition in filters:
+        sql += f' AND {condition}'
+    sql += f' ORDER BY {order} LIMIT :limit OFFSET :offset'
+    return [(row[0], round(float(row[1] or 0), 4)) for row in db.session.execute(text(sql), params)]
+
+# Fingerprints for conditional_response - cheap queries over the rows behind a response
+
+def _parse_game_ids(values):
+    game_ids = []
+    for value in values:
+        try:
+            game_id = int(value)
+        except (ValueError, TypeError):
+            continue
+        if game_id > 0:
+            game_ids.append(game_id)
+    return game_ids
+
+def game_version():
+    id_value = request.args.get('id', '')
+    if not id_value.isdigit():
+        return None
+    last_updated = db.session.query(Games.last_updated).filter(Games.id == int(id_value)).scalar()
+    if last_updated is None or last_updated < datetime.utcnow() - GAME_CACHE_SOFT_TTL:
+        return None  # Not cached, or stale - the view has to run to refresh it
+    return last_updated, last_updated
+
+def bulk_games_version():
+    game_ids = sorted(set(_parse_game_ids(request.args.get('ids', '').split(','))))
+    if not game_ids:
+        return None
+    count, oldest, last_updated = db.session.query(
+        db.func.count(Games.id), db.func.min(Games.last_updated), db.func.max(Games.last_updated)
+    ).filter(Games.id.in_(game_ids)).one()
+    if count < len(game_ids):
+        return None  # Some games still have to be fetched from IGDB
+    if oldest is None or oldest < datetime.utcnow() - GAME_CACHE_SOFT_TTL:
+        return None  # Some games are stale - the view has to run to refresh them
+    return (game_ids, last_updated), last_updated
+
+def saved_games_version(username):
+    count, id_sum, last_saved, last_game_update = db.session.query(
+        db.func.count(SavedGames.id),
+        db.func.sum(SavedGames.id),
+        db.func.max(SavedGames.created_at),
+        db.func.max(Games.last_updated)
+    ).join(User, User.id == SavedGames.user_id).outerjoin(Games, Games.id == SavedGames.game_id).filter(
+        User.username == username
+    ).one()
+    if not count:
+        return None
+    last_modified = max(value for value in (last_saved, last_game_update) if value is not None)
+    return (count, id_sum, last_saved, last_game_update), last_modified
+
+def game_news_version():
+    loaded_at = gamerpower_snapshot.loaded_at()
+    return (loaded_at, loaded_at) if loaded_at else None
+
 @app.route('/api/search', methods=['POST'])
 def search():
     if not request.is_json:
@@ -354,12 +1216,14 @@ def search():
     sanitized_name = name.replace('"', '')
     
     try:
-        t = check_token()
-        token = t.json()['access_token']
-        headers = {'Client-ID': f'{os.getenv("IGDB_CLIENT")}', 'Authorization':f'Bearer {token}'}
-        body = f'fields *; search "{sanitized_name}";'
-        response = requests.post('https://api.igdb.com/v4/games/', headers=headers, data=body)
-        result = response.json()
+        cache_key = search_cache.key('search', sanitized_name)
+        result = search_cache.get(cache_key)
+        if result is None:
+            body = f'fields id; search "{sanitized_name}"; limit 1;'
+            response = igdb_post('games', body)
+            result = response.json()
+            if response.status_code == 200:
+                search_cache.set(cache_key, result)
         
         if not result:
             return jsonify({"status": "No games found"}), 404
@@ -373,6 +1237,7 @@ def search():
         return jsonify({"status": f"An error occurred: {str(e)}"}), 500
 
 @app.route('/api/game', methods=['GET', 'POST'])
+@conditional_response('public, max-age=300, stale-while-revalidate=3600', version=game_version)
 def game():
     try:
         # Get the ID value from the request (JSON body for POST or query params for GET)
@@ -406,7 +1271,11 @@ def game():
         # Try to get from cache first
         cached_game = Games.query.get(id_value)
         
-        if cached_game and not Games.should_refresh(cached_game):
+        if cached_game and not Games.is_expired(cached_game):
+            # Stale but within the hard TTL - serve it now and refresh it in the background
+            if Games.should_refresh(cached_game):
+                schedule_game_refresh(db, Games, [id_value])
+            
             # Return cached data in IGDB format for backward compatibility
             game_dict = cached_game.to_dict()
             
@@ -425,7 +1294,7 @@ def game():
             return jsonify(result), 200
         
         # Fetch from IGDB and cache
-        game_data = fetch_game_from_igdb(id_value)
+        game_data = fetch_game_from_igdb(id_value, raise_errors=True)
         if not game_data:
             return jsonify({"status": "Game not found"}), 404
         
@@ -451,25 +1320,31 @@ def game():
         
     except ValueError as e:
         return jsonify({"status": f"Invalid ID format: {str(e)}"}), 400
+    except (UpstreamError, requests.RequestException):
+        return jsonify({"status": "Game service unavailable"}), 503
     except Exception as e:
         print(f"Error in /game route: {str(e)}")
         return jsonify({"status": "An error occurred processing your request"}), 500
 
-@app.route('/api/games/bulk', methods=['POST'])
+@app.route('/api/games/bulk', methods=['GET', 'POST'])
+@conditional_response('public, max-age=300, stale-while-revalidate=3600', version=bulk_games_version)
 def bulk_games():
     """
     Fetch multiple games efficiently using cache-first approach
-    Accepts: {"game_ids": [1, 2, 3, ...]}
+    Accepts: {"game_ids": [1, 2, 3, ...]} or, cacheable, GET ?ids=1,2,3
     Returns: {"games": {1: {...}, 2: {...}, ...}}
     """
     try:
-        if not request.is_json:
-            return jsonify({"status": "JSON request expected"}), 400
-        
-        if 'game_ids' not in request.json:
-            return jsonify({"status": "game_ids array is required"}), 400
-        
-        game_ids = request.json['game_ids']
+        if request.method == 'GET':
+            game_ids = [game_id for game_id in request.args.get('ids', '').split(',') if game_id]
+        else:
+            if not request.is_json:
+                return jsonify({"status": "JSON request expected"}), 400
+            
+            if 'game_ids' not in request.json:
+                return jsonify({"status": "game_ids array is required"}), 400
+            
+            game_ids = request.json['game_ids']
         
         if not isinstance(game_ids, list):
             return jsonify({"status": "game_ids must be an array"}), 400
@@ -478,14 +1353,7 @@ def bulk_games():
             return jsonify({"status": "Maximum 50 games per request"}), 400
         
         # Validate all IDs
-        validated_ids = []
-        for game_id in game_ids:
-            try:
-                validated_id = int(game_id)
-                if validated_id > 0:
-                    validated_ids.append(validated_id)
-            except (ValueError, TypeError):
-                continue
+        validated_ids = _parse_game_ids(game_ids)
         
         if not validated_ids:
             return jsonify({"games": {}}), 200
@@ -534,6 +1402,7 @@ def register():
                 
             new_user = User(username=user, email=email, password=hashed_password)
             db.session.add(new_user)
+            index_username(new_user)
             db.session.commit()
             info.pop('pass')
             return info, 201
@@ -666,38 +1535,50 @@ def follow_user():
     follower_id = request.token_data['user']
     
     # Find the target user
-    target_user = User.query.filter_by(username=target_username).first()
-    if not target_user:
+    target_user_id = user_id_for_username(target_username)
+    if target_user_id is None:
         return jsonify({'status': 'User not found'}), 404
     
     # Can't follow yourself
-    if follower_id == target_user.id:
+    if follower_id == target_user_id:
         return jsonify({'status': 'Cannot follow yourself'}), 400
     
     # Check if already following
     existing_follow = Follow.query.filter_by(
         follower_id=follower_id,
-        following_id=target_user.id
+        following_id=target_user_id
     ).first()
     
     if existing_follow:
-        # Unfollow
+        # Unfollow - also drop the target's items from the follower's timeline
         db.session.delete(existing_follow)
+        User.query.filter_by(id=target_user_id).update({
+            User.follower_count: db.case([(User.follower_count > 0, User.follower_count - 1)], else_=0)
+        }, synchronize_session=False)
+        TimelineEntries.query.filter_by(
+            user_id=follower_id, author_id=target_user_id
+        ).delete(synchronize_session=False)
         db.session.commit()
         return jsonify({'status': 'unfollowed', 'is_following': False}), 200
     else:
         # Follow
-        new_follow = Follow(follower_id=follower_id, following_id=target_user.id)
+        new_follow = Follow(follower_id=follower_id, following_id=target_user_id)
         db.session.add(new_follow)
+        User.query.filter_by(id=target_user_id).update({
+            User.follower_count: User.follower_count + 1
+        }, synchronize_session=False)
         db.session.commit()
+        
+        # Copy the target's recent reviews and reposts into the follower's timeline
+        run_in_background(app, backfill_timeline, follower_id, target_user_id)
         return jsonify({'status': 'followed', 'is_following': True}), 200
 
 @app.route('/api/user/<username>/followers', methods=['GET'])
 @token_required
 def get_user_followers(username):
     """Get list of users following this user"""
-    user = User.query.filter_by(username=username).first()
-    if not user:
+    user_id = user_id_for_username(username)
+    if user_id is None:
         return jsonify({'status': 'User not found'}), 404
     
     page = int(request.args.get('page', 1))
@@ -705,7 +1586,7 @@ def get_user_followers(username):
     
     followers_query = db.session.query(User).join(
         Follow, User.id == Follow.follower_id
-    ).filter(Follow.following_id == user.id)
+    ).filter(Follow.following_id == user_id)
     
     total_followers = followers_query.count()
     followers = followers_query.offset((page - 1) * size).limit(size).all()
@@ -730,8 +1611,8 @@ def get_user_followers(username):
 @token_required
 def get_user_following(username):
     """Get list of users this user is following"""
-    user = User.query.filter_by(username=username).first()
-    if not user:
+    user_id = user_id_for_username(username)
+    if user_id is None:
         return jsonify({'status': 'User not found'}), 404
     
     page = int(request.args.get('page', 1))
@@ -739,7 +1620,7 @@ def get_user_following(username):
     
     following_query = db.session.query(User).join(
         Follow, User.id == Follow.following_id
-    ).filter(Follow.follower_id == user.id)
+    ).filter(Follow.follower_id == user_id)
     
     total_following = following_query.count()
     following = following_query.offset((page - 1) * size).limit(size).all()
@@ -809,7 +1690,7 @@ def edit(id):
             return jsonify({"status": "Invalid GIF URL"}), 400
     
     try:
-        comment.Comment = new_comment_text
+        comment.comment = new_comment_text
         comment.gif_url = new_gif_url
         db.session.commit()
         
@@ -828,6 +1709,7 @@ def delete(id):
     #apenas o criador deletar
     comment = Comments.query.get_or_404(id)
     db.session.delete(comment)
+    bump_review_counter(comment.review_id, Reviews.comment_count, -1)
     db.session.commit()
     return {"status":"comentario deletado"}, 200
 
@@ -887,11 +1769,15 @@ def create_review():
             username=user_id, 
             id_game=id_game, 
             review_text=sanitized_review,
-            gif_url=validated_gif_url
+            gif_url=validated_gif_url,
+            date_created=datetime.utcnow()
         )
         db.session.add(new_review)
+        bump_review_bucket(id_game, new_review.date_created, 1)
         db.session.commit()
         
+        run_in_background(app, fan_out_to_followers, user_id, 'review', new_review.id, new_review.date_created)
+        
         # Return the created review data with game info
         return jsonify({
             'status': 'review created',
@@ -967,6 +1853,7 @@ def create_comment():
             gif_url=validated_gif_url
         )
         db.session.add(new_comment)
+        bump_review_counter(review_id, Reviews.comment_count, 1)
         db.session.commit()
         
         # Return the created comment data
@@ -1005,16 +1892,34 @@ def get_review_comments(review_id):
             Comments.date_created.asc()
         ).offset(offset).limit(size).all()
         
+        # Load the replies of every root on this page in one query
+        root_ids = [comment.comment_id for comment in comments]
+        replies = Comments.query.filter(
+            Comments.review_id == review_id,
+            Comments.parent_id.in_(root_ids)
+        ).order_by(
+            Comments.date_created.asc()
+        ).all() if root_ids else []
+        
+        replies_by_parent = {}
+        for reply in replies:
+            replies_by_parent.setdefault(reply.parent_id, []).append(reply)
+        
+        # Roots have all their replies loaded; replies' own counts come from one grouped query
+        reply_counts = {root_id: len(replies_by_parent.get(root_id, [])) for root_id in root_ids}
+        reply_counts.update(reply_counts_by_comment(review_id, [reply.comment_id for reply in replies]))
+        
+        # Serialize roots and replies together so authors are loaded once
+        serialized = serialize_comments(comments + replies, reply_counts=reply_counts)
+        comment_dicts = serialized[:len(comments)]
+        reply_dicts = dict(zip((reply.comment_id for reply in replies), serialized[len(comments):]))
+        
         # Build comment tree with replies
-        comment_dicts = []
-        for comment in comments:
-            comment_dict = comment.to_dict()
-            # Get replies for this comment
-            replies = Comments.query.filter_by(parent_id=comment.comment_id).order_by(
-                Comments.date_created.asc()
-            ).all()
-            comment_dict['replies'] = [reply.to_dict() for reply in replies]
-            comment_dicts.append(comment_dict)
+        for comment_dict in comment_dicts:
+            comment_dict['replies'] = [
+                reply_dicts[reply.comment_id]
+                for reply in replies_by_parent.get(comment_dict['comment_id'], [])
+            ]
         
         result = {
             "comments": comment_dicts,
@@ -1113,149 +2018,187 @@ def ver():
     offset = (page - 1) * size
     current_user_id = request.token_data['user']
     
+    # Keyset pagination: any 'cursor' parameter (empty for the first page) switches modes
+    cursor = request.args.get('cursor')
+    if cursor is None and request.method == 'POST':
+        cursor = request.json.get('cursor')
+    use_cursor = cursor is not None
+    
     if busca == "game":
         # Get reviews for specific game with cached game info
-        total_reviews = Reviews.query.filter_by(id_game=id_game).count()
-        reviews = Reviews.query.options(
-            db.joinedload(Reviews.game_info),
-            db.joinedload(Reviews.user)
-        ).filter_by(id_game=id_game).order_by(
-            Reviews.date_created.desc()
-        ).offset(offset).limit(size).all()
-        
-        # Ensure all games are cached
-        unique_game_ids = list(set([r.id_game for r in reviews]))
-        if unique_game_ids:
-            get_or_cache_games(db, Games, unique_game_ids)
-        
-        review_dicts = [review.to_dict(current_user_id=current_user_id, include_game_info=True) for review in reviews]
-        
-        result = {
-            "comments": review_dicts,
-            "pagination": {
+        reviews_query = Reviews.query.filter_by(id_game=id_game)
+    elif busca == "user":
+        # Get reviews for specific user with cached game info
+        reviews_query = Reviews.query.filter_by(username=user_id)
+    elif busca == "ambos" and id_game and id_game > 0:
+        # Get reviews for specific game and user
+        reviews_query = Reviews.query.filter_by(id_game=id_game, username=user_id)
+    else:
+        reviews_query = None
+    
+    if reviews_query is not None:
+        if use_cursor:
+            try:
+                reviews, next_cursor = keyset_page(reviews_query, Reviews.date_created, Reviews.id, cursor, size)
+            except ValueError:
+                return jsonify({"status": "Invalid cursor"}), 400
+            pagination = {
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+                "per_page": size
+            }
+        else:
+            total_reviews = reviews_query.count()
+            reviews = reviews_query.order_by(
+                Reviews.date_created.desc()
+            ).offset(offset).limit(size).all()
+            pagination = {
                 "total": total_reviews,
                 "pages": (total_reviews + size - 1) // size,
                 "current_page": page,
                 "per_page": size
             }
-        }
-        return jsonify(result), 200
-        
-    elif busca == "user":
-        # Get reviews for specific user with cached game info
-        total_reviews = Reviews.query.filter_by(username=user_id).count()
-        reviews = Reviews.query.options(
-            db.joinedload(Reviews.game_info),
-            db.joinedload(Reviews.user)
-        ).filter_by(username=user_id).order_by(
-            Reviews.date_created.desc()
-        ).offset(offset).limit(size).all()
         
-        # Get unique game IDs for batch caching
+        # Ensure all games are cached
         unique_game_ids = list(set([r.id_game for r in reviews]))
         if unique_game_ids:
             get_or_cache_games(db, Games, unique_game_ids)
         
-        review_dicts = [review.to_dict(current_user_id=current_user_id, include_game_info=True) for review in reviews]
+        review_dicts = serialize_reviews(reviews, current_user_id=current_user_id, include_game_info=True)
         
         result = {
             "comments": review_dicts,
-            "pagination": {
-                "total": total_reviews,
-                "pages": (total_reviews + size - 1) // size,
-                "current_page": page,
-                "per_page": size
-            }
+            "pagination": pagination
         }
         return jsonify(result), 200
         
     elif busca == "ambos":
-        if id_game and id_game > 0:
-            # Get reviews for specific game and user
-            total_reviews = Reviews.query.filter_by(id_game=id_game, username=user_id).count()
-            reviews = Reviews.query.options(
-                db.joinedload(Reviews.game_info),
-                db.joinedload(Reviews.user)
-            ).filter_by(id_game=id_game, username=user_id).order_by(
-                Reviews.date_created.desc()
-            ).offset(offset).limit(size).all()
-            
-            # Ensure games are cached
-            unique_game_ids = list(set([r.id_game for r in reviews]))
-            if unique_game_ids:
-                get_or_cache_games(db, Games, unique_game_ids)
-            
-            review_dicts = [review.to_dict(current_user_id=current_user_id, include_game_info=True) for review in reviews]
+        # For the main feed (id_game=0), merge reviews and reposts by date in the database
+        # and only hydrate the rows of the requested page
+        try:
+            feed_rows, next_cursor = home_feed_page(size, offset=0 if use_cursor else offset, cursor=cursor)
+        except ValueError:
+            return jsonify({"status": "Invalid cursor"}), 400
+        
+        review_dicts = hydrate_feed_rows(feed_rows, current_user_id=current_user_id)
+        
+        if use_cursor:
+            pagination = {
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+                "per_page": size
+            }
         else:
-            # For the main feed (id_game=0), include both reviews and reposts with optimized queries
-            # Get total counts
-            total_reviews = Reviews.query.count()
-            total_reposts = Reposts.query.count()
-            total_items = total_reviews + total_reposts
-            
-            # Get reviews with game info preloaded
-            reviews = Reviews.query.options(
-                db.joinedload(Reviews.game_info),
-                db.joinedload(Reviews.user)
-            ).order_by(Reviews.date_created.desc()).limit(size * 2).all()
-            
-            # Get reposts with related data preloaded
-            reposts = Reposts.query.options(
-                db.joinedload(Reposts.user),
-                db.joinedload(Reposts.review).joinedload(Reviews.game_info),
-                db.joinedload(Reposts.review).joinedload(Reviews.user)
-            ).order_by(Reposts.created_at.desc()).limit(size * 2).all()
-            
-            # Get unique game IDs for batch caching
-            game_ids_from_reviews = [r.id_game for r in reviews]
-            game_ids_from_reposts = [r.review.id_game for r in reposts if r.review]
-            unique_game_ids = list(set(game_ids_from_reviews + game_ids_from_reposts))
-            if unique_game_ids:
-                print(f"Caching games for IDs: {unique_game_ids}")
-                cached_games = get_or_cache_games(db, Games, unique_game_ids)
-                print(f"Cached {len(cached_games)} games")
-            
-            # Convert to dictionaries with unified format for sorting
-            feed_items = []
-            
-            for review in reviews:
-                review_dict = review.to_dict(current_user_id=current_user_id, include_game_info=True)
-                print(f"Review {review.id} game_info: {review_dict.get('game_info', 'None')}")
-                review_dict['feed_type'] = 'review'
-                review_dict['sort_date'] = review.date_created
-                feed_items.append(review_dict)
-            
-            for repost in reposts:
-                repost_dict = repost.to_dict(current_user_id=current_user_id)
-                repost_dict['feed_type'] = 'repost'
-                repost_dict['sort_date'] = repost.created_at
-                feed_items.append(repost_dict)
-            
-            # Sort all items by date (newest first) and paginate
-            feed_items.sort(key=lambda x: x['sort_date'], reverse=True)
-            
-            # Apply pagination to the mixed feed
-            paginated_items = feed_items[offset:offset + size]
-            
-            # Remove the sort_date field as it's only for internal sorting
-            for item in paginated_items:
-                del item['sort_date']
-            
-            review_dicts = paginated_items
-            
-        result = {
-            "comments": review_dicts,
-            "pagination": {
-                "total": total_items if id_game == 0 else total_reviews,
-                "pages": ((total_items if id_game == 0 else total_reviews) + size - 1) // size,
+            total_items = Reviews.query.count() + Reposts.query.count()
+            pagination = {
+                "total": total_items,
+                "pages": (total_items + size - 1) // size,
                 "current_page": page,
                 "per_page": size
             }
+        
+        result = {
+            "comments": review_dicts,
+            "pagination": pagination
         }
         return jsonify(result), 200
     else:
         return jsonify({"status": "invalid request"}), 400
 
+@app.route('/api/timeline', methods=['GET'])
+@token_required
+def timeline():
+    """
+    Reviews and reposts from the people the current user follows, newest first.
+    Keyset paginated: pass the returned next_cursor to get the following page.
+    """
+    try:
+        size = int(request.args.get('size', 30))
+        if size < 1 or size > 100:
+            return jsonify({"status": "Size must be between 1 and 100"}), 400
+    except ValueError:
+        return jsonify({"status": "Size must be an integer"}), 400
+    
+    current_user_id = request.token_data['user']
+    
+    try:
+        feed_rows, next_cursor = timeline_page(current_user_id, size, cursor=request.args.get('cursor'))
+    except ValueError:
+        return jsonify({"status": "Invalid cursor"}), 400
+    
+    return jsonify({
+        "comments": hydrate_feed_rows(feed_rows, current_user_id=current_user_id),
+        "pagination": {
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+            "per_page": size
+        }
+    }), 200
+
+@app.route('/api/search/reviews', methods=['GET'])
+@token_required
+def search_reviews():
+    """
+    Full-text search over review and comment text, best match first.
+    Query params: q, type (reviews, comments or all), game_id, user_id, page, size.
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"status": "Search query is required"}), 400
+    if len(query) > 100:
+        return jsonify({"status": "Query too long"}), 400
+    
+    search_type = request.args.get('type', 'all')
+    if search_type not in ('reviews', 'comments', 'all'):
+        return jsonify({"status": "Type must be reviews, comments or all"}), 400
+    
+    try:
+        page = int(request.args.get('page', 1))
+        size = int(request.args.get('size', 20))
+        game_id = int(request.args['game_id']) if request.args.get('game_id') else None
+        user_id = int(request.args['user_id']) if request.args.get('user_id') else None
+    except ValueError:
+        return jsonify({"status": "page, size, game_id and user_id must be integers"}), 400
+    if page < 1 or size < 1 or size > 50:
+        return jsonify({"status": "Page must be positive and size between 1 and 50"}), 400
+    
+    current_user_id = request.token_data['user']
+    kinds = ['reviews', 'comments'] if search_type == 'all' else [search_type]
+    
+    try:
+        result = {"query": query}
+        has_more = False
+        for kind in kinds:
+            matches = fulltext_search(kind, query, game_id=game_id, user_id=user_id,
+                                      limit=size + 1, offset=(page - 1) * size)
+            has_more = has_more or len(matches) > size
+            matches = matches[:size]
+            scores = dict(matches)
+            ids = [item_id for item_id, _ in matches]
+            
+            if kind == 'reviews':
+                rows = {review.id: review for review in Reviews.query.filter(Reviews.id.in_(ids)).all()} if ids else {}
+                items = serialize_reviews([rows[item_id] for item_id in ids if item_id in rows],
+                                          current_user_id=current_user_id)
+                for item in items:
+                    item['score'] = scores[item['id']]
+            else:
+                rows = {comment.comment_id: comment for comment in Comments.query.filter(Comments.comment_id.in_(ids)).all()} if ids else {}
+                items = serialize_comments([rows[item_id] for item_id in ids if item_id in rows])
+                for item in items:
+                    item['score'] = scores[item['comment_id']]
+            result[kind] = items
+        
+        result["pagination"] = {
+            "page": page,
+            "per_page": size,
+            "has_more": has_more
+        }
+        return jsonify(result), 200
+    
+    except Exception as e:
+        return jsonify({"status": f"Error searching reviews: {str(e)}"}), 500
+
 @app.route('/api/suggestions', methods=['POST'])
 def suggestions():
     if not request.is_json:
@@ -1275,11 +2218,20 @@ def suggestions():
     sanitized_name = name.replace('"', '')
     
     try:
-        t = check_token()
-        token = t.json()['access_token']
-        headers = {'Client-ID': f'{os.getenv("IGDB_CLIENT")}', 'Authorization':f'Bearer {token}'}
+        # Answer from the games we already have cached when they give a full list of strong matches
+        if len(name.strip()) >= SUGGESTIONS_LOCAL_MIN_QUERY:
+            game_name_index.sync(Games)
+            suggestions = game_name_index.search(name, limit=5, strong_only=True)
+            if len(suggestions) >= SUGGESTIONS_LOCAL_MIN:
+                return jsonify(suggestions), 200
+        
+        cache_key = search_cache.key('suggestions', sanitized_name, variant='5')
+        suggestions = search_cache.get(cache_key)
+        if suggestions is not None:
+            return jsonify(suggestions), 200
+        
         body = f'fields id,name,cover.url; limit 5; search "{sanitized_name}";'
-        response = requests.post('https://api.igdb.com/v4/games/', headers=headers, data=body)
+        response = igdb_post('games', body)
         result = response.json()
         
         # Format the data for the frontend
@@ -1298,12 +2250,132 @@ def suggestions():
                     'cover_url': cover_url
                 })
         
+        if response.status_code == 200:
+            search_cache.set(cache_key, suggestions)
+        
         return jsonify(suggestions), 200
     
     except Exception as e:
         print(f"Error in suggestions route: {str(e)}")
         return jsonify([]), 500
 
+# Giphy responses - categories barely change and trending changes slowly; the last
+# good response is kept for GIPHY_STALE_TTL and served when Giphy errors or times out
+giphy_cache = ResultCache('giphy', max_entry_bytes=256 * 1024)
+GIPHY_TTLS = {
+    'categories': int(os.getenv('GIPHY_CATEGORIES_TTL', 6 * 3600)),
+    'trending': int(os.getenv('GIPHY_TRENDING_TTL', 300)),
+    'search': int(os.getenv('GIPHY_SEARCH_TTL', 3600))
+}
+GIPHY_STALE_TTL = int(os.getenv('GIPHY_STALE_TTL', 24 * 3600))
+
+def _giphy_image(gif, size, include_size=False):
+    image = gif.get('images', {}).get(size, {})
+    formatted = {
+        'url': image.get('url'),
+        'width': image.get('width'),
+        'height': image.get('height')
+    }
+    if include_size:
+        formatted['size'] = image.get('size')
+    return formatted
+
+def _giphy_pagination(data):
+    return {
+        'total_count': data.get('pagination', {}).get('total_count', 0),
+        'count': data.get('pagination', {}).get('count', 0),
+        'offset': data.get('pagination', {}).get('offset', 0)
+    }
+
+def _giphy_get(endpoint, params):
+    """GET a Giphy endpoint; raises UpstreamError for non-200 answers"""
+    params = dict(params, api_key=os.getenv('GIPHY_API_KEY'))
+    response = http_client.get(f'https://api.giphy.com/v1/gifs/{endpoint}', params=params)
+    if response.status_code != 200:
+        raise UpstreamError(f'Giphy {endpoint} returned {response.status_code}')
+    return response.json()
+
+def fetch_giphy_search(query, limit, offset, rating):
+    data = _giphy_get('search', {'q': query, 'limit': limit, 'offset': offset, 'rating': rating, 'lang': 'en'})
+    
+    # Format the response for frontend
+    gifs = []
+    for gif in data.get('data', []):
+        gifs.append({
+            'id': gif.get('id'),
+            'title': gif.get('title', ''),
+            'url': gif.get('url'),  # Giphy page URL
+            'images': {
+                # Different sizes for different use cases
+                'original': _giphy_image(gif, 'original', include_size=True),
+                'preview': _giphy_image(gif, 'preview_gif'),
+                'fixed_height': _giphy_image(gif, 'fixed_height'),
+                'fixed_width': _giphy_image(gif, 'fixed_width'),
+                'downsized': _giphy_image(gif, 'downsized')
+            }
+        })
+    
+    return {'gifs': gifs, 'pagination': _giphy_pagination(data), 'query': query}
+
+def fetch_giphy_trending(limit, offset, rating):
+    data = _giphy_get('trending', {'limit': limit, 'offset': offset, 'rating': rating})
+    
+    # Format response (same as search)
+    gifs = []
+    for gif in data.get('data', []):
+        gifs.append({
+            'id': gif.get('id'),
+            'title': gif.get('title', ''),
+            'url': gif.get('url'),
+            'images': {
+                'original': _giphy_image(gif, 'original'),
+                'preview': _giphy_image(gif, 'preview_gif'),
+                'fixed_height': _giphy_image(gif, 'fixed_height'),
+                'downsized': _giphy_image(gif, 'downsized')
+            }
+        })
+    
+    return {'gifs': gifs, 'pagination': _giphy_pagination(data)}
+
+def fetch_giphy_categories():
+    data = _giphy_get('categories', {})
+    
+    categories = []
+    for category in data.get('data', []):
+        categories.append({
+            'name': category.get('name'),
+            'name_encoded': category.get('name_encoded'),
+            'gif': _giphy_image(category.get('gif', {}), 'fixed_height')
+        })
+    
+    return {'categories': categories}
+
+def cached_giphy(kind, key, fetch):
+    """Serve a Giphy result from giphy_cache; returns (payload, cache state)"""
+    return giphy_cache.get_or_fetch(key, fetch, ttl=GIPHY_TTLS[kind], stale_ttl=GIPHY_STALE_TTL)
+
+def _trending_key(limit, offset, rating):
+    return giphy_cache.key('trending', '', variant=f'{limit}:{offset}:{rating}')
+
+def prewarm_giphy():
+    """Refresh the default trending page and the categories before they go stale"""
+    if not os.getenv('GIPHY_API_KEY'):
+        return
+    for kind, key, fetch in (
+        ('trending', _trending_key(20, 0, 'pg-13'), lambda: fetch_giphy_trending(20, 0, 'pg-13')),
+        ('categories', giphy_cache.key('categories', ''), fetch_giphy_categories)
+    ):
+        # Another worker sharing the cache may already have refreshed it
+        if giphy_cache.fresh_for(key) > GIPHY_PREWARM_INTERVAL:
+            continue
+        try:
+            giphy_cache.set(key, {'value': fetch(), 'fresh_until': time.time() + GIPHY_TTLS[kind]},
+                            ttl=max(GIPHY_TTLS[kind], GIPHY_STALE_TTL))
+        except Exception as e:
+            print(f"Error pre-warming Giphy {kind}: {str(e)}")
+
+GIPHY_PREWARM_INTERVAL = max(30, int(GIPHY_TTLS['trending'] * 0.8))
+
 @app.route('/api/gifs/search', methods=['POST'])
 def search_gifs():
     """
@@ -1343,80 +2415,18 @@ def search_gifs():
         rating = 'pg-13'
     
     try:
-        # Giphy API request
-        giphy_api_key = os.getenv('GIPHY_API_KEY')
-        if not giphy_api_key:
+        if not os.getenv('GIPHY_API_KEY'):
             return jsonify({"status": "GIF search service not configured"}), 503
         
-        giphy_url = "https://api.giphy.com/v1/gifs/search"
-        params = {
-            'api_key': giphy_api_key,
-            'q': query,
-            'limit': limit,
-            'offset': offset,
-            'rating': rating,
-            'lang': 'en'
-        }
-        
-        response = requests.get(giphy_url, params=params, timeout=10)
-        
-        if response.status_code != 200:
-            return jsonify({"status": "GIF search service unavailable"}), 503
-        
-        data = response.json()
-        
-        # Format the response for frontend
-        gifs = []
-        for gif in data.get('data', []):
-            gif_data = {
-                'id': gif.get('id'),
-                'title': gif.get('title', ''),
-                'url': gif.get('url'),  # Giphy page URL
-                'images': {
-                    # Different sizes for different use cases
-                    'original': {
-                        'url': gif.get('images', {}).get('original', {}).get('url'),
-                        'width': gif.get('images', {}).get('original', {}).get('width'),
-                        'height': gif.get('images', {}).get('original', {}).get('height'),
-                        'size': gif.get('images', {}).get('original', {}).get('size')
-                    },
-                    'preview': {
-                        'url': gif.get('images', {}).get('preview_gif', {}).get('url'),
-                        'width': gif.get('images', {}).get('preview_gif', {}).get('width'),
-                        'height': gif.get('images', {}).get('preview_gif', {}).get('height')
-                    },
-                    'fixed_height': {
-                        'url': gif.get('images', {}).get('fixed_height', {}).get('url'),
-                        'width': gif.get('images', {}).get('fixed_height', {}).get('width'),
-                        'height': gif.get('images', {}).get('fixed_height', {}).get('height')
-                    },
-                    'fixed_width': {
-                        'url': gif.get('images', {}).get('fixed_width', {}).get('url'),
-                        'width': gif.get('images', {}).get('fixed_width', {}).get('width'),
-                        'height': gif.get('images', {}).get('fixed_width', {}).get('height')
-                    },
-                    'downsized': {
-                        'url': gif.get('images', {}).get('downsized', {}).get('url'),
-                        'width': gif.get('images', {}).get('downsized', {}).get('width'),
-                        'height': gif.get('images', {}).get('downsized', {}).get('height')
-                    }
-                }
-            }
-            gifs.append(gif_data)
-        
-        # Pagination info
-        pagination = {
-            'total_count': data.get('pagination', {}).get('total_count', 0),
-            'count': data.get('pagination', {}).get('count', 0),
-            'offset': data.get('pagination', {}).get('offset', 0)
-        }
+        key = giphy_cache.key('search', query, variant=f'{limit}:{offset}:{rating}')
+        result, cache_state = cached_giphy('search', key, lambda: fetch_giphy_search(query, limit, offset, rating))
+        # Keep the casing the user typed even when a differently-cased search filled the cache
+        result = dict(result, query=query)
         
-        return jsonify({
-            'gifs': gifs,
-            'pagination': pagination,
-            'query': query
-        }), 200
+        return jsonify(result), 200, {'X-Cache': cache_state.upper()}
     
+    except UpstreamError:
+        return jsonify({"status": "GIF search service unavailable"}), 503
     except requests.exceptions.Timeout:
         return jsonify({"status": "GIF search timed out"}), 504
     except requests.exceptions.RequestException as e:
@@ -1428,6 +2438,7 @@ def search_gifs():
 
 
 @app.route('/api/gifs/trending', methods=['GET'])
+@conditional_response('public, max-age=60')
 def trending_gifs():
     """
     Get trending GIFs - similar to Discord's trending section
@@ -1448,68 +2459,16 @@ def trending_gifs():
         rating = 'pg-13'
     
     try:
-        giphy_api_key = os.getenv('GIPHY_API_KEY')
-        if not giphy_api_key:
+        if not os.getenv('GIPHY_API_KEY'):
             return jsonify({"status": "GIF service not configured"}), 503
         
-        giphy_url = "https://api.giphy.com/v1/gifs/trending"
-        params = {
-            'api_key': giphy_api_key,
-            'limit': limit,
-            'offset': offset,
-            'rating': rating
-        }
+        result, cache_state = cached_giphy('trending', _trending_key(limit, offset, rating),
+                                           lambda: fetch_giphy_trending(limit, offset, rating))
         
-        response = requests.get(giphy_url, params=params, timeout=10)
-        
-        if response.status_code != 200:
-            return jsonify({"status": "GIF service unavailable"}), 503
-        
-        data = response.json()
-        
-        # Format response (same as search)
-        gifs = []
-        for gif in data.get('data', []):
-            gif_data = {
-                'id': gif.get('id'),
-                'title': gif.get('title', ''),
-                'url': gif.get('url'),
-                'images': {
-                    'original': {
-                        'url': gif.get('images', {}).get('original', {}).get('url'),
-                        'width': gif.get('images', {}).get('original', {}).get('width'),
-                        'height': gif.get('images', {}).get('original', {}).get('height')
-                    },
-                    'preview': {
-                        'url': gif.get('images', {}).get('preview_gif', {}).get('url'),
-                        'width': gif.get('images', {}).get('preview_gif', {}).get('width'),
-                        'height': gif.get('images', {}).get('preview_gif', {}).get('height')
-                    },
-                    'fixed_height': {
-                        'url': gif.get('images', {}).get('fixed_height', {}).get('url'),
-                        'width': gif.get('images', {}).get('fixed_height', {}).get('width'),
-                        'height': gif.get('images', {}).get('fixed_height', {}).get('height')
-                    },
-                    'downsized': {
-                        'url': gif.get('images', {}).get('downsized', {}).get('url'),
-                        'width': gif.get('images', {}).get('downsized', {}).get('width'),
-                        'height': gif.get('images', {}).get('downsized', {}).get('height')
-                    }
-                }
-            }
-            gifs.append(gif_data)
-        
-        pagination = {
-            'total_count': data.get('pagination', {}).get('total_count', 0),
-            'count': data.get('pagination', {}).get('count', 0),
-            'offset': data.get('pagination', {}).get('offset', 0)
-        }
-        
-        return jsonify({
-            'gifs': gifs,
-            'pagination': pagination
-        }), 200
+        return jsonify(result), 200, {'X-Cache': cache_state.upper()}
     
+    except UpstreamError:
+        return jsonify({"status": "GIF service unavailable"}), 503
     except requests.exceptions.Timeout:
         return jsonify({"status": "Request timed out"}), 504
     except requests.exceptions.RequestException as e:
@@ -1521,41 +2480,21 @@ def trending_gifs():
 
 
 @app.route('/api/gifs/categories', methods=['GET'])
+@conditional_response('public, max-age=3600')
 def gif_categories():
     """
     Get GIF categories - for Discord-like category browsing
     """
     try:
-        giphy_api_key = os.getenv('GIPHY_API_KEY')
-        if not giphy_api_key:
+        if not os.getenv('GIPHY_API_KEY'):
             return jsonify({"status": "GIF service not configured"}), 503
         
-        giphy_url = "https://api.giphy.com/v1/gifs/categories"
-        params = {
-            'api_key': giphy_api_key
-        }
-        
-        response = requests.get(giphy_url, params=params, timeout=10)
-        
-        if response.status_code != 200:
-            return jsonify({"status": "GIF service unavailable"}), 503
+        result, cache_state = cached_giphy('categories', giphy_cache.key('categories', ''), fetch_giphy_categories)
         
-        data = response.json()
-        
-        categories = []
-        for category in data.get('data', []):
-            categories.append({
-                'name': category.get('name'),
-                'name_encoded': category.get('name_encoded'),
-                'gif': {
-                    'url': category.get('gif', {}).get('images', {}).get('fixed_height', {}).get('url'),
-                    'width': category.get('gif', {}).get('images', {}).get('fixed_height', {}).get('width'),
-                    'height': category.get('gif', {}).get('images', {}).get('fixed_height', {}).get('height')
-                }
-            })
-        
-        return jsonify({'categories': categories}), 200
+        return jsonify(result), 200, {'X-Cache': cache_state.upper()}
     
+    except UpstreamError:
+        return jsonify({"status": "GIF service unavailable"}), 503
     except requests.exceptions.Timeout:
         return jsonify({"status": "Request timed out"}), 504
     except requests.exceptions.RequestException as e:
@@ -1588,10 +2527,11 @@ def like_unlike_review(review_id):
         if existing_like:
             # Unlike - remove the like
             db.session.delete(existing_like)
+            bump_review_counter(review_id, Reviews.likes_count, -1)
             db.session.commit()
             
             # Get updated like count
-            like_count = Likes.query.filter_by(review_id=review_id).count()
+            like_count = review.likes_count
             
             return jsonify({
                 "status": "unliked",
@@ -1602,10 +2542,11 @@ def like_unlike_review(review_id):
             # Like - add a new like
             new_like = Likes(user_id=user_id, review_id=review_id)
             db.session.add(new_like)
+            bump_review_counter(review_id, Reviews.likes_count, 1)
             db.session.commit()
             
             # Get updated like count
-            like_count = Likes.query.filter_by(review_id=review_id).count()
+            like_count = review.likes_count
             
             return jsonify({
                 "status": "liked",
@@ -1644,10 +2585,12 @@ def repost_unrepost_review(review_id):
         if existing_repost:
             # Un-repost - remove the repost
             db.session.delete(existing_repost)
+            bump_review_counter(review_id, Reviews.reposts_count, -1)
+            remove_from_timelines('repost', [existing_repost.id])
             db.session.commit()
             
             # Get updated repost count
-            repost_count = Reposts.query.filter_by(review_id=review_id).count()
+            repost_count = review.reposts_count
             
             return jsonify({
                 "status": "unreposted",
@@ -1667,10 +2610,13 @@ def repost_unrepost_review(review_id):
             # Repost - add a new repost
             new_repost = Reposts(user_id=user_id, review_id=review_id, repost_text=repost_text)
             db.session.add(new_repost)
+            bump_review_counter(review_id, Reviews.reposts_count, 1)
             db.session.commit()
             
+            run_in_background(app, fan_out_to_followers, user_id, 'repost', new_repost.id, new_repost.created_at)
+            
             # Get updated repost count
-            repost_count = Reposts.query.filter_by(review_id=review_id).count()
+            repost_count = review.reposts_count
             
             return jsonify({
                 "status": "reposted",
@@ -1707,10 +2653,7 @@ def get_reposts():
         total_reposts = Reposts.query.count()
         reposts = Reposts.query.order_by(Reposts.created_at.desc()).offset(offset).limit(size).all()
         
-        reposts_data = []
-        for repost in reposts:
-            repost_dict = repost.to_dict(current_user_id)
-            reposts_data.append(repost_dict)
+        reposts_data = serialize_reposts(reposts, current_user_id=current_user_id)
         
         result = {
             "reposts": reposts_data,
@@ -1740,7 +2683,7 @@ def cache_stats():
             Games.last_updated > datetime.utcnow() - timedelta(days=1)
         ).count()
         old_games = Games.query.filter(
-            Games.last_updated < datetime.utcnow() - timedelta(days=7)
+            Games.last_updated < datetime.utcnow() - GAME_CACHE_SOFT_TTL
         ).count()
         
         total_reviews = Reviews.query.count()
@@ -1752,6 +2695,13 @@ def cache_stats():
                 'recent_games': recent_games,
                 'old_games_needing_refresh': old_games
             },
+            'refresher': game_refresher.stats(),
+            'search_cache': search_cache.stats(),
+            'giphy_cache': giphy_cache.stats(),
+            'gamerpower_snapshot': gamerpower_snapshot.stats(),
+            'game_name_index': game_name_index.stats(),
+            'game_dict_cache': game_dict_cache.stats(),
+            'lookup_cache': lookup_cache.stats(),
             'database': {
                 'total_reviews': total_reviews,
                 'total_users': total_users
@@ -1764,58 +2714,64 @@ def cache_stats():
     except Exception as e:
         return jsonify({"status": f"Error getting cache stats: {str(e)}"}), 500
 
+@app.route('/api/stats/upstream', methods=['GET'])
+@token_required
+def upstream_stats():
+    """
+    Get latency and connection reuse counters for outbound integrations
+    and the IGDB rate limiting/coalescing counters
+    """
+    return jsonify({
+        'upstreams': http_client.stats(),
+        'igdb_governor': igdb_governor.stats(),
+        'timestamp': datetime.utcnow().isoformat()
+    }), 200
+
+@app.route('/api/stats/compression', methods=['GET'])
+@token_required
+def compression_stats():
+    """
+    Get bytes saved and CPU time spent by response compression, per encoding
+    """
+    return jsonify({
+        'compression': compressor.stats(),
+        'timestamp': datetime.utcnow().isoformat()
+    }), 200
+
 @app.route('/api/cache/refresh', methods=['POST'])
 @token_required
 def refresh_cache():
     """
-    Force refresh of game cache for specific games or all old games
+    Queue a refresh of the game cache for specific games or all stale games.
+    The background refresher does the IGDB work; see /api/cache/stats for progress.
     """
     try:
         if request.is_json and 'game_ids' in request.json:
             # Refresh specific games
             game_ids = request.json['game_ids']
-            if not isinstance(game_ids, list) or len(game_ids) > 100:
-                return jsonify({"status": "game_ids must be a list with max 100 items"}), 400
+            if not isinstance(game_ids, list) or len(game_ids) > 500:
+                return jsonify({"status": "game_ids must be a list with max 500 items"}), 400
             
-            refreshed = []
+            validated_ids = []
             for game_id in game_ids:
                 try:
-                    game_id = int(game_id)
-                    game_data = fetch_game_from_igdb(game_id)
-                    if game_data:
-                        cache_game_info(db, Games, game_data)
-                        refreshed.append(game_id)
-                except Exception as e:
-                    print(f"Error refreshing game {game_id}: {str(e)}")
+                    validated_ids.append(int(game_id))
+                except (ValueError, TypeError):
                     continue
             
-            return jsonify({
-                "status": "refresh completed", 
-                "refreshed_games": refreshed,
-                "count": len(refreshed)
-            }), 200
+            queued = game_refresher.enqueue(validated_ids, priority=2)
         else:
-            # Refresh all old games (older than 7 days)
-            old_games = Games.query.filter(
-                Games.last_updated < datetime.utcnow() - timedelta(days=7)
-            ).limit(50).all()  # Limit to prevent overwhelming the API
-            
-            refreshed = []
-            for game in old_games:
-                try:
-                    game_data = fetch_game_from_igdb(game.id)
-                    if game_data:
-                        cache_game_info(db, Games, game_data)
-                        refreshed.append(game.id)
-                except Exception as e:
-                    print(f"Error refreshing game {game.id}: {str(e)}")
-                    continue
-            
-            return jsonify({
-                "status": "refresh completed",
-                "refreshed_games": refreshed,
-                "count": len(refreshed)
-            }), 200
+            # Refresh all stale games
+            queued = game_refresher.scan()
+        
+        if GAME_REFRESH_WORKER == 'thread':
+            game_refresher.start(app)
+        
+        return jsonify({
+            "status": "refresh queued",
+            "count": queued,
+            "refresher": game_refresher.stats()
+        }), 202
             
     except Exception as e:
         return jsonify({"status": f"Error refreshing cache: {str(e)}"}), 500
@@ -1862,10 +2818,19 @@ def debug_games():
     except Exception as e:
         return jsonify({"status": f"Debug error: {str(e)}"}), 500
 
+def _worth_summary(worth_data):
+    return {
+        "active_giveaways_number": worth_data.get("active_giveaways_number", 0),
+        "worth_estimation_usd": worth_data.get("worth_estimation_usd", "0.00"),
+        "total_savings_message": f"You could save ${worth_data.get('worth_estimation_usd', '0.00')} by claiming all {worth_data.get('active_giveaways_number', 0)} active giveaways!"
+    }
+
 @app.route('/api/game-news', methods=['GET'])
+@conditional_response('public, max-age=300', version=game_news_version)
 def get_game_news():
     """
-    Fetch game giveaways and deals from GamerPower API
+    Game giveaways and deals from GamerPower, filtered and sorted from the
+    in-memory snapshot
     
     Query parameters:
     - type: filter by type (e.g., 'game', 'loot', 'beta')
@@ -1878,51 +2843,7 @@ def get_game_news():
         platform = request.args.get('platform', '')
         sort_by = request.args.get('sort-by', 'date')
         
-        # Build GamerPower API URL
-        base_url = "https://www.gamerpower.com/api/giveaways"
-        params = []
-        
-        if giveaway_type:
-            params.append(f"type={giveaway_type}")
-        if platform:
-            params.append(f"platform={platform}")
-        if sort_by:
-            params.append(f"sort-by={sort_by}")
-            
-        # Construct final URL
-        if params:
-            url = f"{base_url}?{'&'.join(params)}"
-        else:
-            url = base_url
-            
-        # Make request to GamerPower API
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        giveaways = response.json()
-        
-        # Process and enhance the data
-        processed_giveaways = []
-        for giveaway in giveaways:
-            processed_giveaway = {
-                'id': giveaway.get('id'),
-                'title': giveaway.get('title'),
-                'description': giveaway.get('description'),
-                'image': giveaway.get('image'),
-                'thumbnail': giveaway.get('thumbnail'),
-                'instructions': giveaway.get('instructions'),
-                'open_giveaway_url': giveaway.get('open_giveaway_url'),
-                'published_date': giveaway.get('published_date'),
-                'type': giveaway.get('type'),
-                'platforms': giveaway.get('platforms'),
-                'end_date': giveaway.get('end_date'),
-                'users': giveaway.get('users'),
-                'status': giveaway.get('status'),
-                'worth': giveaway.get('worth'),
-                'gamerpower_url': giveaway.get('gamerpower_url'),
-                'open_giveaway': giveaway.get('open_giveaway')
-            }
-            processed_giveaways.append(processed_giveaway)
+        processed_giveaways = gamerpower_snapshot.giveaways(giveaway_type, platform, sort_by)
         
         return jsonify({
             "status": "success",
@@ -1947,31 +2868,17 @@ def get_game_news():
         }), 500
 
 @app.route('/api/game-news/worth', methods=['GET'])
+@conditional_response('public, max-age=300', version=game_news_version)
 def get_game_news_worth():
     """
-    Fetch giveaways worth summary from GamerPower API
-    Now automatically calculates total worth of all active giveaways
+    Giveaways worth summary from GamerPower (total worth of all active giveaways)
     """
     try:
-        # Always use min_value of 0 to get all giveaways for total calculation
-        url = "https://www.gamerpower.com/api/worth?min-value=0"
-        
-        # Make request to GamerPower API
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        worth_data = response.json()
-        
         # The worth endpoint returns a summary of all active giveaways
         # Format: {"active_giveaways_number": 92, "worth_estimation_usd": "374.91"}
-        
         return jsonify({
             "status": "success",
-            "data": {
-                "active_giveaways_number": worth_data.get("active_giveaways_number", 0),
-                "worth_estimation_usd": worth_data.get("worth_estimation_usd", "0.00"),
-                "total_savings_message": f"You could save ${worth_data.get('worth_estimation_usd', '0.00')} by claiming all {worth_data.get('active_giveaways_number', 0)} active giveaways!"
-            },
+            "data": _worth_summary(gamerpower_snapshot.worth()),
             "type": "total_savings_summary"
         }), 200
         
@@ -1987,9 +2894,10 @@ def get_game_news_worth():
         }), 500
 
 @app.route('/api/game-news/complete', methods=['GET'])
+@conditional_response('public, max-age=300', version=game_news_version)
 def get_complete_game_news():
     """
-    Fetch both giveaways and worth summary in a single call for efficiency
+    Giveaways and worth summary in a single call, both from the in-memory snapshot
     
     Query parameters:
     - type: filter by type (e.g., 'game', 'loot', 'beta')
@@ -2002,62 +2910,7 @@ def get_complete_game_news():
         platform = request.args.get('platform', '')
         sort_by = request.args.get('sort-by', 'date')
         
-        # Build GamerPower API URL for giveaways
-        base_url = "https://www.gamerpower.com/api/giveaways"
-        params = []
-        
-        if giveaway_type:
-            params.append(f"type={giveaway_type}")
-        if platform:
-            params.append(f"platform={platform}")
-        if sort_by:
-            params.append(f"sort-by={sort_by}")
-            
-        # Construct final URL for giveaways
-        if params:
-            giveaways_url = f"{base_url}?{'&'.join(params)}"
-        else:
-            giveaways_url = base_url
-        
-        # Fetch giveaways and worth summary concurrently
-        giveaways_response = requests.get(giveaways_url, timeout=10)
-        worth_response = requests.get("https://www.gamerpower.com/api/worth?min-value=0", timeout=10)
-        
-        giveaways_response.raise_for_status()
-        worth_response.raise_for_status()
-        
-        giveaways = giveaways_response.json()
-        worth_data = worth_response.json()
-        
-        # Process giveaways data
-        processed_giveaways = []
-        for giveaway in giveaways:
-            processed_giveaway = {
-                'id': giveaway.get('id'),
-                'title': giveaway.get('title'),
-                'description': giveaway.get('description'),
-                'image': giveaway.get('image'),
-                'thumbnail': giveaway.get('thumbnail'),
-                'instructions': giveaway.get('instructions'),
-                'open_giveaway_url': giveaway.get('open_giveaway_url'),
-                'published_date': giveaway.get('published_date'),
-                'type': giveaway.get('type'),
-                'platforms': giveaway.get('platforms'),
-                'end_date': giveaway.get('end_date'),
-                'users': giveaway.get('users'),
-                'status': giveaway.get('status'),
-                'worth': giveaway.get('worth'),
-                'gamerpower_url': giveaway.get('gamerpower_url'),
-                'open_giveaway': giveaway.get('open_giveaway')
-            }
-            processed_giveaways.append(processed_giveaway)
-        
-        # Process worth data
-        worth_summary = {
-            "active_giveaways_number": worth_data.get("active_giveaways_number", 0),
-            "worth_estimation_usd": worth_data.get("worth_estimation_usd", "0.00"),
-            "total_savings_message": f"You could save ${worth_data.get('worth_estimation_usd', '0.00')} by claiming all {worth_data.get('active_giveaways_number', 0)} active giveaways!"
-        }
+        processed_giveaways = gamerpower_snapshot.giveaways(giveaway_type, platform, sort_by)
         
         return jsonify({
             "status": "success",
@@ -2070,7 +2923,7 @@ def get_complete_game_news():
                     "sort_by": sort_by
                 }
             },
-            "worth_summary": worth_summary
+            "worth_summary": _worth_summary(gamerpower_snapshot.worth())
         }), 200
         
     except requests.exceptions.RequestException as e:
@@ -2180,18 +3033,19 @@ def manage_saved_games():
         return jsonify({'status': 'error', 'message': f'Operation failed: {str(e)}'}), 500
 
 @app.route('/api/saved-games/<username>', methods=['GET'])
+@conditional_response('public, max-age=60', version=saved_games_version)
 def get_user_saved_games(username):
     """
     Get another user's saved games (public view)
     """
     try:
         # Find the user
-        user = User.query.filter_by(username=username).first()
-        if not user:
+        user_id = user_id_for_username(username)
+        if user_id is None:
             return jsonify({'status': 'error', 'message': 'User not found'}), 404
         
         # Get user's saved games
-        saved_games = SavedGames.query.filter_by(user_id=user.id).order_by(SavedGames.created_at.desc()).all()
+        saved_games = SavedGames.query.filter_by(user_id=user_id).order_by(SavedGames.created_at.desc()).all()
         
         saved_games_data = []
         for saved_game in saved_games:
@@ -2227,15 +3081,15 @@ def search_game_suggestions():
         # Sanitize query
         sanitized_query = query.replace('"', '')
         
-        # Get IGDB access token
-        t = check_token()
-        token = t.json()['access_token']
-        headers = {'Client-ID': f'{os.getenv("IGDB_CLIENT")}', 'Authorization': f'Bearer {token}'}
-        
-        # Search for games on IGDB
-        body = f'fields id,name,cover.url,rating,first_release_date; search "{sanitized_query}"; limit 10;'
-        response = requests.post('https://api.igdb.com/v4/games/', headers=headers, data=body)
-        games = response.json()
+        # Search for games on IGDB, or reuse a recent identical search
+        cache_key = search_cache.key('search-suggestions', sanitized_query, variant='10')
+        games = search_cache.get(cache_key)
+        if games is None:
+            body = f'fields id,name,cover.url,rating,first_release_date; search "{sanitized_query}"; limit 10;'
+            response = igdb_post('games', body)
+            games = response.json()
+            if response.status_code == 200:
+                search_cache.set(cache_key, games)
         
         if not games:
             return jsonify({
@@ -2277,21 +3131,8 @@ def get_most_reviewed_games_week():
     try:
         current_user_id = request.token_data['user']
         
-        # Calculate the date range for the past week
-        one_week_ago = datetime.utcnow() - timedelta(days=7)
-        
-        # Get the most reviewed games in the past week with review counts
-        game_review_counts = db.session.query(
-            Reviews.id_game,
-            db.func.count(Reviews.id).label('review_count'),
-            db.func.max(Reviews.date_created).label('latest_review_date')
-        ).filter(
-            Reviews.date_created >= one_week_ago
-        ).group_by(
-            Reviews.id_game
-        ).order_by(
-            db.desc(db.func.count(Reviews.id))
-        ).limit(10).all()
+        # Most reviewed games of the past week, from the hourly review buckets
+        game_review_counts = most_reviewed_games(days=7, limit=10)
         
         if not game_review_counts:
             return jsonify({
@@ -2300,48 +3141,31 @@ def get_most_reviewed_games_week():
                 'message': 'No reviews found in the past week'
             }), 200
         
-        result_games = []
+        game_ids = [game_id for game_id, _ in game_review_counts]
         
-        for game_count in game_review_counts:
-            game_id = game_count.id_game
-            review_count = game_count.review_count
-            
-            # Get the game information from cache
-            game_record = Games.query.get(game_id)
-            
-            # If game is not cached or needs refresh, fetch from IGDB
-            if not game_record or Games.should_refresh(game_record):
-                game_data = fetch_game_from_igdb(game_id)
-                if game_data:
-                    game_record = cache_game_info(db, Games, game_data)
-            
+        # Get the game information from cache (stale games are refreshed in the background)
+        cached_games = get_or_cache_games(db, Games, game_ids)
+        latest_reviews = latest_reviews_by_game(game_ids)
+        
+        # Serialize all latest reviews in one batch
+        latest_review_dicts = {
+            review_dict['id']: review_dict
+            for review_dict in serialize_reviews(list(latest_reviews.values()), current_user_id=current_user_id, include_game_info=False)
+        }
+        
+        result_games = []
+        for game_id, review_count in game_review_counts:
+            game_record = cached_games.get(game_id)
             if not game_record:
                 continue  # Skip if we couldn't get game data
             
-            # Get the latest review for this game
-            latest_review = Reviews.query.options(
-                db.joinedload(Reviews.user)
-            ).filter_by(
-                id_game=game_id
-            ).order_by(
-                Reviews.date_created.desc()
-            ).first()
-            
-            latest_review_data = None
-            if latest_review:
-                latest_review_data = latest_review.to_dict(
-                    current_user_id=current_user_id, 
-                    include_game_info=False
-                )
-            
+            latest_review = latest_reviews.get(game_id)
             # Add game information with review count and latest review
-            game_data = {
+            result_games.append({
                 'game': game_record.to_dict(),
                 'review_count': review_count,
-                'latest_review': latest_review_data
-            }
-            
-            result_games.append(game_data)
+                'latest_review': latest_review_dicts.get(latest_review.id) if latest_review else None
+            })
         
         return jsonify({
             'status': 'success',
@@ -2355,9 +3179,179 @@ def get_most_reviewed_games_week():
             'message': f'Failed to fetch most reviewed games: {str(e)}'
         }), 500
 
-# Create all tables
+def upgrade_schema():
+    """
+    Add columns and indexes declared on the models that are missing from an
+    existing database (db.create_all() only creates missing tables).
+    Returns the list of (table, column) pairs that were added.
+    """
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    added_columns = []
+    
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing_columns:
+                column_ddl = CreateColumn(column).compile(dialect=db.engine.dialect)
+                db.session.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column_ddl}'))
+                added_columns.append((table.name, column.name))
+        db.session.commit()
+        
+        existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(bind=db.engine)
+    
+    return added_columns
+
+@contextmanager
+def database_lock(name, timeout=300):
+    """
+    Hold a named MySQL lock (GET_LOCK) for the duration of the block, so only one
+    process at a time runs it. A no-op on other databases.
+    """
+    if db.engine.dialect.name != 'mysql':
+        yield
+        return
+    
+    # A dedicated connection: the lock belongs to the connection that took it
+    connection = db.engine.connect()
+    try:
+        if not connection.execute(text('SELECT GET_LOCK(:name, :timeout)'), name=name, timeout=timeout).scalar():
+            raise RuntimeError(f'Timed out waiting for database lock {name}')
+        try:
+            yield
+        finally:
+            connection.execute(text('SELECT RELEASE_LOCK(:name)'), name=name)
+    finally:
+        connection.close()
+
+def _user_search_has_bigrams():
+    """False for a search index built before bigrams were indexed"""
+    if User.query.filter(db.func.length(User.username) >= 2).first() is None:
+        return True
+    return UserSearchTrigrams.query.filter(db.func.length(UserSearchTrigrams.trigram) == 2).first() is not None
+
+def upgrade_database():
+    """
+    Bring an existing database up to date with the models: missing columns and
+    indexes, backfills of new counters and search keys, full-text indexes and
+    the review buckets. Run once per deploy with 'flask upgrade-schema', before
+    the web workers start - never from the workers themselves.
+    Returns the list of (table, column) pairs that were added.
+    """
+    with database_lock('gameaten-upgrade-schema'):
+        db.create_all()
+        added_columns = upgrade_schema()
+        if ('reviews', 'likes_count') in added_columns:
+            reconcile_review_counters()
+        if ('user', 'follower_count') in added_columns:
+            reconcile_follower_counts()
+        if ('user', 'username_lower') in added_columns or not _user_search_has_bigrams():
+            rebuild_user_search_index()
+        setup_fulltext_search()
+        if GameReviewBuckets.query.first() is None:
+            rebuild_review_buckets()
+    return added_columns
+
+@app.cli.command('upgrade-schema')
+def upgrade_schema_command():
+    """Add missing columns, indexes and full-text search, and run their backfills"""
+    added_columns = upgrade_database()
+    for table, column in added_columns:
+        click.echo(f'Added {table}.{column}')
+    click.echo(f'Schema up to date ({len(added_columns)} columns added)')
+
+@app.cli.command('reconcile-counters')
+def reconcile_counters_command():
+    """Rebuild review like/comment/repost and follower counters from the source tables"""
+    updated = reconcile_review_counters()
+    click.echo(f'Reconciled counters for {updated} reviews')
+    updated = reconcile_follower_counts()
+    click.echo(f'Reconciled follower counts for {updated} users')
+
+@app.cli.command('rebuild-user-search')
+def rebuild_user_search_command():
+    """Rebuild the username search keys and bigram/trigram table"""
+    indexed = rebuild_user_search_index()
+    click.echo(f'Indexed {indexed} usernames')
+
+@app.cli.command('rebuild-review-buckets')
+def rebuild_review_buckets_command():
+    """Recompute the hourly review buckets behind the most-reviewed leaderboard"""
+    buckets = rebuild_review_buckets()
+    click.echo(f'Rebuilt {buckets} review buckets')
+
+@app.cli.command('prune-review-buckets')
+def prune_review_buckets_command():
+    """Delete review buckets older than the most-reviewed leaderboard's window"""
+    deleted = prune_review_buckets()
+    click.echo(f'Pruned {deleted} review buckets')
+
+@app.cli.command('refresh-games')
+@click.option('--once', is_flag=True, help='Scan and drain the queue once instead of running forever')
+def refresh_games_command(once):
+    """Run the game cache refresher as a dedicated worker process"""
+    def report(processed, stats):
+        click.echo(f"Refreshed batch of {processed} games - {stats['refreshed']} total, "
+                   f"{stats['failed']} failed, {stats['games_per_second']} games/s, {stats['queued']} queued")
+    
+    if once:
+        game_refresher.scan()
+        while True:
+            processed = game_refresher.run_once()
+            if not processed:
+                break
+            report(processed, game_refresher.stats())
+    else:
+        game_refresher.run_forever(on_batch=report)
+
+@app.cli.command('backfill-timelines')
+def backfill_timelines_command():
+    """Fill follower timelines from existing follows, reviews and reposts"""
+    follows = db.session.query(Follow.follower_id, Follow.following_id).all()
+    for follower_id, following_id in follows:
+        backfill_timeline(follower_id, following_id)
+    click.echo(f'Backfilled timelines for {len(follows)} follows')
+
+# Create all tables; new columns, indexes and backfills for an existing database
+# come from 'flask upgrade-schema' (see upgrade_database). Under the same lock, so
+# processes starting together on a fresh database don't race each other's DDL
 with app.app_context():
-    db.create_all()
+    with database_lock('gameaten-upgrade-schema'):
+        db.create_all()
+    game_name_index.load(Games)
+
+# Stale games are refreshed by the dedicated 'flask refresh-games' process; GAME_REFRESH_WORKER=thread
+# runs the refresher inside the web process instead (single-process deployments)
+GAME_REFRESH_WORKER = os.getenv('GAME_REFRESH_WORKER', 'process')
+
+def start_background_tasks():
+    """
+    Start this process's background threads: the in-process game refresher
+    (GAME_REFRESH_WORKER=thread), Giphy pre-warming, the GamerPower snapshot
+    refresh and review bucket pruning. Called by the servers at startup
+    (gunicorn.conf.py, 'python app.py'), never on import, so scripts, tests and
+    CLI commands make no upstream calls.
+    """
+    if GAME_REFRESH_WORKER == 'thread':
+        game_refresher.start(app)
+    
+    # Keep the default Giphy trending page and the categories warm
+    if os.getenv('GIPHY_PREWARM', 'on') == 'on':
+        run_periodically(app, GIPHY_PREWARM_INTERVAL, prewarm_giphy)
+    
+    # Refresh the GamerPower giveaways snapshot in the background
+    if os.getenv('GAMERPOWER_REFRESH', 'on') == 'on':
+        run_periodically(app, gamerpower_snapshot.refresh_interval, gamerpower_snapshot.refresh)
+    
+    # Delete leaderboard buckets that have left the window, off the request path
+    if os.getenv('REVIEW_BUCKET_PRUNE', 'on') == 'on':
+        run_periodically(app, REVIEW_BUCKET_PRUNE_INTERVAL, prune_review_buckets)
 
 # Helper functions for file upload
 def allowed_file(filename):
@@ -2405,6 +3399,7 @@ def upload_profile_photo():
             # Update user's profile photo in database
             user.profile_photo = filename
             db.session.commit()
+            invalidate_user_cache(user.id)
             
             return jsonify({
                 'status': 'success',
@@ -2441,6 +3436,7 @@ def update_profile():
         
         data = request.json
         updated_fields = []
+        old_username = user.username
         
         # Update username if provided
         if 'username' in data and data['username'].strip():
@@ -2458,10 +3454,12 @@ def update_profile():
                     return jsonify({'status': 'error', 'message': 'Username must be 3-20 characters and contain only letters, numbers, and underscores'}), 400
                 
                 user.username = new_username
+                index_username(user)
                 updated_fields.append('username')
         
         if updated_fields:
             db.session.commit()
+            invalidate_user_cache(user.id, old_username)
             return jsonify({
                 'status': 'success',
                 'message': f'Profile updated successfully',
@@ -2504,9 +3502,16 @@ def delete_review(review_id):
         Comments.query.filter_by(review_id=review_id).delete()
         
         # Delete reposts of this review
+        repost_ids = [row[0] for row in db.session.query(Reposts.id).filter_by(review_id=review_id).all()]
         Reposts.query.filter_by(review_id=review_id).delete()
         
+        # Remove the review and its reposts from follower timelines
+        remove_from_timelines('review', [review_id])
+        remove_from_timelines('repost', repost_ids)
+        
         # Finally delete the review
+        if review.date_created:
+            bump_review_bucket(review.id_game, review.date_created, -1)
         db.session.delete(review)
         db.session.commit()
         
@@ -2536,10 +3541,8 @@ def search_users():
         if len(query) > 50:
             return jsonify({"status": "Query too long"}), 400
         
-        # Search for users with username containing the query (case-insensitive)
-        users = User.query.filter(
-            User.username.ilike(f'%{query}%')
-        ).limit(10).all()  # Limit to 10 results
+        # Prefix matches first, then usernames containing the query (case-insensitive)
+        users = search_usernames(query, limit=10)
         
         if not users:
             return jsonify({"users": []}), 200
@@ -2550,7 +3553,8 @@ def search_users():
             user_data = {
                 'id': user.id,
                 'username': user.username,
-                'profile_photo': f'/api/profile/photo/{user.profile_photo}' if user.profile_photo else None
+                'profile_photo': f'/api/profile/photo/{user.profile_photo}' if user.profile_photo else None,
+                'follower_count': user.follower_count
             }
             user_results.append(user_data)
         
@@ -2560,4 +3564,8 @@ def search_users():
         return jsonify({"status": f"An error occurred: {str(e)}"}), 500
 
 if __name__ == "__main__":
+    # Single-process development server: nothing else can race the upgrade
+    with app.app_context():
+        upgrade_database()
+    start_background_tasks()
     app.run(host='0.0.0.0', port=5000, debug=False)
@@ -0,0 +1,86 @@
+"""
+Microbenchmark for API response serialization.
+
+Builds a realistic 100-item /api/ver feed page (reviews with embedded game_info,
+summaries and artwork lists) and compares Flask's stdlib jsonify with the
+orjson-backed jsonify from funcs.py, plus strftime vs isoformat for the
+per-item timestamps.
+
+Usage: python bench_json.py [iterations]
+"""
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+from flask import Flask, jsonify as flask_jsonify
+
+import funcs
+
+ITEMS = 100
+
+def feed_page(items=ITEMS):
+    """A feed page shaped like serialize_reviews(..., include_game_info=True) output"""
+    now = datetime.utcnow()
+    comments = []
+    for i in range(items):
+        created = now - timedelta(minutes=i * 7)
+        comments.append({
+            "id": 10000 + i,
+            "id_game": 1000 + i % 25,
+            "user_id": 1 + i % 40,
+            "username": f"player_{i % 40}",
+            "profile_photo": f"/api/profile/photo/{i % 40}_avatar.webp" if i % 3 else None,
+            "review_text": "Great pacing, gorgeous art direction and a soundtrack that carries the quieter moments. " * 2,
+            "gif_url": "https://media.giphy.com/media/abc123/giphy.gif" if i % 5 == 0 else None,
+            "has_text": True,
+            "has_gif": i % 5 == 0,
+            "date_created": created.isoformat(' ', 'seconds'),
+            "comment_count": i % 7,
+            "likes_count": i * 3 % 50,
+            "reposts_count": i % 4,
+            "user_has_liked": i % 2 == 0,
+            "user_has_reposted": False,
+            "feed_type": "review",
+            "game_info": {
+                "id": 1000 + i % 25,
+                "name": f"Some Game Title {i % 25}: The Sequel",
+                "summary": "An open-world action adventure set across a sprawling continent, "
+                           "with dynamic weather, a branching story and dozens of side quests. " * 3,
+                "rating": 84.5 + i % 10,
+                "cover_url": f"https://images.igdb.com/igdb/image/upload/t_cover_big/co{i:04d}.jpg",
+                "release_date": "Mar 03, 2017",
+                "platforms": [{"id": 6, "name": "PC (Microsoft Windows)"}, {"id": 130, "name": "Nintendo Switch"}],
+                "artwork_urls": [f"https://images.igdb.com/igdb/image/upload/t_1080p/ar{i:04d}{n}.jpg" for n in range(6)],
+                "last_updated": created.isoformat()
+            }
+        })
+    return {"comments": comments, "pagination": {"page": 1, "per_page": items, "total": 5000, "pages": 50}}
+
+def bench(label, func, iterations):
+    seconds = min(timeit.repeat(func, number=iterations, repeat=5)) / iterations
+    print(f"{label:<40} {seconds * 1e6:10.1f} us/call")
+    return seconds
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    app = Flask(__name__)
+    app.json_encoder = funcs.FastJSONEncoder
+    page = feed_page()
+
+    print(f"{ITEMS}-item feed page, {len(flask_jsonify_body(app, page))} bytes, orjson {'available' if funcs.orjson else 'NOT installed'}")
+    with app.test_request_context():
+        baseline = bench('flask.jsonify (stdlib json)', lambda: flask_jsonify(page), iterations)
+        fast = bench('funcs.jsonify', lambda: funcs.jsonify(page), iterations)
+    print(f"speedup: {baseline / fast:.1f}x")
+
+    timestamps = [datetime.utcnow() - timedelta(minutes=i) for i in range(ITEMS)]
+    strftime = bench('strftime x100', lambda: [t.strftime('%Y-%m-%d %H:%M:%S') for t in timestamps], iterations)
+    isoformat = bench("isoformat(' ', 'seconds') x100", lambda: [t.isoformat(' ', 'seconds') for t in timestamps], iterations)
+    print(f"speedup: {strftime / isoformat:.1f}x")
+
+def flask_jsonify_body(app, data):
+    with app.test_request_context():
+        return flask_jsonify(data).get_data()
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,11 @@
 import bcrypt
 import json
+import base64
+import hashlib
+import binascii
 import requests
-from flask import Flask, jsonify, request
+from requests.adapters import HTTPAdapter
+from flask import Flask, request, current_app, make_response
 import os
 from dotenv import load_dotenv
 from pathlib import Path
@@ -9,9 +13,82 @@ from datetime import datetime, timedelta
 from functools import wraps
 import jwt
 from urllib.parse import urlparse
+import tempfile
+import threading
+import time
+import zlib
+import re
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows - token sharing falls back to per-process
+    fcntl = None
+
+try:
+    import redis
+except ImportError:  # optional - result caches stay in-process without it
+    redis = None
+
+try:
+    import brotli
+except ImportError:  # optional - responses are only gzip-compressed without it
+    brotli = None
+
+try:
+    import orjson
+except ImportError:  # optional - jsonify falls back to the standard library encoder
+    orjson = None
 
 load_dotenv()
 
+def _json_default(obj):
+    """Types the API encodes beyond plain JSON: datetimes in the API's 'YYYY-MM-DD HH:MM:SS' form and sets"""
+    if isinstance(obj, datetime):
+        return obj.isoformat(' ', 'seconds')
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+class FastJSONEncoder(json.JSONEncoder):
+    """app.json_encoder for the responses Flask encodes itself (e.g. routes returning a dict)"""
+
+    def default(self, obj):
+        try:
+            return _json_default(obj)
+        except TypeError:
+            return super().default(obj)
+
+def dumps_json(data, sort_keys=True):
+    """Encode data to JSON bytes with orjson when available, else the standard library"""
+    if orjson is not None:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, default=_json_default, option=options)
+    try:
+        return json.dumps(data, default=_json_default, sort_keys=sort_keys, separators=(',', ':')).encode('utf-8')
+    except TypeError:
+        if not sort_keys:
+            raise
+        # mixed int/str keys can't be sorted by the stdlib encoder; orjson sorts them as strings
+        return json.dumps(data, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+def jsonify(*args, **kwargs):
+    """
+    Drop-in replacement for flask.jsonify on the fast encoder. Output is compact
+    (Flask's pretty-printing only ever applied in debug mode) and keeps Flask's
+    JSON_SORT_KEYS behaviour.
+    """
+    if args and kwargs:
+        raise TypeError('jsonify() behavior undefined when passed both args and kwargs')
+    data = args[0] if len(args) == 1 else (list(args) if args else kwargs)
+    app = current_app
+    body = dumps_json(data, sort_keys=app.config.get('JSON_SORT_KEYS', True))
+    return app.response_class(body + b'\n', mimetype=app.config.get('JSONIFY_MIMETYPE', 'application/json'))
+
 def hash_password(plain_password: str) -> bytes:
     """
     Receives a plain text password, returns the hashed password as bytes.
@@ -46,13 +123,540 @@ def save_json(file_path: str, data) -> None:
     with open(file_path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=4)
 
+class OutboundClient:
+    """
+    Shared keep-alive HTTP client for every outbound integration (IGDB, Twitch,
+    Giphy, GamerPower). Each upstream host gets its own requests.Session with a
+    connection pool, so TCP/TLS connections are reused between requests.
+    Requests get default connect/read timeouts and per-upstream latency and
+    connection reuse counters are kept for monitoring.
+    """
+
+    def __init__(self, pool_connections=None, pool_maxsize=None, connect_timeout=None, read_timeout=None):
+        self.pool_connections = pool_connections or int(os.getenv('HTTP_POOL_CONNECTIONS', 4))
+        self.pool_maxsize = pool_maxsize or int(os.getenv('HTTP_POOL_MAXSIZE', 16))
+        self.timeout = (
+            connect_timeout or float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05)),
+            read_timeout or float(os.getenv('HTTP_READ_TIMEOUT', 10))
+        )
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._stats = {}
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        host = urlparse(url).netloc
+        session = self._session(host)
+        kwargs.setdefault('timeout', self.timeout)
+        
+        started = time.perf_counter()
+        failed = True
+        try:
+            response = session.request(method, url, **kwargs)
+            failed = response.status_code >= 500
+            return response
+        finally:
+            self._record(host, (time.perf_counter() - started) * 1000, failed)
+
+    def _session(self, host):
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._sessions[host] = session
+                    self._stats[host] = {'requests': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+        return session
+
+    def _record(self, host, elapsed_ms, failed):
+        with self._lock:
+            stats = self._stats[host]
+            stats['requests'] += 1
+            stats['errors'] += 1 if failed else 0
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+
+    def stats(self):
+        """Per-upstream request, latency and connection reuse counters"""
+        result = {}
+        with self._lock:
+            items = [(host, dict(stats), self._sessions[host]) for host, stats in self._stats.items()]
+        
+        for host, stats, session in items:
+            opened, served = 0, 0
+            for adapter in set(session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is not None:
+                        opened += pool.num_connections
+                        served += pool.num_requests
+            
+            result[host] = {
+                'requests': stats['requests'],
+                'errors': stats['errors'],
+                'avg_ms': round(stats['total_ms'] / stats['requests'], 2) if stats['requests'] else 0,
+                'max_ms': round(stats['max_ms'], 2),
+                'connections_opened': opened,
+                'connections_reused': max(served - opened, 0)
+            }
+        return result
+
+http_client = OutboundClient()
+
+_background_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('BACKGROUND_WORKERS', 4)),
+    thread_name_prefix='background'
+)
+
+def run_in_background(app, func, *args, **kwargs):
+    """
+    Run func(*args, **kwargs) on the shared background thread pool inside an
+    application context. Errors are printed instead of being lost in the future.
+    """
+    def task():
+        with app.app_context():
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                print(f"Error in background task {getattr(func, '__name__', func)}: {str(e)}")
+    
+    return _background_executor.submit(task)
+
+def run_periodically(app, interval, func, *args, **kwargs):
+    """
+    Call func(*args, **kwargs) right away and then every interval seconds on a
+    daemon thread inside an application context. Errors are printed and the
+    schedule carries on.
+    """
+    name = getattr(func, '__name__', 'periodic')
+    
+    def loop():
+        while True:
+            with app.app_context():
+                try:
+                    func(*args, **kwargs)
+                except Exception as e:
+                    print(f"Error in periodic task {name}: {str(e)}")
+            time.sleep(interval)
+    
+    thread = threading.Thread(target=loop, name=f'periodic-{name}', daemon=True)
+    thread.start()
+    return thread
+
+_fan_out_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('FAN_OUT_WORKERS', 8)),
+    thread_name_prefix='fan-out'
+)
+
+def fan_out(calls, timeout=None):
+    """
+    Run independent calls (a dict of name -> zero-argument callable) in parallel on
+    a bounded thread pool, waiting at most timeout seconds for all of them.
+    Returns (results, errors): results maps the names of calls that finished to
+    their values, errors maps the rest to the exception they raised, or to a
+    TimeoutError if they were still running at the deadline.
+    At the deadline only calls still queued are cancelled; a call already running
+    keeps its pool worker until it returns, so each call should bound its own
+    outbound requests with a timeout no longer than this one.
+    """
+    futures = {name: _fan_out_executor.submit(func) for name, func in calls.items()}
+    wait(futures.values(), timeout=timeout)
+    
+    results, errors = {}, {}
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            errors[name] = TimeoutError(f'{name} did not finish within {timeout}s')
+        elif future.exception() is not None:
+            errors[name] = future.exception()
+        else:
+            results[name] = future.result()
+    return results, errors
+
+def encode_cursor(*values):
+    """
+    Encode keyset pagination values (e.g. a timestamp and an id) into an
+    opaque URL-safe cursor string
+    """
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor back into its list of values.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor')
+    return values
+
 def check_token():
     client = os.getenv("IGDB_CLIENT")
     secret = os.getenv("CLIENT_SECRET")
     params = {'client_id':f'{client}', 'client_secret':f'{secret}', 'grant_type':'client_credentials'}
-    x = requests.post(f'https://id.twitch.tv/oauth2/token', params=params)
+    x = http_client.post(f'https://id.twitch.tv/oauth2/token', params=params)
     return x
 
+class IGDBTokenManager:
+    """
+    Process-wide cache for the IGDB (Twitch client-credentials) access token.
+    The token is kept with its expiry, refreshed in the background shortly
+    before it expires and shared with the other gunicorn workers through a
+    small cache file, so Twitch is only hit when a token actually runs out.
+    """
+
+    def __init__(self, cache_file=None, refresh_margin=None):
+        self.cache_file = cache_file or os.getenv(
+            'IGDB_TOKEN_CACHE_FILE',
+            os.path.join(tempfile.gettempdir(), 'gameaten_igdb_token.json')
+        )
+        self.refresh_margin = refresh_margin if refresh_margin is not None else int(os.getenv('IGDB_TOKEN_REFRESH_MARGIN', 3600))
+        self._lock = threading.Lock()
+        self._token = None
+        self._expires_at = 0
+        self._rejected = None
+        self._refreshing = False
+
+    def get_token(self):
+        """Return a valid access token, fetching one only when needed"""
+        now = time.time()
+        token, expires_at = self._token, self._expires_at
+        
+        if token and now < expires_at - self.refresh_margin:
+            return token
+        
+        # Still valid but close to expiring - keep serving it and refresh in the background
+        if token and now < expires_at:
+            self._refresh_in_background()
+            return token
+        
+        with self._lock:
+            if not self._token or time.time() >= self._expires_at:
+                self._refresh()
+            return self._token
+
+    def invalidate(self, token):
+        """Drop a token that IGDB rejected so the next call fetches a new one"""
+        with self._lock:
+            self._rejected = token
+            if self._token == token:
+                self._token = None
+                self._expires_at = 0
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        
+        def run():
+            try:
+                with self._lock:
+                    self._refresh()
+            except Exception as e:
+                print(f"Error refreshing IGDB token: {str(e)}")
+            finally:
+                self._refreshing = False
+        
+        threading.Thread(target=run, name='igdb-token-refresh', daemon=True).start()
+
+    def _refresh(self):
+        """Load a fresh token from the shared cache file or Twitch (caller holds self._lock)"""
+        with self._shared_file_lock():
+            shared = self._read_shared()
+            if shared and shared['access_token'] != self._rejected \
+                    and time.time() < shared['expires_at'] - self.refresh_margin:
+                self._token, self._expires_at = shared['access_token'], shared['expires_at']
+                return
+            
+            response = check_token()
+            response.raise_for_status()
+            data = response.json()
+            self._token = data['access_token']
+            self._expires_at = time.time() + int(data.get('expires_in', 3600))
+            self._write_shared()
+
+    def _shared_file_lock(self):
+        return _FileLock(self.cache_file + '.lock')
+
+    def _read_shared(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('access_token') and data.get('expires_at'):
+                return data
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _write_shared(self):
+        try:
+            tmp_path = f'{self.cache_file}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'access_token': self._token, 'expires_at': self._expires_at}, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            print(f"Could not share IGDB token with other workers: {str(e)}")
+
+class _FileLock:
+    """Exclusive cross-process lock on a file (no-op where fcntl is unavailable)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return self
+        try:
+            self._file = open(self.path, 'a')
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        except OSError:
+            self._file = None
+        return self
+
+    def __exit__(self, *exc):
+        if self._file:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        return False
+
+class _InFlight:
+    """A call other threads can wait on for the same result, or the same exception"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def finish(self, result, error=None):
+        self.result = result
+        self.error = error
+        self.done.set()
+
+class IGDBGovernor:
+    """
+    Keeps our IGDB traffic within its limits (about 4 requests per second).
+    - acquire(): token bucket shared by every thread and, through a locked state
+      file, every gunicorn worker on the host (and every container that mounts the
+      same IGDB_RATE_STATE_FILE, see docker-compose.yml)
+    - coalesce(): identical calls already in flight wait for that call's result
+    - load_game(): single-id lookups arriving within a few milliseconds of each
+      other are sent to IGDB as one 'where id = (...)' request
+    """
+
+    def __init__(self, rate=None, burst=None, state_file=None, batch_window_ms=None, max_batch=None):
+        self.rate = rate or float(os.getenv('IGDB_RATE_LIMIT', 4))
+        self.burst = burst or float(os.getenv('IGDB_RATE_BURST', self.rate))
+        self.state_file = state_file or os.getenv(
+            'IGDB_RATE_STATE_FILE',
+            os.path.join(tempfile.gettempdir(), 'gameaten_igdb_rate.json')
+        )
+        window_ms = batch_window_ms if batch_window_ms is not None else float(os.getenv('IGDB_BATCH_WINDOW_MS', 5))
+        self.batch_window = window_ms / 1000.0
+        self.max_batch = max_batch or int(os.getenv('IGDB_BATCH_SIZE', 500))
+        
+        self._bucket_lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.time()
+        
+        self._calls_lock = threading.Lock()
+        self._calls = {}
+        
+        self._batch_lock = threading.Lock()
+        self._pending = []
+        self._games = {}
+        
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'throttled': 0,
+            'wait_seconds': 0.0,
+            'coalesced': 0,
+            'batches': 0,
+            'batched_ids': 0
+        }
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _take_token(self):
+        """Take a token if one is available, otherwise return how long to wait for one"""
+        with _FileLock(self.state_file + '.lock'):
+            tokens, updated = self._tokens, self._updated
+            try:
+                with open(self.state_file) as f:
+                    state = json.load(f)
+                tokens, updated = float(state['tokens']), float(state['updated'])
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+            
+            now = time.time()
+            tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            
+            self._tokens, self._updated = tokens, now
+            try:
+                with open(self.state_file, 'w') as f:
+                    json.dump({'tokens': tokens, 'updated': now}, f)
+            except OSError:
+                pass
+            return wait
+
+    def acquire(self):
+        """Block until a request to IGDB may be sent"""
+        waited = 0.0
+        with self._bucket_lock:
+            while True:
+                wait = self._take_token()
+                if not wait:
+                    break
+                time.sleep(wait)
+                waited += wait
+        
+        with self._stats_lock:
+            self._stats['requests'] += 1
+            if waited:
+                self._stats['throttled'] += 1
+                self._stats['wait_seconds'] += waited
+
+    def coalesce(self, key, func):
+        """Run func() once for all threads asking for the same key at the same time"""
+        with self._calls_lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _InFlight()
+        
+        if not leader:
+            self._count('coalesced')
+            return call.wait()
+        
+        result = error = None
+        try:
+            result = func()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            with self._calls_lock:
+                self._calls.pop(key, None)
+            call.finish(result, error)
+        return result
+
+    def load_game(self, game_id, batch_loader):
+        """
+        Look up one game through batch_loader(ids) -> {id: game}, sharing the request
+        with other lookups that arrive within the batch window. If batch_loader
+        raises, every lookup in the batch raises the same exception.
+        """
+        with self._batch_lock:
+            call = self._games.get(game_id)
+            if call is not None:
+                self._count('coalesced')
+                joined = True
+            else:
+                call = self._games[game_id] = _InFlight()
+                self._pending.append(game_id)
+                joined = False
+            leader = not joined and len(self._pending) == 1
+        
+        if not leader:
+            return call.wait()
+        
+        # First lookup in this window: wait briefly for others, then send them all
+        time.sleep(self.batch_window)
+        while True:
+            with self._batch_lock:
+                batch = self._pending[:self.max_batch]
+                self._pending = self._pending[self.max_batch:]
+                calls = [(batch_id, self._games[batch_id]) for batch_id in batch]
+            if not batch:
+                break
+            
+            results = {}
+            error = None
+            try:
+                results = batch_loader(batch) or {}
+            except Exception as e:
+                error = e
+                print(f"Error batch fetching games from IGDB: {str(e)}")
+            finally:
+                with self._batch_lock:
+                    for batch_id, _ in calls:
+                        self._games.pop(batch_id, None)
+                for batch_id, batch_call in calls:
+                    batch_call.finish(results.get(batch_id), error)
+            
+            with self._stats_lock:
+                self._stats['batches'] += 1
+                self._stats['batched_ids'] += len(batch)
+        
+        return call.wait()
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['wait_seconds'] = round(stats['wait_seconds'], 3)
+        stats['rate_limit'] = self.rate
+        return stats
+
+igdb_tokens = IGDBTokenManager()
+igdb_governor = IGDBGovernor()
+
+def igdb_post(endpoint, body):
+    """
+    POST an Apicalypse query to an IGDB endpoint (e.g. 'games') with the cached token.
+    Requests go through the rate limiter and identical queries already in flight
+    share one response. If IGDB answers 401 the token is dropped and the request
+    is retried once.
+    """
+    url = f'https://api.igdb.com/v4/{endpoint}/'
+    
+    def send():
+        token = igdb_tokens.get_token()
+        igdb_governor.acquire()
+        response = http_client.post(url, headers=_igdb_headers(token), data=body)
+        
+        if response.status_code == 401:
+            igdb_tokens.invalidate(token)
+            token = igdb_tokens.get_token()
+            igdb_governor.acquire()
+            response = http_client.post(url, headers=_igdb_headers(token), data=body)
+        
+        return response
+    
+    return igdb_governor.coalesce((endpoint, body), send)
+
 def token_required(func):
     @wraps(func)
     def decorated(*args, **kwargs):
@@ -79,6 +683,55 @@ def token_required(func):
         return func(*args, **kwargs)
     return decorated
 
+def conditional_response(cache_control, version=None):
+    """
+    Decorator adding validators and a Cache-Control policy to a route's 200 GET/HEAD responses.
+    version(*args, **kwargs) may return a cheap fingerprint of the data behind the
+    response - a (source, last_modified) pair, e.g. built from Games.last_updated -
+    or None when it cannot tell, or when the view must run anyway (e.g. to schedule a
+    refresh of stale rows). With a fingerprint the ETag is derived from it and
+    the URL, and a matching If-None-Match or If-Modified-Since gets a 304 before the
+    view runs; otherwise the ETag is a hash of the body and the 304 is decided after.
+    """
+    def decorator(func):
+        @wraps(func)
+        def decorated(*args, **kwargs):
+            conditional = request.method in ('GET', 'HEAD')
+            etag = last_modified = None
+            
+            if conditional and version is not None:
+                fingerprint = version(*args, **kwargs)
+                if fingerprint is not None:
+                    source, last_modified = fingerprint
+                    etag = hashlib.sha1(f'{request.full_path}|{source!r}'.encode('utf-8')).hexdigest()
+                    
+                    not_modified = request.if_none_match.contains_weak(etag) if request.if_none_match else (
+                        last_modified is not None and request.if_modified_since is not None
+                        and last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+                    )
+                    if not_modified:
+                        response = current_app.response_class(status=304)
+                        _add_validators(response, etag, last_modified, cache_control)
+                        return response
+            
+            response = make_response(func(*args, **kwargs))
+            if not conditional or response.status_code != 200 or response.is_streamed:
+                return response
+            
+            if etag is None:
+                response.add_etag()
+            _add_validators(response, etag, last_modified, cache_control)
+            return response.make_conditional(request)
+        return decorated
+    return decorator
+
+def _add_validators(response, etag, last_modified, cache_control):
+    if etag is not None:
+        response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = cache_control
+
 def is_valid_gif_url(url):
     """
     Validate if a URL is a valid GIF URL
@@ -126,127 +779,90 @@ def is_valid_gif_url(url):
     except Exception:
         return False
 
-def get_igdb_headers():
-    """Get headers for IGDB API requests with fresh token"""
-    t = check_token()
-    token = t.json()['access_token']
+def _igdb_headers(token):
     return {
         'Client-ID': f'{os.getenv("IGDB_CLIENT")}', 
         'Authorization': f'Bearer {token}'
     }
 
-def fetch_game_from_igdb(game_id):
+def get_igdb_headers():
+    """Get headers for IGDB API requests with the cached token"""
+    return _igdb_headers(igdb_tokens.get_token())
+
+def fetch_game_from_igdb(game_id, raise_errors=False):
     """
     Fetch complete game information from IGDB API
     Returns formatted game data or None if not found
+    Concurrent single-game lookups are combined into one batch request.
+    When IGDB fails the error is raised with raise_errors, otherwise None is returned.
     """
     try:
-        headers = get_igdb_headers()
-        body = f'fields name, cover.*, rating, artworks.*, summary, release_dates.human, platforms.name; where id = {game_id};'
-        response = requests.post('https://api.igdb.com/v4/games/', headers=headers, data=body)
-        
-        if response.status_code != 200:
-            return None
-            
-        games_data = response.json()
-        if not games_data:
-            return None
-            
-        game = games_data[0]
-        
-        # Format cover URL
-        cover_url = None
-        if 'cover' in game and 'url' in game['cover']:
-            cover_url = format_cover_url(game['cover']['url'])
-        
-        # Format artwork URLs
-        artwork_urls = []
-        if 'artworks' in game:
-            for artwork in game['artworks']:
-                if 'url' in artwork:
-                    artwork_urls.append(format_artwork_url(artwork['url']))
-        
-        # Format platforms
-        platforms = []
-        if 'platforms' in game:
-            platforms = [{'id': p.get('id'), 'name': p.get('name')} for p in game['platforms']]
-        
-        # Format release date
-        release_date = None
-        if 'release_dates' in game and game['release_dates']:
-            release_date = game['release_dates'][0].get('human', '')
-        
-        return {
-            'id': game['id'],
-            'name': game.get('name', 'Unknown Game'),
-            'summary': game.get('summary', ''),
-            'rating': game.get('rating'),
-            'cover_url': cover_url,
-            'release_date': release_date,
-            'platforms': json.dumps(platforms),
-            'artwork_urls': json.dumps(artwork_urls)
-        }
-        
+        return igdb_governor.load_game(int(game_id), fetch_games_batch)
     except Exception as e:
         print(f"Error fetching game {game_id} from IGDB: {str(e)}")
+        if raise_errors:
+            raise
         return None
 
-def batch_fetch_games_from_igdb(game_ids):
+def format_igdb_game(game):
+    """Convert an IGDB game record into the fields we cache"""
+    # Format cover URL
+    cover_url = None
+    if 'cover' in game and 'url' in game['cover']:
+        cover_url = format_cover_url(game['cover']['url'])
+    
+    # Format artwork URLs
+    artwork_urls = []
+    if 'artworks' in game:
+        for artwork in game['artworks']:
+            if 'url' in artwork:
+                artwork_urls.append(format_artwork_url(artwork['url']))
+    
+    # Format platforms
+    platforms = []
+    if 'platforms' in game:
+        platforms = [{'id': p.get('id'), 'name': p.get('name')} for p in game['platforms']]
+    
+    # Format release date
+    release_date = None
+    if 'release_dates' in game and game['release_dates']:
+        release_date = game['release_dates'][0].get('human', '')
+    
+    return {
+        'id': game['id'],
+        'name': game.get('name', 'Unknown Game'),
+        'summary': game.get('summary', ''),
+        'rating': game.get('rating'),
+        'cover_url': cover_url,
+        'release_date': release_date,
+        'platforms': json.dumps(platforms),
+        'artwork_urls': json.dumps(artwork_urls)
+    }
+
+def fetch_games_batch(game_ids):
     """
     Fetch multiple games from IGDB in a single request
-    Returns dict mapping game_id to game_data
+    Returns dict mapping game_id to game_data; raises UpstreamError or the request error when IGDB fails
     """
     if not game_ids:
         return {}
     
+    ids_str = ','.join(map(str, game_ids))
+    body = f'fields name, cover.*, rating, artworks.*, summary, release_dates.human, platforms.name; where id = ({ids_str}); limit {len(game_ids)};'
+    response = igdb_post('games', body)
+    
+    if response.status_code != 200:
+        raise UpstreamError(f'IGDB games returned {response.status_code}')
+    
+    return {game['id']: format_igdb_game(game) for game in response.json()}
+
+def batch_fetch_games_from_igdb(game_ids):
+    """
+    Fetch multiple games from IGDB in a single request
+    Returns dict mapping game_id to game_data (empty when IGDB fails)
+    """
     try:
-        headers = get_igdb_headers()
-        ids_str = ','.join(map(str, game_ids))
-        body = f'fields name, cover.*, rating, artworks.*, summary, release_dates.human, platforms.name; where id = ({ids_str}); limit {len(game_ids)};'
-        response = requests.post('https://api.igdb.com/v4/games/', headers=headers, data=body)
-        
-        if response.status_code != 200:
-            return {}
-            
-        games_data = response.json()
-        result = {}
-        
-        for game in games_data:
-            # Format cover URL
-            cover_url = None
-            if 'cover' in game and 'url' in game['cover']:
-                cover_url = format_cover_url(game['cover']['url'])
-            
-            # Format artwork URLs
-            artwork_urls = []
-            if 'artworks' in game:
-                for artwork in game['artworks']:
-                    if 'url' in artwork:
-                        artwork_urls.append(format_artwork_url(artwork['url']))
-            
-            # Format platforms
-            platforms = []
-            if 'platforms' in game:
-                platforms = [{'id': p.get('id'), 'name': p.get('name')} for p in game['platforms']]
-            
-            # Format release date
-            release_date = None
-            if 'release_dates' in game and game['release_dates']:
-                release_date = game['release_dates'][0].get('human', '')
-            
-            result[game['id']] = {
-                'id': game['id'],
-                'name': game.get('name', 'Unknown Game'),
-                'summary': game.get('summary', ''),
-                'rating': game.get('rating'),
-                'cover_url': cover_url,
-                'release_date': release_date,
-                'platforms': json.dumps(platforms),
-                'artwork_urls': json.dumps(artwork_urls)
-            }
-        
-        return result
-        
+        return fetch_games_batch(game_ids)
     except Exception as e:
         print(f"Error batch fetching games from IGDB: {str(e)}")
         return {}
@@ -283,6 +899,187 @@ def format_artwork_url(url):
     # Handle relative URLs
     return f"https://images.igdb.com/igdb/image/upload/t_original/{url.replace('t_thumb/', '')}"
 
+class GameNameIndex:
+    """
+    In-memory prefix index over the names of cached games, used to answer
+    typeahead without calling IGDB. Every word of a name is indexed by its
+    prefixes; a query matches games where each query word prefixes some word
+    of the name. Each worker loads the Games table at startup, indexes games
+    it caches itself and picks up other workers' writes with sync().
+    """
+
+    MAX_PREFIX = 12
+
+    def __init__(self, sync_interval=None):
+        self.sync_interval = sync_interval if sync_interval is not None else int(os.getenv('GAME_INDEX_SYNC_SECONDS', 30))
+        self._lock = threading.Lock()
+        self._games = {}      # id -> (name, normalized name, cover_url, rating)
+        self._prefixes = {}   # prefix -> set of ids
+        self._synced_until = None
+        self._last_sync = 0
+
+    @staticmethod
+    def normalize(text):
+        text = unicodedata.normalize('NFKD', text or '')
+        text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+        return ' '.join(re.findall(r'[a-z0-9]+', text.lower()))
+
+    def _prefixes_of(self, normalized):
+        prefixes = set()
+        for word in normalized.split():
+            for length in range(1, min(len(word), self.MAX_PREFIX) + 1):
+                prefixes.add(word[:length])
+        return prefixes
+
+    def add(self, game_id, name, cover_url=None, rating=None):
+        """Index a game, replacing any previous entry for the same id"""
+        normalized = self.normalize(name)
+        with self._lock:
+            self._remove(game_id)
+            self._games[game_id] = (name, normalized, cover_url, rating)
+            for prefix in self._prefixes_of(normalized):
+                self._prefixes.setdefault(prefix, set()).add(game_id)
+
+    def _remove(self, game_id):
+        previous = self._games.pop(game_id, None)
+        if previous is None:
+            return
+        for prefix in self._prefixes_of(previous[1]):
+            ids = self._prefixes.get(prefix)
+            if ids is not None:
+                ids.discard(game_id)
+                if not ids:
+                    del self._prefixes[prefix]
+
+    def load(self, Games, since=None):
+        """Index all cached games, or only those updated since the given time"""
+        query = Games.query.with_entities(Games.id, Games.name, Games.cover_url, Games.rating, Games.last_updated)
+        if since is not None:
+            query = query.filter(Games.last_updated >= since)
+        
+        latest = since
+        for game_id, name, cover_url, rating, last_updated in query.all():
+            self.add(game_id, name, cover_url, rating)
+            if last_updated and (latest is None or last_updated > latest):
+                latest = last_updated
+        
+        self._synced_until = latest
+        self._last_sync = time.time()
+
+    def sync(self, Games):
+        """Pick up games cached by other workers, at most once per sync_interval"""
+        if time.time() - self._last_sync < self.sync_interval:
+            return
+        self._last_sync = time.time()
+        try:
+            self.load(Games, since=self._synced_until)
+        except Exception as e:
+            print(f"Error syncing game name index: {str(e)}")
+
+    def search(self, query, limit=5, strong_only=False):
+        """
+        Games whose words are prefixed by every query word. Names starting with the
+        query rank first, then whole-word matches, then by rating and name length.
+        strong_only keeps just the names that start with the query or contain every
+        query word as a whole word - the matches good enough to skip IGDB for.
+        """
+        normalized = self.normalize(query)
+        words = normalized.split()
+        if not words:
+            return []
+        
+        with self._lock:
+            candidates = None
+            for word in sorted(words, key=len, reverse=True):
+                ids = self._prefixes.get(word[:self.MAX_PREFIX], set())
+                candidates = set(ids) if candidates is None else candidates & ids
+                if not candidates:
+                    return []
+            
+            matches = []
+            for game_id in candidates:
+                name, game_normalized, cover_url, rating = self._games[game_id]
+                name_words = game_normalized.split()
+                # Words longer than MAX_PREFIX were only matched on their first characters
+                if any(len(word) > self.MAX_PREFIX and not any(w.startswith(word) for w in name_words) for word in words):
+                    continue
+                starts_with = game_normalized.startswith(normalized)
+                whole_words = sum(word in name_words for word in words)
+                if strong_only and not (starts_with or whole_words == len(words)):
+                    continue
+                rank = (
+                    not starts_with,
+                    -whole_words,
+                    -(rating or 0),
+                    len(name)
+                )
+                matches.append((rank, game_id, name, cover_url))
+        
+        matches.sort()
+        return [
+            {'id': game_id, 'name': name, 'cover_url': cover_url}
+            for _, game_id, name, cover_url in matches[:limit]
+        ]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'games': len(self._games),
+                'prefixes': len(self._prefixes),
+                'synced_until': self._synced_until.isoformat() if self._synced_until else None
+            }
+
+game_name_index = GameNameIndex()
+
+class GameDictCache:
+    """
+    Decoded Games.to_dict() output shared by every request in the worker, so the
+    platforms / artwork_urls JSON of a game is parsed once per change instead of
+    once per render. An entry is only served while the row's last_updated matches
+    the one it was built from; any write to a game bumps last_updated.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv('GAME_DICT_CACHE_SIZE', 5000))
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # id -> (last_updated, dict)
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, game_id, last_updated, build):
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry is not None and entry[0] == last_updated:
+                self._entries.move_to_end(game_id)
+                self.hits += 1
+                return dict(entry[1])
+            self.misses += 1
+
+        game_dict = build()
+        with self._lock:
+            self._entries[game_id] = (last_updated, game_dict)
+            self._entries.move_to_end(game_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return dict(game_dict)
+
+    def discard(self, game_id):
+        with self._lock:
+            self._entries.pop(game_id, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None
+            }
+
+game_dict_cache = GameDictCache()
+
 def cache_game_info(db, Games, game_data):
     """
     Cache game information in the local database
@@ -318,6 +1115,9 @@ def cache_game_info(db, Games, game_data):
             db.session.add(game_record)
         
         db.session.commit()
+        game_name_index.add(game_record.id, game_record.name, game_record.cover_url, game_record.rating)
+        game_dict_cache.discard(game_record.id)
+        lookup_cache.delete('game', game_record.id)
         return game_record
         
     except Exception as e:
@@ -325,6 +1125,77 @@ def cache_game_info(db, Games, game_data):
         print(f"Error caching game info: {str(e)}")
         return None
 
+GAME_CACHE_FIELDS = ('name', 'summary', 'rating', 'cover_url', 'release_date', 'platforms', 'artwork_urls')
+
+def cache_games_bulk(db, Games, games_data):
+    """
+    Cache a batch of games in the local database with a single upsert in one transaction.
+    MySQL uses INSERT ... ON DUPLICATE KEY UPDATE, PostgreSQL and SQLite ON CONFLICT DO
+    UPDATE, so concurrent requests caching the same game can't collide on the primary key;
+    other databases get one IN lookup followed by a bulk insert and bulk update.
+    Returns the number of games written
+    """
+    if not games_data:
+        return 0
+    
+    now = datetime.utcnow()
+    rows = []
+    for game_data in games_data:
+        row = {field: game_data[field] for field in GAME_CACHE_FIELDS}
+        row.update({'id': game_data['id'], 'last_updated': now, 'created_at': now})
+        rows.append(row)
+    
+    dialect = db.engine.dialect.name
+    try:
+        if dialect == 'mysql':
+            from sqlalchemy.dialects.mysql import insert
+            stmt = insert(Games.__table__).values(rows)
+            stmt = stmt.on_duplicate_key_update(
+                **{field: stmt.inserted[field] for field in GAME_CACHE_FIELDS + ('last_updated',)}
+            )
+            db.session.execute(stmt)
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+            stmt = insert(Games.__table__).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Games.__table__.c.id],
+                set_={field: stmt.excluded[field] for field in GAME_CACHE_FIELDS + ('last_updated',)}
+            )
+            db.session.execute(stmt)
+        elif dialect == 'sqlite':
+            # SQLAlchemy 1.3 has no SQLite upsert construct; typed binds keep the stored DateTime format
+            columns = ('id',) + GAME_CACHE_FIELDS + ('last_updated', 'created_at')
+            updates = ', '.join(f'{field} = excluded.{field}' for field in GAME_CACHE_FIELDS + ('last_updated',))
+            db.session.execute(db.text(
+                f'INSERT INTO {Games.__table__.name} ({", ".join(columns)}) '
+                f'VALUES ({", ".join(":" + column for column in columns)}) '
+                f'ON CONFLICT (id) DO UPDATE SET {updates}'
+            ).bindparams(
+                db.bindparam('last_updated', type_=Games.__table__.c.last_updated.type),
+                db.bindparam('created_at', type_=Games.__table__.c.created_at.type)
+            ), rows)
+        else:
+            existing_ids = {row[0] for row in db.session.query(Games.id).filter(
+                Games.id.in_([row['id'] for row in rows])
+            ).all()}
+            db.session.bulk_insert_mappings(Games, [row for row in rows if row['id'] not in existing_ids])
+            db.session.bulk_update_mappings(Games, [
+                {key: value for key, value in row.items() if key != 'created_at'}
+                for row in rows if row['id'] in existing_ids
+            ])
+        
+        db.session.commit()
+        for row in rows:
+            game_name_index.add(row['id'], row['name'], row['cover_url'], row['rating'])
+            game_dict_cache.discard(row['id'])
+        lookup_cache.delete('game', *[row['id'] for row in rows])
+        return len(rows)
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error bulk caching games: {str(e)}")
+        return 0
+
 def get_or_cache_games(db, Games, game_ids):
     """
     Get games from cache or fetch from IGDB if needed
@@ -333,25 +1204,1030 @@ def get_or_cache_games(db, Games, game_ids):
     if not game_ids:
         return {}
     
+    game_ids = list(set(game_ids))
+    
+    # Check cache first - one IN query for the whole batch
+    cached_games = {game.id: game for game in Games.query.filter(Games.id.in_(game_ids)).all()}
+    
     result = {}
     missing_game_ids = []
-    
-    # Check cache first
+    stale_game_ids = []
     for game_id in game_ids:
-        cached_game = Games.query.get(game_id)
+        cached_game = cached_games.get(game_id)
         
-        if cached_game and not Games.should_refresh(cached_game):
+        if cached_game and not Games.is_expired(cached_game):
+            # Past the soft TTL: serve the cached row now, refresh it in the background
             result[game_id] = cached_game
+            if Games.should_refresh(cached_game):
+                stale_game_ids.append(game_id)
         else:
             missing_game_ids.append(game_id)
     
-    # Fetch missing games from IGDB
+    if stale_game_ids:
+        schedule_game_refresh(db, Games, stale_game_ids)
+    
+    # Fetch missing (or hard-expired) games from IGDB and write them in one batch
     if missing_game_ids:
         igdb_games = batch_fetch_games_from_igdb(missing_game_ids)
         
-        for game_id, game_data in igdb_games.items():
-            cached_game = cache_game_info(db, Games, game_data)
-            if cached_game:
-                result[game_id] = cached_game
+        if cache_games_bulk(db, Games, list(igdb_games.values())):
+            refreshed = Games.query.filter(Games.id.in_(list(igdb_games.keys()))).all()
+            for cached_game in refreshed:
+                result[cached_game.id] = cached_game
+        
+        # IGDB unavailable - an expired cached row is still better than nothing
+        for game_id in missing_game_ids:
+            if game_id not in result and game_id in cached_games:
+                result[game_id] = cached_games[game_id]
+    
+    return result
+
+_refreshing_game_ids = set()
+_refreshing_game_ids_lock = threading.Lock()
+
+def schedule_game_refresh(db, Games, game_ids):
+    """
+    Refresh stale cached games from IGDB in the background (stale-while-revalidate).
+    A game already being refreshed is not queued again.
+    """
+    with _refreshing_game_ids_lock:
+        game_ids = [game_id for game_id in set(game_ids) if game_id not in _refreshing_game_ids]
+        _refreshing_game_ids.update(game_ids)
     
-    return result
\ No newline at end of file
+    if not game_ids:
+        return
+    
+    def refresh():
+        try:
+            cache_games_bulk(db, Games, list(batch_fetch_games_from_igdb(game_ids).values()))
+        finally:
+            with _refreshing_game_ids_lock:
+                _refreshing_game_ids.difference_update(game_ids)
+    
+    run_in_background(current_app._get_current_object(), refresh)
+
+class GameCacheRefresher:
+    """
+    Background refresher for the Games cache. Work is kept in a database queue
+    table so any process can enqueue it; a worker (the dedicated 'flask
+    refresh-games' process, or a thread inside the web process with
+    GAME_REFRESH_WORKER=thread) claims batches of up to IGDB_BATCH_SIZE ids,
+    refreshes them through batch_fetch_games_from_igdb and cache_games_bulk,
+    and periodically scans for stale games to enqueue. Claims make it safe to
+    run several workers at once.
+    """
+
+    def __init__(self, db, Games, RefreshQueue, find_stale_games, batch_size=None, scan_interval=None, idle_sleep=5):
+        self.db = db
+        self.Games = Games
+        self.RefreshQueue = RefreshQueue
+        self.find_stale_games = find_stale_games
+        self.batch_size = batch_size or int(os.getenv('IGDB_BATCH_SIZE', 500))
+        self.scan_interval = scan_interval or int(os.getenv('GAME_REFRESH_SCAN_INTERVAL', 600))
+        self.claim_timeout = int(os.getenv('GAME_REFRESH_CLAIM_TIMEOUT', 600))  # Claims of a dead worker are taken over after this
+        self.retry_base = int(os.getenv('GAME_REFRESH_RETRY_SECONDS', 60))  # Doubles with every failed attempt
+        self.retry_max = int(os.getenv('GAME_REFRESH_RETRY_MAX_SECONDS', 6 * 3600))
+        self.max_attempts = int(os.getenv('GAME_REFRESH_MAX_ATTEMPTS', 8))
+        self.idle_sleep = idle_sleep
+        self._thread = None
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'running': False,
+            'batches': 0,
+            'refreshed': 0,
+            'failed': 0,
+            'busy_seconds': 0.0,
+            'last_batch_size': 0,
+            'last_batch_seconds': 0.0,
+            'last_batch_at': None,
+            'last_scan_at': None
+        }
+
+    def enqueue(self, game_ids, priority=0):
+        """Queue games for refresh (ids already queued keep their place). Returns the number queued"""
+        game_ids = list(set(game_ids))
+        if not game_ids:
+            return 0
+        
+        db, RefreshQueue = self.db, self.RefreshQueue
+        try:
+            queued = {row[0] for row in db.session.query(RefreshQueue.game_id).filter(
+                RefreshQueue.game_id.in_(game_ids)
+            ).all()}
+            new_ids = [game_id for game_id in game_ids if game_id not in queued]
+            
+            if queued:
+                # Raise the priority of games that are already waiting
+                RefreshQueue.query.filter(
+                    RefreshQueue.game_id.in_(list(queued)),
+                    RefreshQueue.priority < priority
+                ).update({RefreshQueue.priority: priority}, synchronize_session=False)
+            
+            now = datetime.utcnow()
+            db.session.bulk_insert_mappings(RefreshQueue, [
+                {'game_id': game_id, 'priority': priority, 'enqueued_at': now} for game_id in new_ids
+            ])
+            db.session.commit()
+            return len(new_ids)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error queueing game refresh: {str(e)}")
+            return 0
+
+    def scan(self):
+        """Queue stale games, those with recent review or save activity first"""
+        stale = self.find_stale_games(self.batch_size * 4)
+        queued = self.enqueue([game_id for game_id, activity in stale if activity], priority=1)
+        queued += self.enqueue([game_id for game_id, activity in stale if not activity], priority=0)
+        with self._stats_lock:
+            self._stats['last_scan_at'] = datetime.utcnow().isoformat()
+        return queued
+
+    def _claim(self):
+        """
+        Take up to batch_size due games off the queue for this worker. Rows are claimed
+        with a conditional UPDATE, so concurrent workers never refresh the same game;
+        claims left by a worker that died are taken over after claim_timeout seconds.
+        Returns (claim token, claimed game ids)
+        """
+        db, RefreshQueue = self.db, self.RefreshQueue
+        now = datetime.utcnow()
+        claimable = db.and_(
+            db.or_(RefreshQueue.available_at.is_(None), RefreshQueue.available_at <= now),
+            db.or_(RefreshQueue.claimed_at.is_(None), RefreshQueue.claimed_at < now - timedelta(seconds=self.claim_timeout))
+        )
+        candidates = [row[0] for row in db.session.query(RefreshQueue.game_id).filter(claimable).order_by(
+            RefreshQueue.priority.desc(), RefreshQueue.enqueued_at.asc()
+        ).limit(self.batch_size).all()]
+        if not candidates:
+            return None, []
+        
+        token = f'{os.getpid()}-{os.urandom(6).hex()}'
+        RefreshQueue.query.filter(RefreshQueue.game_id.in_(candidates), claimable).update({
+            RefreshQueue.claimed_by: token,
+            RefreshQueue.claimed_at: now
+        }, synchronize_session=False)
+        db.session.commit()
+        return token, [row[0] for row in db.session.query(RefreshQueue.game_id).filter_by(claimed_by=token).all()]
+
+    def _retry_later(self, token, game_ids):
+        """Release claimed games that were not refreshed, backing off exponentially; give up after max_attempts"""
+        db, RefreshQueue = self.db, self.RefreshQueue
+        by_attempts = {}
+        for game_id, attempts in db.session.query(RefreshQueue.game_id, RefreshQueue.attempts).filter(
+            RefreshQueue.game_id.in_(game_ids), RefreshQueue.claimed_by == token
+        ).all():
+            by_attempts.setdefault(attempts + 1, []).append(game_id)
+        
+        now = datetime.utcnow()
+        for attempts, ids in by_attempts.items():
+            claimed = RefreshQueue.query.filter(RefreshQueue.game_id.in_(ids), RefreshQueue.claimed_by == token)
+            if attempts >= self.max_attempts:
+                claimed.delete(synchronize_session=False)
+                continue
+            delay = min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+            claimed.update({
+                RefreshQueue.attempts: attempts,
+                RefreshQueue.available_at: now + timedelta(seconds=delay),
+                RefreshQueue.claimed_by: None,
+                RefreshQueue.claimed_at: None
+            }, synchronize_session=False)
+
+    def run_once(self):
+        """
+        Refresh one claimed batch. Games written to the cache leave the queue; the
+        rest (IGDB errors, ids IGDB did not return) stay queued with a backoff.
+        Returns the number of games claimed
+        """
+        db, RefreshQueue = self.db, self.RefreshQueue
+        token, game_ids = self._claim()
+        if not game_ids:
+            return 0
+        
+        started = time.perf_counter()
+        try:
+            igdb_games = batch_fetch_games_from_igdb(game_ids)
+        except Exception as e:
+            print(f"Error fetching games for refresh: {str(e)}")
+            igdb_games = {}
+        written = cache_games_bulk(db, self.Games, list(igdb_games.values())) if igdb_games else 0
+        
+        claimed = set(game_ids)
+        refreshed = [game_id for game_id in igdb_games if game_id in claimed] if written else []
+        failed = list(claimed.difference(refreshed))
+        if refreshed:
+            RefreshQueue.query.filter(
+                RefreshQueue.game_id.in_(refreshed), RefreshQueue.claimed_by == token
+            ).delete(synchronize_session=False)
+        if failed:
+            self._retry_later(token, failed)
+        db.session.commit()
+        
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            stats = self._stats
+            stats['batches'] += 1
+            stats['refreshed'] += len(refreshed)
+            stats['failed'] += len(failed)
+            stats['busy_seconds'] += elapsed
+            stats['last_batch_size'] = len(game_ids)
+            stats['last_batch_seconds'] = round(elapsed, 3)
+            stats['last_batch_at'] = datetime.utcnow().isoformat()
+        return len(game_ids)
+
+    def run_forever(self, on_batch=None):
+        """Drain the queue and rescan for stale games every scan_interval seconds until stopped"""
+        with self._stats_lock:
+            self._stats['running'] = True
+        last_scan = 0
+        try:
+            while not self._stop.is_set():
+                try:
+                    if time.time() - last_scan >= self.scan_interval:
+                        self.scan()
+                        last_scan = time.time()
+                    
+                    processed = self.run_once()
+                    if processed and on_batch:
+                        on_batch(processed, self.stats())
+                except Exception as e:
+                    self.db.session.rollback()
+                    processed = 0
+                    print(f"Error refreshing game cache: {str(e)}")
+                finally:
+                    self.db.session.remove()
+                
+                if not processed:
+                    self._stop.wait(self.idle_sleep)
+        finally:
+            with self._stats_lock:
+                self._stats['running'] = False
+
+    def start(self, app):
+        """Run the worker on a daemon thread of this process"""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        def run():
+            with app.app_context():
+                self.run_forever()
+        
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name='game-cache-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        """Progress and throughput of this process's worker plus the shared queue depth"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        busy = stats.pop('busy_seconds')
+        stats['games_per_second'] = round(stats['refreshed'] / busy, 2) if busy else 0
+        try:
+            stats['queued'] = self.RefreshQueue.query.count()
+        except Exception:
+            stats['queued'] = None
+        return stats
+
+class LocalCacheBackend:
+    """In-process LRU store of serialized values with per-entry expiry, bounded in bytes"""
+
+    name = 'local'
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.time():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def set(self, key, payload, ttl):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.time() + ttl, payload)
+            self._bytes += len(payload)
+            while self._bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def _drop(self, key):
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def info(self):
+        with self._lock:
+            return {
+                'backend': self.name,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions
+            }
+
+class InProcessRedis:
+    """
+    Stand-in for the redis client implementing the commands the cache backends
+    use (GET, MGET, SET with EX, DELETE and pipelines). Selected with
+    CACHE_REDIS_URL=memory:// for tests and single-process development.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}  # key -> (expires_at, value)
+
+    def _live(self, key):
+        entry = self._data.get(key)
+        if entry is not None and entry[0] is not None and entry[0] <= time.time():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key)
+            return entry[1] if entry else None
+
+    def mget(self, keys):
+        with self._lock:
+            return [entry[1] if entry else None for entry in map(self._live, keys)]
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = (time.time() + ex if ex else None, value)
+        return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def flushall(self):
+        with self._lock:
+            self._data.clear()
+
+    def pipeline(self, transaction=True):
+        return _InProcessPipeline(self)
+
+    def info(self, section=None):
+        with self._lock:
+            used = sum(len(value) for _, value in self._data.values())
+        return {'used_memory': used, 'maxmemory': 0, 'maxmemory_policy': 'noeviction'}
+
+class _InProcessPipeline:
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+
+    def set(self, *args, **kwargs):
+        self._commands.append((self._client.set, args, kwargs))
+        return self
+
+    def delete(self, *args):
+        self._commands.append((self._client.delete, args, {}))
+        return self
+
+    def execute(self):
+        commands, self._commands = self._commands, []
+        return [command(*args, **kwargs) for command, args, kwargs in commands]
+
+memory_redis = InProcessRedis()
+
+class RedisCacheBackend:
+    """
+    Store shared by every gunicorn worker. Entries expire through Redis TTLs;
+    LRU eviction and the total size limit are left to the server's
+    maxmemory / maxmemory-policy allkeys-lru settings.
+    """
+
+    name = 'redis'
+
+    def __init__(self, url=None, prefix='gameaten:', client=None):
+        self.client = client or redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def get_many(self, keys):
+        """Payloads for keys in one MGET round trip, None where missing"""
+        return self.client.mget([self.prefix + key for key in keys])
+
+    def set(self, key, payload, ttl):
+        self.client.set(self.prefix + key, payload, ex=max(1, int(ttl)))
+
+    def set_many(self, payloads, ttl):
+        pipeline = self.client.pipeline(transaction=False)
+        for key, payload in payloads.items():
+            pipeline.set(self.prefix + key, payload, ex=max(1, int(ttl)))
+        pipeline.execute()
+
+    def delete(self, *keys):
+        self.client.delete(*[self.prefix + key for key in keys])
+
+    def info(self):
+        info = {'backend': self.name}
+        try:
+            memory = self.client.info('memory')
+            info['bytes'] = memory.get('used_memory')
+            info['max_bytes'] = memory.get('maxmemory')
+            info['policy'] = memory.get('maxmemory_policy')
+        except Exception as e:
+            info['error'] = str(e)
+        return info
+
+def make_shared_backend():
+    """
+    The store shared by all workers: Redis at CACHE_REDIS_URL, the in-process
+    fake for memory://, or None when there is no usable shared store
+    """
+    url = os.getenv('CACHE_REDIS_URL')
+    if not url:
+        return None
+    if url == 'memory://':
+        return RedisCacheBackend(client=memory_redis)
+    if redis is None:
+        print("CACHE_REDIS_URL is set but the redis package is not installed - using an in-process cache")
+        return None
+    return RedisCacheBackend(url)
+
+def make_cache_backend(max_bytes):
+    """Redis when CACHE_REDIS_URL is set and the client is installed, otherwise in-process"""
+    return make_shared_backend() or LocalCacheBackend(max_bytes)
+
+class UpstreamError(Exception):
+    """An outbound API answered with an error status"""
+
+class ResultCache:
+    """
+    TTL cache for JSON-serializable results, keyed by endpoint, variant and
+    normalized query. Values over max_entry_bytes are not stored and backend
+    errors count as misses, so the cache can never break a request.
+    """
+
+    def __init__(self, namespace, backend=None, ttl=None, max_bytes=None, max_entry_bytes=None):
+        self.namespace = namespace
+        max_bytes = max_bytes or int(os.getenv('RESULT_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+        self.backend = backend or make_cache_backend(max_bytes)
+        self.ttl = ttl or int(os.getenv('RESULT_CACHE_TTL', 3600))
+        self.max_entry_bytes = max_entry_bytes or int(os.getenv('RESULT_CACHE_MAX_ENTRY_BYTES', 64 * 1024))
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stale': 0, 'sets': 0, 'too_large': 0, 'errors': 0}
+
+    @staticmethod
+    def normalize(query):
+        """Case and whitespace differences don't change IGDB search results"""
+        return ' '.join(str(query).lower().split())
+
+    def key(self, endpoint, query, variant=''):
+        return f'{self.namespace}:{endpoint}:{variant}:{self.normalize(query)}'
+
+    def _count(self, stat):
+        with self._stats_lock:
+            self._stats[stat] += 1
+
+    def _read(self, key):
+        try:
+            payload = self.backend.get(key)
+        except Exception as e:
+            self._count('errors')
+            print(f"Error reading result cache: {str(e)}")
+            return None
+        return json.loads(payload) if payload is not None else None
+
+    def get(self, key):
+        """Cached value for key, or None"""
+        value = self._read(key)
+        self._count('misses' if value is None else 'hits')
+        return value
+
+    def get_or_fetch(self, key, fetch, ttl=None, stale_ttl=None):
+        """
+        Value for key, calling fetch() when it is missing or older than ttl.
+        Entries are kept for stale_ttl so that when fetch() raises, the last good
+        value is served instead of the error. Returns (value, state) where state
+        is 'hit', 'miss' or 'stale'.
+        """
+        ttl = ttl or self.ttl
+        entry = self._read(key)
+        if entry is not None and entry['fresh_until'] > time.time():
+            self._count('hits')
+            return entry['value'], 'hit'
+        
+        self._count('misses')
+        try:
+            value = fetch()
+        except Exception as e:
+            if entry is None:
+                raise
+            self._count('stale')
+            print(f"Serving stale cache entry {key}: {str(e)}")
+            return entry['value'], 'stale'
+        
+        self.set(key, {'value': value, 'fresh_until': time.time() + ttl}, ttl=max(ttl, stale_ttl or 0))
+        return value, 'miss'
+
+    def fresh_for(self, key):
+        """Seconds until a get_or_fetch entry goes stale (0 when missing or stale)"""
+        entry = self._read(key)
+        return max(0.0, entry['fresh_until'] - time.time()) if entry else 0.0
+
+    def set(self, key, value, ttl=None):
+        payload = json.dumps(value, separators=(',', ':')).encode('utf-8')
+        if len(payload) > self.max_entry_bytes:
+            self._count('too_large')
+            return
+        try:
+            self.backend.set(key, payload, ttl or self.ttl)
+            self._count('sets')
+        except Exception as e:
+            self._count('errors')
+            print(f"Error writing result cache: {str(e)}")
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0
+        stats['ttl'] = self.ttl
+        stats.update(self.backend.info())
+        return stats
+
+class TieredCache:
+    """
+    Two-tier cache for hot row lookups (game dicts, user display records,
+    username -> id). L1 is a small per-worker LRU of decoded values; L2 is the
+    store shared by all workers (see make_shared_backend), skipped when none is
+    configured. delete() clears L2 and this worker's L1 at once; other workers'
+    L1 copies expire within l1_ttl seconds, which bounds how stale a read can be.
+    Values are JSON-serializable and must not be None; treat them as read-only.
+    """
+
+    def __init__(self, namespace, l2='default', ttl=None, l1_ttl=None, l1_max_entries=None):
+        self.namespace = namespace
+        self.l2 = make_shared_backend() if l2 == 'default' else l2
+        self.ttl = ttl or int(os.getenv('LOOKUP_CACHE_TTL', 3600))
+        self.l1_ttl = l1_ttl if l1_ttl is not None else float(os.getenv('LOOKUP_L1_TTL', 10))
+        self.l1_max_entries = l1_max_entries or int(os.getenv('LOOKUP_L1_MAX_ENTRIES', 20000))
+        self._lock = threading.Lock()
+        self._l1 = OrderedDict()  # key -> (expires_at, value)
+        self._stats = {'l1_hits': 0, 'l2_hits': 0, 'misses': 0, 'sets': 0, 'invalidations': 0, 'errors': 0}
+
+    def _key(self, kind, ident):
+        return f'{self.namespace}:{kind}:{ident}'
+
+    def _l1_get(self, key, now):
+        entry = self._l1.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._l1[key]
+            return None
+        self._l1.move_to_end(key)
+        return entry[1]
+
+    def _error(self, action, e):
+        with self._lock:
+            self._stats['errors'] += 1
+        print(f"Error {action} lookup cache: {str(e)}")
+
+    def _l1_set(self, key, value):
+        self._l1[key] = (time.time() + self.l1_ttl, value)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.l1_max_entries:
+            self._l1.popitem(last=False)
+
+    def get_many(self, kind, idents):
+        """Cached values by ident; idents missing from both tiers are left out"""
+        found = {}
+        missing = []
+        now = time.time()
+        with self._lock:
+            for ident in idents:
+                value = self._l1_get(self._key(kind, ident), now)
+                if value is None:
+                    missing.append(ident)
+                else:
+                    found[ident] = value
+            self._stats['l1_hits'] += len(found)
+
+        if missing and self.l2 is not None:
+            try:
+                payloads = self.l2.get_many([self._key(kind, ident) for ident in missing])
+            except Exception as e:
+                payloads = [None] * len(missing)
+                self._error('reading', e)
+            with self._lock:
+                for ident, payload in zip(missing, payloads):
+                    if payload is not None:
+                        found[ident] = json.loads(payload)
+                        self._l1_set(self._key(kind, ident), found[ident])
+                        self._stats['l2_hits'] += 1
+
+        with self._lock:
+            self._stats['misses'] += len(idents) - len(found)
+        return {ident: dict(value) if isinstance(value, dict) else value for ident, value in found.items()}
+
+    def get(self, kind, ident):
+        return self.get_many(kind, [ident]).get(ident)
+
+    def set_many(self, kind, values):
+        if not values:
+            return
+        with self._lock:
+            for ident, value in values.items():
+                self._l1_set(self._key(kind, ident), value)
+            self._stats['sets'] += len(values)
+        if self.l2 is not None:
+            try:
+                self.l2.set_many({
+                    self._key(kind, ident): dumps_json(value, sort_keys=False) for ident, value in values.items()
+                }, self.ttl)
+            except Exception as e:
+                self._error('writing', e)
+
+    def set(self, kind, ident, value):
+        self.set_many(kind, {ident: value})
+
+    def get_or_load(self, kind, idents, load):
+        """
+        Values for idents, calling load(missing_idents) -> {ident: value} once
+        for everything neither tier has and caching what it returns
+        """
+        idents = list(idents)
+        found = self.get_many(kind, idents)
+        missing = [ident for ident in idents if ident not in found]
+        if missing:
+            loaded = load(missing)
+            self.set_many(kind, loaded)
+            found.update(loaded)
+        return found
+
+    def delete(self, kind, *idents):
+        keys = [self._key(kind, ident) for ident in idents]
+        with self._lock:
+            for key in keys:
+                self._l1.pop(key, None)
+            self._stats['invalidations'] += len(keys)
+        if self.l2 is not None and keys:
+            try:
+                self.l2.delete(*keys)
+            except Exception as e:
+                self._error('invalidating', e)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['l1_entries'] = len(self._l1)
+        lookups = stats['l1_hits'] + stats['l2_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['l1_hits'] + stats['l2_hits']) / lookups, 3) if lookups else 0
+        stats['l1_ttl'] = self.l1_ttl
+        stats['ttl'] = self.ttl
+        stats['l2'] = self.l2.info() if self.l2 is not None else None
+        return stats
+
+# Games, user display records and username -> id mappings
+lookup_cache = TieredCache('lookup')
+
+GAMERPOWER_API = 'https://www.gamerpower.com/api'
+
+# GamerPower 'type' filter values -> lower-cased giveaway types they cover
+GIVEAWAY_TYPE_ALIASES = {
+    'game': {'game', 'full game'},
+    'loot': {'loot', 'dlc', 'in-game loot', 'other'},
+    'beta': {'beta', 'early access'}
+}
+
+# Slugged platform names as they appear in giveaways -> the filter value GamerPower uses
+GIVEAWAY_PLATFORM_ALIASES = {
+    'playstation-4': 'ps4',
+    'playstation-5': 'ps5',
+    'xbox-series-x|s': 'xbox-series-xs',
+    'xbox-series-x-s': 'xbox-series-xs',
+    'itch.io': 'itchio',
+    'nintendo-switch': 'switch',
+    'battle.net': 'battlenet'
+}
+
+def process_giveaway(giveaway):
+    """The giveaway fields we pass on to the frontend"""
+    return {
+        'id': giveaway.get('id'),
+        'title': giveaway.get('title'),
+        'description': giveaway.get('description'),
+        'image': giveaway.get('image'),
+        'thumbnail': giveaway.get('thumbnail'),
+        'instructions': giveaway.get('instructions'),
+        'open_giveaway_url': giveaway.get('open_giveaway_url'),
+        'published_date': giveaway.get('published_date'),
+        'type': giveaway.get('type'),
+        'platforms': giveaway.get('platforms'),
+        'end_date': giveaway.get('end_date'),
+        'users': giveaway.get('users'),
+        'status': giveaway.get('status'),
+        'worth': giveaway.get('worth'),
+        'gamerpower_url': giveaway.get('gamerpower_url'),
+        'open_giveaway': giveaway.get('open_giveaway')
+    }
+
+def _giveaway_platforms(giveaway):
+    platforms = set()
+    for name in (giveaway.get('platforms') or '').split(','):
+        slug = '-'.join(name.strip().lower().split())
+        if slug:
+            platforms.add(GIVEAWAY_PLATFORM_ALIASES.get(slug, slug))
+    return platforms
+
+def _giveaway_worth(giveaway):
+    try:
+        return float(str(giveaway.get('worth') or '').lstrip('$'))
+    except ValueError:
+        return 0.0
+
+class GamerPowerSnapshot:
+    """
+    One in-memory copy of the full GamerPower giveaways list and worth summary,
+    refreshed periodically. Type and platform filters and the date, value and
+    popularity orders are precomputed on every refresh, so any combination of
+    filters is answered from RAM without calling GamerPower.
+    """
+
+    SORTS = {
+        'date': lambda giveaway: giveaway.get('published_date') or '',
+        'value': _giveaway_worth,
+        'popularity': lambda giveaway: giveaway.get('users') or 0
+    }
+
+    def __init__(self, refresh_interval=None, timeout=None):
+        self.refresh_interval = refresh_interval or int(os.getenv('GAMERPOWER_REFRESH_SECONDS', 600))
+        self.timeout = timeout or float(os.getenv('GAMERPOWER_TIMEOUT', 8))
+        self._lock = threading.Lock()
+        self._state = None
+        self._last_attempt = 0
+
+    def _get_json(self, path):
+        # Bounded by the fan-out deadline so a slow GamerPower doesn't hold fan-out workers past it
+        response = http_client.get(f'{GAMERPOWER_API}/{path}', timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _reload(self):
+        """
+        Fetch the giveaways list and worth summary in parallel and load them.
+        If only one arrives in time it is combined with the previous snapshot's
+        copy of the other (an empty worth summary on a cold start).
+        Raises the upstream error when there are no giveaways to serve.
+        """
+        results, errors = fan_out({
+            'giveaways': lambda: self._get_json('giveaways'),
+            'worth': lambda: self._get_json('worth?min-value=0')
+        }, timeout=self.timeout)
+        previous = self._state
+        
+        for name, error in errors.items():
+            print(f"Error fetching GamerPower {name}: {str(error)}")
+        if 'giveaways' not in results and previous is None:
+            raise errors['giveaways']
+        
+        worth = results.get('worth', previous['worth'] if previous else {})
+        if 'giveaways' in results:
+            self.load(results['giveaways'], worth)
+        else:
+            self._state = dict(previous, worth=worth)
+
+    def load(self, giveaways, worth):
+        """Replace the snapshot and rebuild its indexes"""
+        giveaways = [process_giveaway(giveaway) for giveaway in giveaways]
+        
+        by_type = {}
+        by_platform = {}
+        for position, giveaway in enumerate(giveaways):
+            by_type.setdefault((giveaway.get('type') or '').lower(), set()).add(position)
+            for platform in _giveaway_platforms(giveaway):
+                by_platform.setdefault(platform, set()).add(position)
+        
+        orders = {
+            sort: sorted(range(len(giveaways)), key=lambda position: key(giveaways[position]), reverse=True)
+            for sort, key in self.SORTS.items()
+        }
+        
+        self._state = {
+            'giveaways': giveaways,
+            'worth': worth,
+            'by_type': by_type,
+            'by_platform': by_platform,
+            'orders': orders,
+            'updated_at': time.time()
+        }
+
+    def refresh(self):
+        """Fetch and load a new snapshot; the current one stays in place if GamerPower fails"""
+        with self._lock:
+            self._reload()
+
+    def _is_current(self, state):
+        # Not loaded yet, or the periodic refresh has not run for a while
+        return state is not None and time.time() - state['updated_at'] < self.refresh_interval * 3
+
+    def _current(self):
+        state = self._state
+        if self._is_current(state) or (state is not None and time.time() - self._last_attempt < 60):
+            return state
+        
+        with self._lock:
+            if not self._is_current(self._state):
+                self._last_attempt = time.time()
+                try:
+                    self._reload()
+                except Exception as e:
+                    if self._state is None:
+                        raise
+                    print(f"Error refreshing GamerPower snapshot - serving the previous one: {str(e)}")
+            return self._state
+
+    def giveaways(self, giveaway_type='', platform='', sort_by='date'):
+        """
+        Giveaways matching the type and platform filters (several platforms can be
+        given as 'steam.epic-games-store'), in the requested order
+        """
+        state = self._current()
+        matches = None
+        
+        if giveaway_type:
+            types = GIVEAWAY_TYPE_ALIASES.get(giveaway_type.lower(), {giveaway_type.lower()})
+            matches = set().union(*(state['by_type'].get(name, set()) for name in types))
+        if platform:
+            platforms = {GIVEAWAY_PLATFORM_ALIASES.get(name, name) for name in platform.lower().split('.')}
+            platform_matches = set().union(*(state['by_platform'].get(name, set()) for name in platforms))
+            matches = platform_matches if matches is None else matches & platform_matches
+        
+        order = state['orders'].get(sort_by, state['orders']['date'])
+        return [state['giveaways'][position] for position in order if matches is None or position in matches]
+
+    def worth(self):
+        return self._current()['worth']
+
+    def loaded_at(self):
+        """When the snapshot being served was loaded, or None if the next read will reload it"""
+        state = self._state
+        return datetime.utcfromtimestamp(state['updated_at']) if self._is_current(state) else None
+
+    def stats(self):
+        state = self._state
+        if state is None:
+            return {'loaded': False}
+        return {
+            'loaded': True,
+            'giveaways': len(state['giveaways']),
+            'types': sorted(state['by_type']),
+            'platforms': sorted(state['by_platform']),
+            'age_seconds': round(time.time() - state['updated_at'], 1)
+        }
+
+gamerpower_snapshot = GamerPowerSnapshot()
+
+class ResponseCompressor:
+    """
+    after_request hook compressing responses with brotli or gzip, as negotiated
+    through Accept-Encoding. Buffered responses below min_size are left alone;
+    streamed responses are compressed chunk by chunk as they are sent. The level
+    depends on the content type (cheap for JSON, where worker CPU matters most).
+    Strong ETags become weak, since the bytes now depend on the encoding.
+    """
+
+    COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'text/')
+    # content type prefix -> (gzip level, brotli quality)
+    LEVELS = {
+        'application/json': (6, 4),
+        'text/html': (6, 5),
+        'text/': (6, 5),
+        'application/javascript': (6, 5)
+    }
+    DEFAULT_LEVELS = (6, 4)
+
+    def __init__(self, app=None, min_size=None):
+        self.min_size = min_size if min_size is not None else int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+        self.enabled = os.getenv('COMPRESS_RESPONSES', 'on') == 'on'
+        self._stats_lock = threading.Lock()
+        self._stats = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.after_request(self.compress)
+
+    def _levels(self, mimetype):
+        for prefix, levels in self.LEVELS.items():
+            if mimetype.startswith(prefix):
+                return levels
+        return self.DEFAULT_LEVELS
+
+    def _encoding(self):
+        offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+        return request.accept_encodings.best_match(offered)
+
+    def _record(self, encoding, bytes_in, bytes_out, cpu_seconds):
+        with self._stats_lock:
+            stats = self._stats.setdefault(encoding, {
+                'responses': 0, 'bytes_in': 0, 'bytes_out': 0, 'cpu_seconds': 0.0
+            })
+            stats['responses'] += 1
+            stats['bytes_in'] += bytes_in
+            stats['bytes_out'] += bytes_out
+            stats['cpu_seconds'] += cpu_seconds
+
+    def _compressor(self, encoding, mimetype):
+        gzip_level, brotli_quality = self._levels(mimetype)
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=brotli_quality)
+            return compressor.process, lambda: compressor.flush(), compressor.finish
+        compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+        return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+    def compress(self, response):
+        if (not self.enabled
+                or response.status_code < 200 or response.status_code in (204, 206, 304)
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or not response.mimetype.startswith(self.COMPRESSIBLE_TYPES)):
+            return response
+        
+        response.vary.add('Accept-Encoding')
+        encoding = self._encoding()
+        if not encoding:
+            return response
+        if not response.is_streamed and response.content_length is not None and response.content_length < self.min_size:
+            return response
+        
+        process, flush, finish = self._compressor(encoding, response.mimetype)
+        
+        if response.is_streamed:
+            chunks = response.response
+            
+            def generate():
+                bytes_in = bytes_out = 0
+                cpu_seconds = 0.0
+                for chunk in chunks:
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode(response.charset)
+                    started = time.thread_time()
+                    # Flush per chunk so the client receives data as it is produced
+                    compressed = process(chunk) + flush()
+                    cpu_seconds += time.thread_time() - started
+                    bytes_in += len(chunk)
+                    bytes_out += len(compressed)
+                    if compressed:
+                        yield compressed
+                tail = finish()
+                bytes_out += len(tail)
+                self._record(encoding, bytes_in, bytes_out, cpu_seconds)
+                yield tail
+            
+            response.response = generate()
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            started = time.thread_time()
+            compressed = process(data) + finish()
+            self._record(encoding, len(data), len(compressed), time.thread_time() - started)
+            response.set_data(compressed)
+        
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def stats(self):
+        with self._stats_lock:
+            stats = {encoding: dict(values) for encoding, values in self._stats.items()}
+        for values in stats.values():
+            values['bytes_saved'] = values['bytes_in'] - values['bytes_out']
+            values['ratio'] = round(values['bytes_out'] / values['bytes_in'], 3) if values['bytes_in'] else None
+            values['cpu_ms_per_response'] = round(values['cpu_seconds'] * 1000 / values['responses'], 3)
+            values['cpu_seconds'] = round(values['cpu_seconds'], 3)
+        return {
+            'enabled': self.enabled,
+            'min_size': self.min_size,
+            'brotli_available': brotli is not None,
+            'encodings': stats
+        }
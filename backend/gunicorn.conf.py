@@ -0,0 +1,6 @@
+"""Gunicorn settings - picked up automatically from the working directory"""
+
+def post_worker_init(worker):
+    # Each worker runs its own refresh threads, started here rather than on import of app
+    from app import start_background_tasks
+    start_background_tasks()
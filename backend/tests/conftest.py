@@ -0,0 +1,109 @@
+"""
+Shared fixtures. The app runs against a throwaway SQLite database, background
+tasks run inline and every upstream call (IGDB, Giphy, GamerPower) is disabled.
+
+Run from backend/: python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import jwt
+import pytest
+
+SECRET_KEY = 'test-suite-secret-key-with-enough-bytes'
+
+os.environ['DB_URI'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ['SECRET_KEY'] = SECRET_KEY
+os.environ.pop('secret', None)
+os.environ.pop('CACHE_REDIS_URL', None)
+os.environ['LOOKUP_L1_TTL'] = '0'  # No per-process copies surviving a table wipe between tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module  # noqa: E402
+import funcs  # noqa: E402
+
+db = app_module.db
+
+@pytest.fixture(scope='session')
+def app():
+    app_module.app.config['TESTING'] = True
+    with app_module.app.app_context():
+        app_module.upgrade_database()
+    return app_module.app
+
+@pytest.fixture(autouse=True)
+def isolated(app, monkeypatch):
+    """Run background tasks inline, refuse upstream calls, and empty every table and cache afterwards"""
+    monkeypatch.setattr(app_module, 'run_in_background', lambda app, func, *args, **kwargs: func(*args, **kwargs))
+
+    def no_upstream(*args, **kwargs):
+        raise funcs.UpstreamError('upstream calls are disabled in tests')
+    for module in (funcs, app_module):
+        monkeypatch.setattr(module, 'igdb_post', no_upstream)
+
+    for cache in (app_module.search_cache, app_module.leaderboard_cache, app_module.giphy_cache):
+        monkeypatch.setattr(cache, 'backend', funcs.LocalCacheBackend(1024 * 1024))
+
+    with app.app_context():
+        yield
+        db.session.rollback()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+        db.session.remove()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@contextmanager
+def count_queries():
+    """Collect the SQL statements run inside the block"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    db.event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        db.event.remove(db.engine, 'before_cursor_execute', record)
+
+def auth(user_id):
+    """Authorization header for a user"""
+    token = jwt.encode({'user': user_id, 'exp': datetime.utcnow() + timedelta(days=1)}, SECRET_KEY, algorithm='HS256')
+    if isinstance(token, bytes):
+        token = token.decode('utf-8')
+    return {'Authorization': f'Bearer {token}'}
+
+def make_user(username, follower_count=0):
+    user = app_module.User(
+        username=username, email=f'{username}@example.com', password=b'x', follower_count=follower_count
+    )
+    db.session.add(user)
+    app_module.index_username(user)
+    db.session.commit()
+    return user
+
+def make_game(game_id, name=None):
+    game = app_module.Games(
+        id=game_id, name=name or f'Game {game_id}', platforms='[]', artwork_urls='[]', last_updated=datetime.utcnow()
+    )
+    db.session.add(game)
+    db.session.commit()
+    return game
+
+def make_review(user, game_id, created_at, text='great game'):
+    review = app_module.Reviews(username=user.id, id_game=game_id, review_text=text, date_created=created_at)
+    db.session.add(review)
+    db.session.commit()
+    return review
+
+def make_repost(user, review, created_at):
+    repost = app_module.Reposts(user_id=user.id, review_id=review.id, created_at=created_at)
+    db.session.add(repost)
+    db.session.commit()
+    return repost
@@ -0,0 +1,25 @@
+import gzip
+
+from conftest import make_game
+
+def test_large_json_is_gzipped_when_accepted(client):
+    for game_id in range(1, 41):
+        make_game(game_id, name=f'A fairly long game name number {game_id}')
+    ids = ','.join(str(game_id) for game_id in range(1, 41))
+
+    plain = client.get('/api/games/bulk', query_string={'ids': ids})
+    compressed = client.get('/api/games/bulk', query_string={'ids': ids}, headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in plain.headers
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert gzip.decompress(compressed.data) == plain.data
+    assert compressed.headers['ETag'].startswith('W/')
+
+def test_small_responses_are_sent_as_is(client):
+    make_game(1)
+
+    response = client.get('/api/game', query_string={'id': 1}, headers={'Accept-Encoding': 'gzip'})
+
+    assert len(response.data) < 1024
+    assert 'Content-Encoding' not in response.headers
@@ -0,0 +1,93 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import app_module, auth, db, funcs, make_game, make_user
+
+def test_unchanged_game_answers_304(client):
+    make_game(1)
+
+    first = client.get('/api/game', query_string={'id': 1})
+    assert first.status_code == 200
+    assert first.headers['ETag']
+    assert 'max-age=300' in first.headers['Cache-Control']
+
+    again = client.get('/api/game', query_string={'id': 1}, headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.data == b''
+
+    since = client.get('/api/game', query_string={'id': 1}, headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert since.status_code == 304
+
+def test_changed_game_answers_200_with_a_new_etag(client):
+    make_game(1, name='Old name')
+    first = client.get('/api/game', query_string={'id': 1})
+
+    app_module.cache_game_info(db, app_module.Games, {
+        'id': 1, 'name': 'New name', 'summary': None, 'rating': None, 'cover_url': None,
+        'release_date': None, 'platforms': json.dumps([]), 'artwork_urls': json.dumps([])
+    })
+    again = client.get('/api/game', query_string={'id': 1}, headers={'If-None-Match': first.headers['ETag']})
+
+    assert again.status_code == 200
+    assert again.headers['ETag'] != first.headers['ETag']
+    assert again.json[0]['name'] == 'New name'
+
+def test_saved_games_revalidate_after_a_save(client):
+    alice = make_user('alice')
+    make_game(1)
+    make_game(2)
+    client.post('/api/saved-games', json={'game_id': 1}, headers=auth(alice.id))
+
+    first = client.get('/api/saved-games/alice')
+    assert first.status_code == 200
+    assert client.get('/api/saved-games/alice', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    client.post('/api/saved-games', json={'game_id': 2}, headers=auth(alice.id))
+    again = client.get('/api/saved-games/alice', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 200
+    assert again.json['count'] == 2
+
+def test_post_requests_are_not_made_conditional(client):
+    make_game(1)
+    first = client.get('/api/game', query_string={'id': 1})
+
+    response = client.post('/api/game', json={'id': 1}, headers={'If-None-Match': first.headers['ETag']})
+
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
+
+@pytest.fixture
+def scheduled(monkeypatch):
+    """Game ids passed to schedule_game_refresh"""
+    game_ids = []
+    for module in (app_module, funcs):
+        monkeypatch.setattr(module, 'schedule_game_refresh', lambda db, Games, ids: game_ids.extend(ids))
+    return game_ids
+
+def make_stale(game_id, age):
+    app_module.Games.query.filter_by(id=game_id).update({'last_updated': datetime.utcnow() - age})
+    db.session.commit()
+
+def test_revalidating_a_stale_game_still_schedules_its_refresh(client, scheduled):
+    make_game(1)
+    first = client.get('/api/game', query_string={'id': 1})
+    make_stale(1, app_module.GAME_CACHE_SOFT_TTL + timedelta(days=1))
+
+    again = client.get('/api/game', query_string={'id': 1}, headers={'If-None-Match': first.headers['ETag']})
+
+    assert again.status_code == 200
+    assert scheduled == [1]
+
+def test_bulk_games_are_not_validated_once_any_is_stale(client, scheduled):
+    make_game(1)
+    make_game(2)
+    first = client.get('/api/games/bulk', query_string={'ids': '1,2'})
+    assert client.get('/api/games/bulk', query_string={'ids': '1,2'}, headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    make_stale(2, app_module.GAME_CACHE_SOFT_TTL + timedelta(days=1))
+    again = client.get('/api/games/bulk', query_string={'ids': '1,2'}, headers={'If-None-Match': first.headers['ETag']})
+
+    assert again.status_code == 200
+    assert scheduled == [2]
@@ -0,0 +1,44 @@
+import time
+
+from conftest import funcs
+
+def test_results_and_errors_are_reported_by_name():
+    def fail():
+        raise ValueError('bad')
+
+    results, errors = funcs.fan_out({'ok': lambda: 1, 'bad': fail}, timeout=1)
+
+    assert results == {'ok': 1}
+    assert isinstance(errors['bad'], ValueError)
+
+def test_calls_run_in_parallel_and_slow_ones_time_out():
+    started = time.perf_counter()
+
+    results, errors = funcs.fan_out({
+        'fast': lambda: time.sleep(0.05) or 'fast',
+        'also_fast': lambda: time.sleep(0.05) or 'also fast',
+        'slow': lambda: time.sleep(0.5) or 'slow'
+    }, timeout=0.2)
+
+    assert time.perf_counter() - started < 0.4
+    assert results == {'fast': 'fast', 'also_fast': 'also fast'}
+    assert isinstance(errors['slow'], TimeoutError)
+
+def test_gamerpower_requests_are_bounded_by_the_fan_out_deadline(monkeypatch):
+    timeouts = {}
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return []
+
+    def get(url, **kwargs):
+        timeouts[url.rsplit('/', 1)[-1]] = kwargs.get('timeout')
+        return Response()
+    monkeypatch.setattr(funcs.http_client, 'get', get)
+
+    funcs.GamerPowerSnapshot(timeout=2)._reload()
+
+    assert timeouts == {'giveaways': 2, 'worth?min-value=0': 2}
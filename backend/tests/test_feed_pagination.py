@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+from conftest import app_module, auth, make_game, make_repost, make_review, make_user
+
+def walk(client, user_id, size, **params):
+    """Follow next_cursor from the first page to the last; returns every item and the page count"""
+    items, cursor, pages = [], '', 0
+    while cursor is not None:
+        response = client.get('/api/ver', query_string=dict(params, size=size, cursor=cursor), headers=auth(user_id))
+        assert response.status_code == 200, response.json
+        items.extend(response.json['comments'])
+        cursor = response.json['pagination']['next_cursor']
+        pages += 1
+    return items, pages
+
+def test_game_cursor_walk_has_no_duplicates_or_gaps(client):
+    alice = make_user('alice')
+    make_game(1)
+    make_game(2)
+    start = datetime.utcnow() - timedelta(hours=2)
+    for i in range(23):
+        # Groups of three reviews share a timestamp, so pages must break ties on id
+        make_review(alice, 1, start + timedelta(minutes=i // 3))
+    make_review(alice, 2, start)
+    expected = [review.id for review in app_module.Reviews.query.filter_by(id_game=1).order_by(
+        app_module.Reviews.date_created.desc(), app_module.Reviews.id.desc()
+    )]
+
+    items, pages = walk(client, alice.id, 5, busca='game', id_game=1)
+
+    assert [item['id'] for item in items] == expected
+    assert pages == 5
+
+def test_cursor_walk_is_stable_when_newer_reviews_arrive(client):
+    alice = make_user('alice')
+    make_game(1)
+    start = datetime.utcnow() - timedelta(hours=2)
+    reviews = [make_review(alice, 1, start + timedelta(minutes=i)) for i in range(10)]
+
+    first = client.get('/api/ver', query_string={'busca': 'game', 'id_game': 1, 'size': 4, 'cursor': ''}, headers=auth(alice.id)).json
+    make_review(alice, 1, datetime.utcnow())
+    rest = client.get('/api/ver', query_string={
+        'busca': 'game', 'id_game': 1, 'size': 10, 'cursor': first['pagination']['next_cursor']
+    }, headers=auth(alice.id)).json
+
+    ids = [item['id'] for item in first['comments'] + rest['comments']]
+    assert ids == [review.id for review in reversed(reviews)]
+    assert rest['pagination']['next_cursor'] is None
+
+def test_home_feed_cursor_walk_merges_reviews_and_reposts(client):
+    alice = make_user('alice')
+    bob = make_user('bob')
+    make_game(1)
+    start = datetime.utcnow() - timedelta(hours=2)
+    reviews = [make_review(alice, 1, start + timedelta(minutes=2 * i)) for i in range(9)]
+    # Reposts interleave with the reviews and some share a review's timestamp
+    reposts = [make_repost(bob, review, review.date_created + timedelta(minutes=i % 2)) for i, review in enumerate(reviews[::2])]
+
+    items, _ = walk(client, alice.id, 4, busca='ambos', id_game=0)
+
+    keys = [(item['feed_type'], item['id']) for item in items]
+    assert len(keys) == len(set(keys))
+    assert set(keys) == {('review', review.id) for review in reviews} | {('repost', repost.id) for repost in reposts}
+    timestamps = [item.get('created_at') or item['date_created'] for item in items]
+    assert timestamps == sorted(timestamps, reverse=True)
+
+def test_invalid_cursor_is_rejected(client):
+    alice = make_user('alice')
+    response = client.get('/api/ver', query_string={'busca': 'game', 'id_game': 1, 'cursor': 'not-a-cursor'}, headers=auth(alice.id))
+    assert response.status_code == 400
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from conftest import auth, make_game, make_review, make_user
+
+def search(client, user_id, q, **params):
+    response = client.get('/api/search/reviews', query_string=dict(params, q=q), headers=auth(user_id))
+    assert response.status_code == 200, response.json
+    return response.json
+
+def review_ids(client, user_id, q, **params):
+    return [review['id'] for review in search(client, user_id, q, type='reviews', **params)['reviews']]
+
+def comment_texts(client, user_id, q):
+    return [comment['comment'] for comment in search(client, user_id, q, type='comments')['comments']]
+
+def post_comment(client, user_id, review_id, text):
+    response = client.post('/api/comment', json={'review_id': review_id, 'comment': text}, headers=auth(user_id))
+    assert response.status_code == 201, response.json
+    return response.json['comment']['comment_id']
+
+def test_reviews_match_every_word_with_the_last_as_a_prefix(client):
+    alice = make_user('alice')
+    make_game(1)
+    make_game(2)
+    boss = make_review(alice, 1, datetime.utcnow(), text='The final boss fight was brutal')
+    make_review(alice, 1, datetime.utcnow(), text='The boss music is great')
+    other_game = make_review(alice, 2, datetime.utcnow(), text='Another brutal boss')
+
+    assert sorted(review_ids(client, alice.id, 'boss bru')) == sorted([boss.id, other_game.id])
+    assert review_ids(client, alice.id, 'boss bru', game_id=1) == [boss.id]
+    assert review_ids(client, alice.id, 'speedrun') == []
+
+def test_edited_comments_are_reindexed(client):
+    alice = make_user('alice')
+    make_game(1)
+    review = make_review(alice, 1, datetime.utcnow())
+    comment_id = post_comment(client, alice.id, review.id, 'Loved the soundtrack')
+    assert comment_texts(client, alice.id, 'soundtrack') == ['Loved the soundtrack']
+
+    client.put(f'/api/comment/{comment_id}', json={'comment': 'Loved the level design'}, headers=auth(alice.id))
+
+    assert comment_texts(client, alice.id, 'soundtrack') == []
+    assert comment_texts(client, alice.id, 'level design') == ['Loved the level design']
+
+def test_deleted_reviews_and_comments_leave_the_index(client):
+    alice = make_user('alice')
+    make_game(1)
+    review = make_review(alice, 1, datetime.utcnow(), text='Hidden gem of a platformer')
+    comment_id = post_comment(client, alice.id, review.id, 'Agreed, a hidden gem')
+
+    client.delete(f'/api/comment/{comment_id}', headers=auth(alice.id))
+    client.delete(f'/api/review/{review.id}', headers=auth(alice.id))
+
+    result = search(client, alice.id, 'hidden gem')
+    assert (result['reviews'], result['comments']) == ([], [])
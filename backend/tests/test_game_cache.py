@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+
+from conftest import app_module, db, funcs, make_game
+
+Games = app_module.Games
+
+def igdb_game(game_id, name=None):
+    return dict({field: None for field in funcs.GAME_CACHE_FIELDS}, id=game_id, name=name or f'IGDB {game_id}',
+                platforms='[]', artwork_urls='[]')
+
+def test_bulk_cache_inserts_new_games_and_updates_cached_ones():
+    make_game(1, name='Old name')
+    created_at = Games.query.get(1).created_at
+
+    assert funcs.cache_games_bulk(db, Games, [igdb_game(1, 'New name'), igdb_game(2)]) == 2
+
+    db.session.expire_all()
+    assert [(game.id, game.name) for game in Games.query.order_by(Games.id)] == [(1, 'New name'), (2, 'IGDB 2')]
+    assert Games.query.get(1).created_at == created_at
+    assert Games.query.get(1).last_updated > created_at
+
+def test_game_cached_by_a_concurrent_request_is_upserted(monkeypatch):
+    # Another request writes game 1 just before our INSERT reaches the database
+    raced = []
+
+    def race(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT INTO games') and not raced:
+            raced.append(True)
+            with db.engine.connect() as other:
+                other.execute(Games.__table__.insert().values(
+                    id=1, name='Other request', platforms='[]', artwork_urls='[]', last_updated=datetime.utcnow()
+                ))
+    db.event.listen(db.engine, 'before_cursor_execute', race)
+    try:
+        written = funcs.cache_games_bulk(db, Games, [igdb_game(1), igdb_game(2)])
+    finally:
+        db.event.remove(db.engine, 'before_cursor_execute', race)
+
+    assert written == 2
+    assert [(game.id, game.name) for game in Games.query.order_by(Games.id)] == [(1, 'IGDB 1'), (2, 'IGDB 2')]
+
+def test_get_or_cache_games_fetches_only_missing_games_in_one_batch(monkeypatch):
+    make_game(1)
+    batches = []
+
+    def fetch(game_ids):
+        batches.append(sorted(game_ids))
+        return {game_id: igdb_game(game_id) for game_id in game_ids}
+    monkeypatch.setattr(funcs, 'batch_fetch_games_from_igdb', fetch)
+
+    games = funcs.get_or_cache_games(db, Games, [1, 2, 3])
+
+    assert sorted(games) == [1, 2, 3]
+    assert batches == [[2, 3]]
+
+def age(game_id, delta):
+    Games.query.filter_by(id=game_id).update({'last_updated': datetime.utcnow() - delta})
+    db.session.commit()
+
+def test_stale_game_is_served_now_and_refreshed_in_the_background(client, monkeypatch):
+    make_game(1, name='Cached name')
+    age(1, app_module.GAME_CACHE_SOFT_TTL + timedelta(days=1))
+    background = []
+    monkeypatch.setattr(funcs, 'run_in_background', lambda app, func, *args: background.append(func))
+    monkeypatch.setattr(funcs, 'batch_fetch_games_from_igdb', lambda game_ids: {1: igdb_game(1, 'Fresh name')})
+
+    response = client.get('/api/game', query_string={'id': 1})
+
+    assert response.json[0]['name'] == 'Cached name'
+    assert len(background) == 1
+    background[0]()
+    db.session.expire_all()
+    assert Games.query.get(1).name == 'Fresh name'
+
+def test_a_game_already_refreshing_is_not_scheduled_again(app, monkeypatch):
+    background = []
+    monkeypatch.setattr(funcs, 'run_in_background', lambda app, func, *args: background.append(func))
+    monkeypatch.setattr(funcs, 'batch_fetch_games_from_igdb', lambda game_ids: {})
+
+    funcs.schedule_game_refresh(db, Games, [1, 2])
+    funcs.schedule_game_refresh(db, Games, [2, 3])
+    assert len(background) == 2
+    for refresh in background:
+        refresh()
+
+    funcs.schedule_game_refresh(db, Games, [1])
+    assert len(background) == 3
+    background[2]()
+
+def test_expired_game_is_refetched_but_kept_when_igdb_fails(monkeypatch):
+    make_game(1, name='Expired name')
+    age(1, app_module.GAME_CACHE_HARD_TTL + timedelta(days=1))
+    fetched = []
+
+    def fetch(game_ids):
+        fetched.extend(game_ids)
+        return {}
+    monkeypatch.setattr(funcs, 'batch_fetch_games_from_igdb', fetch)
+
+    games = funcs.get_or_cache_games(db, Games, [1])
+
+    assert fetched == [1]
+    assert games[1].name == 'Expired name'
@@ -0,0 +1,47 @@
+import json
+
+from conftest import app_module, db, funcs, make_game
+
+def test_game_json_is_decoded_once_per_change(monkeypatch):
+    make_game(1)
+    app_module.Games.query.filter_by(id=1).update({'platforms': json.dumps(['PC', 'Switch'])})
+    db.session.commit()
+    game = app_module.Games.query.get(1)
+    decoded = []
+    real_loads = json.loads
+    monkeypatch.setattr(app_module.json, 'loads', lambda text, *args, **kwargs: decoded.append(text) or real_loads(text, *args, **kwargs))
+
+    first = game.to_dict()
+    second = game.to_dict()
+
+    assert first == second
+    assert first['platforms'] == ['PC', 'Switch']
+    assert len(decoded) == 2  # platforms and artwork_urls, on the first call only
+
+def test_callers_get_their_own_copy():
+    game = make_game(1)
+
+    game.to_dict()['name'] = 'Changed by a caller'
+
+    assert game.to_dict()['name'] == 'Game 1'
+
+def test_a_changed_row_is_decoded_again():
+    make_game(1, name='Old name')
+    assert app_module.Games.query.get(1).to_dict()['name'] == 'Old name'
+
+    funcs.cache_games_bulk(db, app_module.Games, [
+        dict({field: None for field in funcs.GAME_CACHE_FIELDS}, id=1, name='New name', platforms='["PC"]')
+    ])
+    db.session.expire_all()
+
+    game_dict = app_module.Games.query.get(1).to_dict()
+    assert (game_dict['name'], game_dict['platforms']) == ('New name', ['PC'])
+
+def test_the_cache_keeps_at_most_max_entries():
+    cache = funcs.GameDictCache(max_entries=2)
+    for game_id in (1, 2, 3):
+        cache.get_or_build(game_id, None, lambda: {'id': game_id})
+
+    assert cache.stats()['entries'] == 2
+    cache.get_or_build(1, None, lambda: {'id': 'rebuilt'})
+    assert cache.stats()['misses'] == 4
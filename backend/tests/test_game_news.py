@@ -0,0 +1,57 @@
+import pytest
+
+from conftest import app_module, funcs
+
+GIVEAWAYS = [
+    {'id': 1, 'title': 'Free Game', 'type': 'Game', 'platforms': 'PC, Steam', 'worth': '$19.99',
+     'published_date': '2024-01-03', 'users': 100},
+    {'id': 2, 'title': 'Skin Pack', 'type': 'DLC', 'platforms': 'Playstation 5', 'worth': '$4.99',
+     'published_date': '2024-01-02', 'users': 900},
+    {'id': 3, 'title': 'Closed Beta', 'type': 'Early Access', 'platforms': 'PC, Epic Games Store', 'worth': 'N/A',
+     'published_date': '2024-01-01', 'users': 50}
+]
+WORTH = {'active_giveaways_number': 3, 'worth_estimation_usd': '24.98'}
+
+@pytest.fixture
+def snapshot(monkeypatch):
+    """A loaded snapshot; any call to GamerPower fails"""
+    def no_gamerpower(*args, **kwargs):
+        raise funcs.UpstreamError('GamerPower is down')
+    monkeypatch.setattr(funcs.http_client, 'get', no_gamerpower)
+    snapshot = funcs.GamerPowerSnapshot()
+    snapshot.load(GIVEAWAYS, WORTH)
+    monkeypatch.setattr(app_module, 'gamerpower_snapshot', snapshot)
+    return snapshot
+
+def ids(giveaways):
+    return [giveaway['id'] for giveaway in giveaways]
+
+def test_filters_and_orders_come_from_the_snapshot(snapshot):
+    assert ids(snapshot.giveaways()) == [1, 2, 3]
+    assert ids(snapshot.giveaways(sort_by='value')) == [1, 2, 3]
+    assert ids(snapshot.giveaways(sort_by='popularity')) == [2, 1, 3]
+    assert ids(snapshot.giveaways(giveaway_type='loot')) == [2]
+    assert ids(snapshot.giveaways(giveaway_type='beta')) == [3]
+    assert ids(snapshot.giveaways(platform='ps5')) == [2]
+    assert ids(snapshot.giveaways(platform='steam.epic-games-store')) == [1, 3]
+    assert ids(snapshot.giveaways(giveaway_type='game', platform='pc')) == [1]
+
+def test_routes_answer_from_the_snapshot_without_calling_gamerpower(client, snapshot):
+    news = client.get('/api/game-news', query_string={'platform': 'pc', 'sort-by': 'popularity'})
+    complete = client.get('/api/game-news/complete', query_string={'type': 'loot'})
+
+    assert ids(news.json['data']) == [1, 3]
+    assert ids(complete.json['giveaways']['data']) == [2]
+    assert complete.json['worth_summary']['worth_estimation_usd'] == '24.98'
+
+def test_a_failed_refresh_keeps_the_previous_snapshot(snapshot):
+    snapshot.refresh()
+
+    assert ids(snapshot.giveaways()) == [1, 2, 3]
+    assert snapshot.worth() == WORTH
+
+def test_a_cold_snapshot_raises_when_gamerpower_fails(snapshot):
+    cold = funcs.GamerPowerSnapshot()
+
+    with pytest.raises(funcs.UpstreamError):
+        cold.giveaways()
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import app_module, db, funcs, make_game
+
+RefreshQueue = app_module.GameRefreshQueue
+
+def igdb_game(game_id):
+    return dict({field: None for field in funcs.GAME_CACHE_FIELDS}, id=game_id, name=f'Refreshed {game_id}')
+
+@pytest.fixture
+def refresher():
+    return funcs.GameCacheRefresher(db, app_module.Games, RefreshQueue, app_module.find_stale_games, batch_size=2)
+
+def test_concurrent_workers_claim_disjoint_batches(refresher):
+    refresher.enqueue([1, 2, 3, 4, 5])
+
+    _, first = refresher._claim()
+    _, second = refresher._claim()
+    _, third = refresher._claim()
+    _, nothing_left = refresher._claim()
+
+    claimed = first + second + third
+    assert sorted(claimed) == [1, 2, 3, 4, 5]
+    assert len(set(claimed)) == len(claimed)
+    assert nothing_left == []
+
+def test_igdb_outage_keeps_the_queue_with_a_backoff(refresher, monkeypatch):
+    for game_id in (1, 2):
+        make_game(game_id)
+    refresher.enqueue([1, 2])
+    monkeypatch.setattr(funcs, 'batch_fetch_games_from_igdb', lambda game_ids: {})
+
+    assert refresher.run_once() == 2
+
+    queued = RefreshQueue.query.order_by(RefreshQueue.game_id).all()
+    assert [(row.game_id, row.attempts, row.claimed_by) for row in queued] == [(1, 1, None), (2, 1, None)]
+    assert all(row.available_at > datetime.utcnow() for row in queued)
+    # Backing off: nothing is due yet
+    assert refresher.run_once() == 0
+
+def test_only_written_games_leave_the_queue(refresher, monkeypatch):
+    for game_id in (1, 2):
+        make_game(game_id)
+    refresher.enqueue([1, 2])
+    RefreshQueue.query.update({RefreshQueue.available_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.session.commit()
+    # IGDB no longer knows game 2
+    monkeypatch.setattr(funcs, 'batch_fetch_games_from_igdb', lambda game_ids: {1: igdb_game(1)})
+
+    refresher.run_once()
+
+    assert [row.game_id for row in RefreshQueue.query.all()] == [2]
+    assert app_module.Games.query.get(1).name == 'Refreshed 1'
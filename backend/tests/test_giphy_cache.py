@@ -0,0 +1,66 @@
+import pytest
+
+from conftest import app_module, funcs
+
+class GiphyResponse:
+    def __init__(self, status_code, data):
+        self.status_code, self.data = status_code, data
+
+    def json(self):
+        return self.data
+
+class GiphyStub:
+    """Answers every Giphy call with one GIF named after the call count; set status to fail"""
+
+    def __init__(self):
+        self.calls = []
+        self.status = 200
+
+    def get(self, url, **kwargs):
+        self.calls.append(url.rsplit('/', 1)[-1])
+        gif = {'id': str(len(self.calls)), 'title': f'gif {len(self.calls)}', 'images': {}}
+        return GiphyResponse(self.status, {'data': [gif], 'pagination': {'count': 1}})
+
+@pytest.fixture
+def giphy(monkeypatch):
+    monkeypatch.setenv('GIPHY_API_KEY', 'test-key')
+    stub = GiphyStub()
+    monkeypatch.setattr(funcs.http_client, 'get', stub.get)
+    return stub
+
+def trending(client):
+    return client.get('/api/gifs/trending')
+
+def test_trending_is_served_from_the_cache(client, giphy):
+    first = trending(client)
+    second = trending(client)
+
+    assert (first.headers['X-Cache'], second.headers['X-Cache']) == ('MISS', 'HIT')
+    assert second.json == first.json
+    assert giphy.calls == ['trending']
+
+def test_last_good_response_is_served_when_giphy_fails(client, giphy, monkeypatch):
+    monkeypatch.setitem(app_module.GIPHY_TTLS, 'trending', -1)  # Entries go stale at once
+    good = trending(client)
+    giphy.status = 500
+
+    stale = trending(client)
+
+    assert stale.status_code == 200
+    assert stale.headers['X-Cache'] == 'STALE'
+    assert stale.json == good.json
+
+def test_giphy_failure_without_a_cached_response_is_a_503(client, giphy):
+    giphy.status = 500
+
+    assert trending(client).status_code == 503
+
+def test_prewarm_fills_the_default_pages(client, giphy):
+    app_module.prewarm_giphy()
+    assert sorted(giphy.calls) == ['categories', 'trending']
+
+    assert trending(client).headers['X-Cache'] == 'HIT'
+    assert client.get('/api/gifs/categories').headers['X-Cache'] == 'HIT'
+    # Still fresh, so a second pre-warm skips both
+    app_module.prewarm_giphy()
+    assert len(giphy.calls) == 2
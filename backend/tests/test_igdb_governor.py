@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from conftest import funcs
+
+def run_concurrently(target, count):
+    """Call target() from count threads at once; returns each call's result or exception"""
+    outcomes = [None] * count
+    start = threading.Barrier(count)
+
+    def call(index):
+        start.wait()
+        try:
+            outcomes[index] = target()
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+@pytest.fixture
+def governor(tmp_path):
+    return funcs.IGDBGovernor(state_file=str(tmp_path / 'igdb-rate'), batch_window_ms=20)
+
+def test_coalesce_shares_one_call(governor):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return 'response'
+
+    outcomes = run_concurrently(lambda: governor.coalesce('games:1', fetch), 4)
+
+    assert outcomes == ['response'] * 4
+    assert len(calls) == 1
+
+def test_coalesce_raises_the_leaders_error_in_every_caller(governor):
+    def fetch():
+        time.sleep(0.1)
+        raise TimeoutError('IGDB timed out')
+
+    outcomes = run_concurrently(lambda: governor.coalesce('games:1', fetch), 4)
+
+    assert all(isinstance(outcome, TimeoutError) for outcome in outcomes)
+    # The failed call is not left in flight
+    assert governor.coalesce('games:1', lambda: 'retried') == 'retried'
+
+def test_load_game_raises_the_loaders_error_in_every_lookup(governor):
+    def loader(game_ids):
+        raise funcs.UpstreamError('IGDB games returned 500')
+
+    outcomes = run_concurrently(lambda: governor.load_game(7, loader), 3)
+
+    assert all(isinstance(outcome, funcs.UpstreamError) for outcome in outcomes)
+
+def test_load_game_batches_concurrent_lookups(governor):
+    batches = []
+
+    def loader(game_ids):
+        batches.append(sorted(game_ids))
+        return {game_id: {'id': game_id} for game_id in game_ids if game_id != 3}
+
+    ids = iter([1, 2, 3])
+    lock = threading.Lock()
+
+    def lookup():
+        with lock:
+            game_id = next(ids)
+        return governor.load_game(game_id, loader)
+
+    outcomes = run_concurrently(lookup, 3)
+
+    assert sorted(outcome['id'] for outcome in outcomes if outcome) == [1, 2]
+    assert None in outcomes
+    assert batches == [[1, 2, 3]]
+
+def test_game_route_answers_503_when_igdb_fails(client):
+    response = client.get('/api/game', query_string={'id': 1234})
+
+    assert response.status_code == 503
+
+def test_governors_sharing_a_state_file_share_one_budget(tmp_path):
+    # Two processes (or containers) pointed at the same IGDB_RATE_STATE_FILE
+    state_file = str(tmp_path / 'igdb-rate')
+    web = funcs.IGDBGovernor(rate=1, burst=2, state_file=state_file)
+    refresher = funcs.IGDBGovernor(rate=1, burst=2, state_file=state_file)
+
+    assert web._take_token() == 0
+    assert refresher._take_token() == 0
+    assert web._take_token() > 0
+    assert refresher._take_token() > 0
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from conftest import funcs
+
+class TokenResponse:
+    def __init__(self, token, expires_in):
+        self.token, self.expires_in = token, expires_in
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'access_token': self.token, 'expires_in': self.expires_in}
+
+@pytest.fixture
+def twitch(monkeypatch):
+    """Tokens handed out by the stubbed Twitch endpoint, in order"""
+    issued = []
+
+    def check_token():
+        issued.append(f'token-{len(issued) + 1}')
+        return TokenResponse(issued[-1], 3600 * 24)
+    monkeypatch.setattr(funcs, 'check_token', check_token)
+    return issued
+
+def manager(tmp_path, **kwargs):
+    return funcs.IGDBTokenManager(cache_file=str(tmp_path / 'token.json'), refresh_margin=3600, **kwargs)
+
+def test_token_is_fetched_once_and_reused(tmp_path, twitch):
+    tokens = manager(tmp_path)
+
+    assert [tokens.get_token() for _ in range(5)] == ['token-1'] * 5
+    assert twitch == ['token-1']
+
+def test_workers_share_the_token_through_the_cache_file(tmp_path, twitch):
+    assert manager(tmp_path).get_token() == 'token-1'
+    assert manager(tmp_path).get_token() == 'token-1'
+    assert twitch == ['token-1']
+
+def test_a_rejected_token_is_not_reloaded_from_the_cache_file(tmp_path, twitch):
+    tokens = manager(tmp_path)
+    tokens.get_token()
+
+    tokens.invalidate('token-1')
+
+    assert tokens.get_token() == 'token-2'
+    assert manager(tmp_path).get_token() == 'token-2'
+
+def test_a_token_close_to_expiry_is_served_while_it_refreshes(tmp_path, twitch):
+    tokens = manager(tmp_path)
+    tokens._token, tokens._expires_at = 'old-token', time.time() + 60
+
+    assert tokens.get_token() == 'old-token'
+    for _ in range(100):
+        if tokens._token != 'old-token':
+            break
+        time.sleep(0.01)
+    assert tokens.get_token() == 'token-1'
@@ -0,0 +1,48 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from conftest import app_module, funcs
+
+PAYLOAD = {
+    'b': [1, 2.5, None, True],
+    'a': {'created': datetime(2024, 5, 1, 12, 30, 15, 999), 'tags': {'rpg'}},
+    'name': 'Portal'
+}
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def encoder(request, monkeypatch):
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(funcs, 'orjson', None)
+    return request.param
+
+def test_output_is_compact_sorted_and_uses_the_api_date_format(encoder):
+    body = funcs.dumps_json(PAYLOAD)
+
+    assert body == (
+        '{"a":{"created":"2024-05-01 12:30:15","tags":["rpg"]},"b":[1,2.5,null,true],"name":"Portal"}'
+    ).encode('utf-8')
+
+def test_non_ascii_text_round_trips(encoder):
+    assert json.loads(funcs.dumps_json({'name': 'Pokémon ✓'})) == {'name': 'Pokémon ✓'}
+
+def test_mixed_key_types_are_encoded(encoder):
+    assert json.loads(funcs.dumps_json({1: 'one', 'two': 2})) == {'1': 'one', 'two': 2}
+
+def test_encoders_agree_on_api_responses(monkeypatch):
+    pytest.importorskip('orjson')
+    data = {'games': {3: {'id': 3, 'platforms': ['PC']}, 1: {'id': 1, 'platforms': []}}, 'count': 2}
+    fast = funcs.dumps_json(data)
+    monkeypatch.setattr(funcs, 'orjson', None)
+
+    assert json.loads(fast) == json.loads(funcs.dumps_json(data))
+
+def test_jsonify_sends_the_fast_encoding(client, encoder):
+    with app_module.app.test_request_context():
+        response = funcs.jsonify(PAYLOAD)
+
+    assert response.mimetype == 'application/json'
+    assert response.data == funcs.dumps_json(PAYLOAD) + b'\n'
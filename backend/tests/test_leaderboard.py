@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+from conftest import app_module, auth, db, make_game, make_review, make_user
+
+GameReviewBuckets = app_module.GameReviewBuckets
+
+def most_reviewed(client, user_id):
+    response = client.get('/api/games/most-reviewed-week', headers=auth(user_id))
+    assert response.status_code == 200, response.json
+    return [(entry['game']['id'], entry['review_count']) for entry in response.json['games']]
+
+def post_review(client, user_id, game_id):
+    response = client.post('/api/review', json={'id_game': game_id, 'review_text': 'fun'}, headers=auth(user_id))
+    assert response.status_code == 201, response.json
+    return response.json['review']['id']
+
+def test_reviews_are_counted_in_hourly_buckets(client):
+    alice = make_user('alice')
+    bob = make_user('bob')
+    for game_id in (1, 2):
+        make_game(game_id)
+    post_review(client, alice.id, 1)
+    post_review(client, bob.id, 1)
+    post_review(client, alice.id, 2)
+
+    buckets = GameReviewBuckets.query.order_by(GameReviewBuckets.game_id).all()
+    assert [(bucket.game_id, bucket.review_count) for bucket in buckets] == [(1, 2), (2, 1)]
+    assert most_reviewed(client, alice.id) == [(1, 2), (2, 1)]
+
+def test_deleting_a_review_decrements_its_bucket(client):
+    alice = make_user('alice')
+    make_game(1)
+    review_id = post_review(client, alice.id, 1)
+    post_review(client, alice.id, 1)
+
+    assert client.delete(f'/api/review/{review_id}', headers=auth(alice.id)).status_code == 200
+
+    assert GameReviewBuckets.query.one().review_count == 1
+
+def test_rebuild_matches_the_reviews_table_and_skips_old_reviews(client):
+    alice = make_user('alice')
+    for game_id in (1, 2):
+        make_game(game_id)
+    now = datetime.utcnow()
+    make_review(alice, 1, now - timedelta(hours=1))
+    make_review(alice, 1, now - timedelta(days=2))
+    make_review(alice, 2, now - timedelta(days=10))
+
+    app_module.rebuild_review_buckets()
+
+    assert most_reviewed(client, alice.id) == [(1, 2)]
+
+def test_leaderboard_reads_never_delete_old_buckets(client):
+    alice = make_user('alice')
+    make_game(1)
+    old = app_module._review_bucket(datetime.utcnow() - timedelta(days=9))
+    db.session.add(GameReviewBuckets(game_id=1, bucket_start=old, review_count=3))
+    db.session.commit()
+
+    assert most_reviewed(client, alice.id) == []
+    assert GameReviewBuckets.query.count() == 1
+
+    assert app_module.prune_review_buckets() == 1
+    assert GameReviewBuckets.query.count() == 0
@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+
+from conftest import app_module, db, funcs, make_game, make_user
+
+@pytest.fixture
+def shared():
+    """A shared (L2) store standing in for Redis"""
+    return funcs.RedisCacheBackend(client=funcs.InProcessRedis())
+
+def tiered(l2, **kwargs):
+    return funcs.TieredCache('test', l2=l2, ttl=60, **dict({'l1_ttl': 60}, **kwargs))
+
+def test_a_worker_reads_what_another_worker_cached_through_l2(shared):
+    first, second = tiered(shared), tiered(shared)
+    first.set('game', 1, {'name': 'Portal'})
+
+    assert second.get('game', 1) == {'name': 'Portal'}
+    assert second.get('game', 1) == {'name': 'Portal'}
+    stats = second.stats()
+    assert (stats['l2_hits'], stats['l1_hits']) == (1, 1)
+
+def test_delete_clears_l2_and_this_workers_l1(shared):
+    cache = tiered(shared)
+    cache.set('game', 1, {'name': 'Old'})
+
+    cache.delete('game', 1)
+
+    assert cache.get('game', 1) is None
+    assert tiered(shared).get('game', 1) is None
+
+def test_get_or_load_loads_only_the_misses_once(shared):
+    cache = tiered(shared)
+    cache.set('user', 1, 'alice')
+    loads = []
+
+    def load(idents):
+        loads.append(sorted(idents))
+        return {ident: f'user{ident}' for ident in idents}
+
+    assert cache.get_or_load('user', [1, 2, 3], load) == {1: 'alice', 2: 'user2', 3: 'user3'}
+    assert cache.get_or_load('user', [1, 2, 3], load) == {1: 'alice', 2: 'user2', 3: 'user3'}
+    assert loads == [[2, 3]]
+
+def test_l2_errors_fall_back_to_the_loader_and_are_all_counted():
+    class BrokenStore(funcs.RedisCacheBackend):
+        def get_many(self, keys):
+            raise ConnectionError('redis is down')
+
+    cache = tiered(BrokenStore(client=funcs.InProcessRedis()), l1_ttl=0)
+
+    def lookup():
+        for _ in range(50):
+            assert cache.get_or_load('game', [1], lambda idents: {1: 'loaded'}) == {1: 'loaded'}
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.stats()['errors'] == 400
+
+@pytest.fixture
+def lookup_cache(shared, monkeypatch):
+    """The app's lookup cache with both tiers enabled"""
+    monkeypatch.setattr(funcs.lookup_cache, 'l2', shared)
+    monkeypatch.setattr(funcs.lookup_cache, 'l1_ttl', 60)
+    yield funcs.lookup_cache
+    funcs.lookup_cache._l1.clear()
+
+def test_profile_changes_invalidate_cached_user_records(lookup_cache):
+    alice = make_user('alice')
+    assert app_module._users_by_id([alice.id])[alice.id].username == 'alice'
+    assert app_module.user_id_for_username('alice') == alice.id
+
+    # Served from the cache until it is invalidated
+    db.session.execute(app_module.User.__table__.update().values(username='alicia'))
+    db.session.commit()
+    assert app_module._users_by_id([alice.id])[alice.id].username == 'alice'
+
+    app_module.invalidate_user_cache(alice.id, 'alice')
+
+    assert app_module._users_by_id([alice.id])[alice.id].username == 'alicia'
+    assert app_module.user_id_for_username('alice') is None
+
+def test_cached_game_dicts_follow_game_updates(lookup_cache):
+    make_game(1, name='Old name')
+    assert app_module._game_dicts([1])[1]['name'] == 'Old name'
+
+    funcs.cache_games_bulk(db, app_module.Games, [
+        dict({field: None for field in funcs.GAME_CACHE_FIELDS}, id=1, name='New name')
+    ])
+
+    assert app_module._game_dicts([1])[1]['name'] == 'New name'
@@ -0,0 +1,50 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from conftest import funcs
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def do_GET(self):
+        if self.path == '/slow':
+            time.sleep(0.5)
+        body = b'{"ok": true}'
+        self.send_response(500 if self.path == '/error' else 200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+def test_requests_to_one_host_reuse_a_connection(upstream):
+    client = funcs.OutboundClient()
+
+    for _ in range(3):
+        assert client.get(f'{upstream}/games').json() == {'ok': True}
+    client.get(f'{upstream}/error')
+
+    stats = client.stats()[upstream.split('//')[1]]
+    assert (stats['requests'], stats['errors']) == (4, 1)
+    assert (stats['connections_opened'], stats['connections_reused']) == (1, 3)
+
+def test_requests_get_a_default_read_timeout(upstream):
+    client = funcs.OutboundClient(read_timeout=0.1)
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.get(f'{upstream}/slow')
+    assert client.get(f'{upstream}/slow', timeout=2).status_code == 200
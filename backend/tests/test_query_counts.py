@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+from conftest import app_module, auth, count_queries, db, make_game, make_repost, make_review, make_user
+
+def queries_for(client, url, user_id, **params):
+    db.session.expire_all()  # Nothing answered from the test's identity map
+    with count_queries() as statements:
+        response = client.get(url, query_string=params, headers=auth(user_id))
+    assert response.status_code == 200, response.json
+    return len(statements)
+
+def make_engaged_reviews(prefix, count):
+    """count reviews of game 1 by different users, each liked and reposted"""
+    start = datetime.utcnow() - timedelta(hours=1)
+    reviews = []
+    for i in range(count):
+        author = make_user(f'{prefix}{i}')
+        review = make_review(author, 1, start + timedelta(minutes=i))
+        db.session.add(app_module.Likes(user_id=author.id, review_id=review.id))
+        make_repost(author, review, review.date_created)
+        reviews.append(review)
+    return reviews
+
+def test_review_page_queries_do_not_grow_with_the_page(client):
+    viewer = make_user('viewer')
+    make_game(1)
+    make_engaged_reviews('first', 3)
+    small = queries_for(client, '/api/ver', viewer.id, busca='game', id_game=1, size=20, cursor='')
+
+    make_engaged_reviews('more', 12)
+    large = queries_for(client, '/api/ver', viewer.id, busca='game', id_game=1, size=20, cursor='')
+
+    assert large == small
+
+def test_repost_list_queries_do_not_grow_with_the_page(client):
+    viewer = make_user('viewer')
+    make_game(1)
+    make_engaged_reviews('first', 3)
+    small = queries_for(client, '/api/reposts', viewer.id, size=20)
+
+    make_engaged_reviews('more', 12)
+    large = queries_for(client, '/api/reposts', viewer.id, size=20)
+
+    assert large == small
+
+def make_thread(review, prefix, roots, replies_per_root):
+    start = datetime.utcnow() - timedelta(hours=1)
+    for i in range(roots):
+        author = make_user(f'{prefix}{i}')
+        root = app_module.Comments(review_id=review.id, username=str(author.id), comment='root',
+                                   date_created=start + timedelta(minutes=i))
+        db.session.add(root)
+        db.session.flush()
+        for j in range(replies_per_root):
+            replier = make_user(f'{prefix}{i}r{j}')
+            reply = app_module.Comments(review_id=review.id, parent_id=root.comment_id, username=str(replier.id),
+                                        comment='reply', date_created=start + timedelta(minutes=i, seconds=j + 1))
+            db.session.add(reply)
+            db.session.flush()
+            # A nested reply, so replies have reply counts of their own
+            db.session.add(app_module.Comments(review_id=review.id, parent_id=reply.comment_id,
+                                               username=str(author.id), comment='nested', date_created=start))
+    db.session.commit()
+
+def test_comment_thread_queries_do_not_grow_with_the_thread(client):
+    viewer = make_user('viewer')
+    make_game(1)
+    review = make_review(viewer, 1, datetime.utcnow())
+    url = f'/api/review/{review.id}/comments'
+    make_thread(review, 'first', 2, 1)
+    small = queries_for(client, url, viewer.id, size=20)
+
+    make_thread(review, 'more', 8, 3)
+    response = client.get(url, query_string={'size': 20}, headers=auth(viewer.id))
+    large = queries_for(client, url, viewer.id, size=20)
+
+    assert large == small
+    roots = response.json['comments']
+    assert len(roots) == 10
+    assert sorted(len(root['replies']) for root in roots) == [1, 1] + [3] * 8
+    assert all(reply['reply_count'] == 1 for root in roots for reply in root['replies'])
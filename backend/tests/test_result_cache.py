@@ -0,0 +1,65 @@
+import pytest
+
+from conftest import app_module, funcs
+
+class IGDBResponse:
+    def __init__(self, games, status_code=200):
+        self.games, self.status_code = games, status_code
+
+    def json(self):
+        return self.games
+
+class IGDBStub:
+    """Records the bodies sent to IGDB; set status to make it fail"""
+
+    def __init__(self):
+        self.bodies = []
+        self.status = 200
+
+    def post(self, endpoint, body):
+        self.bodies.append(body)
+        return IGDBResponse([{'id': 42}] if self.status == 200 else {'message': 'error'}, self.status)
+
+@pytest.fixture
+def igdb(monkeypatch):
+    stub = IGDBStub()
+    monkeypatch.setattr(app_module, 'igdb_post', stub.post)
+    return stub
+
+def search(client, query):
+    return client.post('/api/search', json={'query': query})
+
+def test_repeated_searches_are_answered_from_the_cache(client, igdb):
+    assert search(client, 'Half Life').json == 42
+    assert search(client, '  half   LIFE ').json == 42
+
+    assert len(igdb.bodies) == 1
+    assert app_module.search_cache.stats()['hits'] == 1
+
+def test_failed_searches_are_not_cached(client, igdb):
+    igdb.status = 500
+    search(client, 'Half Life')
+    igdb.status = 200
+
+    assert search(client, 'Half Life').json == 42
+    assert len(igdb.bodies) == 2
+
+def test_local_backend_evicts_least_recently_used_entries_by_size():
+    backend = funcs.LocalCacheBackend(max_bytes=10)
+    backend.set('a', b'aaaa', 60)
+    backend.set('b', b'bbbb', 60)
+    backend.get('a')
+
+    backend.set('c', b'cccc', 60)
+
+    assert (backend.get('a'), backend.get('b'), backend.get('c')) == (b'aaaa', None, b'cccc')
+    assert backend.info()['evictions'] == 1
+
+def test_entries_expire_and_oversized_values_are_skipped():
+    cache = funcs.ResultCache('test', backend=funcs.LocalCacheBackend(1024), ttl=60, max_entry_bytes=32)
+    cache.set(cache.key('search', 'zelda'), {'id': 1}, ttl=-1)
+    cache.set(cache.key('search', 'mario'), {'name': 'x' * 100})
+
+    assert cache.get(cache.key('search', 'zelda')) is None
+    assert cache.get(cache.key('search', 'mario')) is None
+    assert cache.stats()['too_large'] == 1
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from conftest import app_module, db, make_game, make_review, make_user
+
+def upgrade(app):
+    result = app.test_cli_runner().invoke(args=['upgrade-schema'])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+def test_upgrade_is_a_no_op_on_an_up_to_date_database(app):
+    assert 'Schema up to date (0 columns added)' in upgrade(app)
+
+def test_upgrade_adds_missing_counters_and_backfills_them(app):
+    alice = make_user('alice')
+    make_game(1)
+    review_id = make_review(alice, 1, datetime.utcnow()).id
+    db.session.add(app_module.Likes(user_id=alice.id, review_id=review_id))
+    db.session.commit()
+    # A database from before the counter columns existed
+    db.session.execute('ALTER TABLE reviews DROP COLUMN likes_count')
+    db.session.commit()
+
+    output = upgrade(app)
+
+    assert 'Added reviews.likes_count' in output
+    assert app_module.Reviews.query.get(review_id).likes_count == 1
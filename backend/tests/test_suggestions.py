@@ -0,0 +1,63 @@
+import pytest
+
+from conftest import app_module, funcs, make_game
+
+class IGDBResponse:
+    status_code = 200
+
+    def __init__(self, games):
+        self.games = games
+
+    def json(self):
+        return self.games
+
+@pytest.fixture
+def igdb_calls(monkeypatch):
+    """Bodies sent to IGDB; every search answers with one uncached game"""
+    bodies = []
+
+    def igdb_post(endpoint, body):
+        bodies.append(body)
+        return IGDBResponse([{'id': 999, 'name': 'Popular Uncached Game'}])
+    monkeypatch.setattr(app_module, 'igdb_post', igdb_post)
+    # A fresh index that loads the games each test caches
+    monkeypatch.setattr(app_module, 'game_name_index', funcs.GameNameIndex())
+    return bodies
+
+def suggest(client, query):
+    response = client.post('/api/suggestions', json={'query': query})
+    assert response.status_code == 200, response.json
+    return [game['name'] for game in response.json]
+
+def test_strong_local_matches_skip_igdb(client, igdb_calls):
+    for game_id in range(1, 6):
+        make_game(game_id, name=f'Witcher Saga {game_id}')
+
+    assert suggest(client, 'witcher') == [f'Witcher Saga {game_id}' for game_id in range(1, 6)]
+    assert igdb_calls == []
+
+def test_short_queries_always_ask_igdb(client, igdb_calls):
+    for game_id in range(1, 6):
+        make_game(game_id, name=f'The Game {game_id}')
+
+    assert suggest(client, 'th') == ['Popular Uncached Game']
+    assert len(igdb_calls) == 1
+
+def test_mid_name_word_prefixes_do_not_count_as_strong_matches(client, igdb_calls):
+    for game_id in range(1, 6):
+        make_game(game_id, name=f'The Witcher {game_id}')
+
+    assert suggest(client, 'witch') == ['Popular Uncached Game']
+    assert len(igdb_calls) == 1
+
+def test_strong_only_keeps_name_prefixes_and_whole_words():
+    index = funcs.GameNameIndex()
+    index.add(1, 'Portal 2')
+    index.add(2, 'The Portal Saga')
+    index.add(3, 'Portals of Doom')
+    index.add(4, 'Teleportal')
+
+    assert [game['id'] for game in index.search('portal')] == [1, 3, 2]
+    assert [game['id'] for game in index.search('portal', strong_only=True)] == [1, 3, 2]
+    assert [game['id'] for game in index.search('saga', strong_only=True)] == [2]
+    assert index.search('sag', strong_only=True) == []
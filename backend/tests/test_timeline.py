@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+from conftest import app_module, auth, db, make_game, make_review, make_user
+
+TimelineEntries = app_module.TimelineEntries
+
+def timeline_keys(client, user_id):
+    response = client.get('/api/timeline', query_string={'size': 50}, headers=auth(user_id))
+    assert response.status_code == 200, response.json
+    return [(item['feed_type'], item['id']) for item in response.json['comments']]
+
+def test_follow_backfills_the_authors_recent_items(client):
+    alice = make_user('alice')
+    bob = make_user('bob')
+    make_game(1)
+    start = datetime.utcnow() - timedelta(hours=1)
+    reviews = [make_review(alice, 1, start + timedelta(minutes=i)) for i in range(3)]
+
+    response = client.post('/api/follow', json={'username': 'alice'}, headers=auth(bob.id))
+
+    assert response.json['is_following'] is True
+    assert timeline_keys(client, bob.id) == [('review', review.id) for review in reversed(reviews)]
+
+def test_new_review_is_fanned_out_and_removed_on_delete(client):
+    alice = make_user('alice')
+    bob = make_user('bob')
+    make_game(1)
+    client.post('/api/follow', json={'username': 'alice'}, headers=auth(bob.id))
+
+    created = client.post('/api/review', json={'id_game': 1, 'review_text': 'loved it'}, headers=auth(alice.id))
+    review_id = created.json['review']['id']
+    assert timeline_keys(client, bob.id) == [('review', review_id)]
+
+    assert client.delete(f'/api/review/{review_id}', headers=auth(alice.id)).status_code == 200
+    assert timeline_keys(client, bob.id) == []
+    assert TimelineEntries.query.filter_by(item_id=review_id).count() == 0
+
+def test_unfollow_removes_the_authors_entries(client):
+    alice = make_user('alice')
+    bob = make_user('bob')
+    make_game(1)
+    make_review(alice, 1, datetime.utcnow() - timedelta(minutes=5))
+    client.post('/api/follow', json={'username': 'alice'}, headers=auth(bob.id))
+
+    response = client.post('/api/follow', json={'username': 'alice'}, headers=auth(bob.id))
+
+    assert response.json['is_following'] is False
+    assert TimelineEntries.query.filter_by(user_id=bob.id).count() == 0
+
+def test_racing_fan_out_and_backfill_do_not_lose_rows(client):
+    alice = make_user('alice')
+    bob = make_user('bob')
+    carol = make_user('carol')
+    make_game(1)
+    review = make_review(alice, 1, datetime.utcnow())
+    entry = {'author_id': alice.id, 'kind': 'review', 'item_id': review.id, 'created_at': review.date_created}
+    # Backfill already wrote bob's row when the fan-out inserts its chunk
+    app_module.insert_timeline_entries([dict(entry, user_id=bob.id)])
+    db.session.commit()
+
+    app_module.insert_timeline_entries([dict(entry, user_id=bob.id), dict(entry, user_id=carol.id)])
+    db.session.commit()
+
+    assert TimelineEntries.query.filter_by(item_id=review.id, user_id=bob.id).count() == 1
+    assert TimelineEntries.query.filter_by(item_id=review.id, user_id=carol.id).count() == 1
@@ -0,0 +1,65 @@
+from conftest import app_module, auth, db, make_user
+
+def search(client, query):
+    response = client.post('/api/search/users', json={'query': query}, headers=auth(1))
+    assert response.status_code == 200, response.json
+    return [user['username'] for user in response.json['users']]
+
+def test_two_character_query_finds_substring_matches(client):
+    make_user('anna')
+    make_user('jonathan', follower_count=50)
+    make_user('bob')
+
+    assert search(client, 'an') == ['anna', 'jonathan']
+    assert search(client, 'AN') == ['anna', 'jonathan']
+
+def test_matches_are_ranked_by_followers_before_the_limit(client):
+    # Alphabetically first prefix matches have the fewest followers
+    for i in range(60):
+        make_user(f'sam{i:02d}', follower_count=i)
+    make_user('sam', follower_count=0)
+    make_user('xsam', follower_count=1000)
+
+    results = search(client, 'sam')
+
+    assert results == ['sam'] + [f'sam{i:02d}' for i in range(59, 50, -1)]
+
+def test_substring_matches_follow_prefix_matches_by_followers(client):
+    make_user('danny', follower_count=1)
+    make_user('jordan', follower_count=5)
+    make_user('aidan', follower_count=9)
+
+    assert search(client, 'dan') == ['danny', 'aidan', 'jordan']
+
+def test_underscore_matches_literally(client):
+    make_user('dan_x')
+    make_user('danax')
+
+    assert search(client, 'n_') == ['dan_x']
+
+def test_two_character_substring_matches_come_from_the_bigram_index(client):
+    make_user('jonathan')
+    unindexed = make_user('nathan')
+    app_module.UserSearchTrigrams.query.filter_by(user_id=unindexed.id).delete()
+    db.session.commit()
+
+    assert search(client, 'an') == ['jonathan']
+
+def test_like_wildcards_in_a_prefix_match_literally(client):
+    make_user('50%off')
+    make_user('500x')
+
+    assert search(client, '50%') == ['50%off']
+
+def test_upgrade_adds_bigrams_to_an_older_index(app, client):
+    make_user('jonathan')
+    # An index built when only trigrams were stored
+    app_module.UserSearchTrigrams.query.filter(db.func.length(app_module.UserSearchTrigrams.trigram) == 2).delete(
+        synchronize_session=False
+    )
+    db.session.commit()
+    assert search(client, 'an') == []
+
+    assert app.test_cli_runner().invoke(args=['upgrade-schema']).exit_code == 0
+
+    assert search(client, 'an') == ['jonathan']